@@ -5,47 +5,29 @@ Tests every page, button, form, and interaction in the system
 """
 
 from playwright.sync_api import sync_playwright, Page, expect
-import time
 import json
 
-BASE_URL = "http://localhost:5178"
+from qa_support import history, profiles, visual
+from qa_support.assets import stats as asset_stats
+from qa_support.auth import ensure_storage_state
+from qa_support.context import BASE_URL, new_qa_context
+from qa_support.hydration import goto, metrics as hydration_metrics
+from qa_support.results import RUN_ID, Results
+from qa_support.schedule import Schedule
+from qa_support.screenshots import capture, flush as flush_screenshots, print_summary as print_screenshot_summary
+from qa_support.vitals import collect_pages as collect_vitals, metrics as vitals_metrics
+from qa_support.waits import stats as wait_stats, wait_for_animations, wait_for_network_quiet
 
-class TestResults:
-    def __init__(self):
-        self.passed = []
-        self.failed = []
 
-    def add_pass(self, test_name):
-        self.passed.append(test_name)
-        print(f"✅ PASS: {test_name}")
+# Resource profile of this suite's contexts (qa_support.profiles) - it takes screenshots
+RESOURCE_PROFILE = "full"
 
-    def add_fail(self, test_name, error):
-        self.failed.append({"test": test_name, "error": str(error)})
-        print(f"❌ FAIL: {test_name} - {error}")
-
-    def summary(self):
-        total = len(self.passed) + len(self.failed)
-        print("\n" + "="*60)
-        print(f"TOTAL TESTS: {total}")
-        print(f"PASSED: {len(self.passed)}")
-        print(f"FAILED: {len(self.failed)}")
-        print("="*60)
-
-        if self.failed:
-            print("\nFAILED TESTS:")
-            for f in self.failed:
-                print(f"  - {f['test']}: {f['error']}")
-
-        return len(self.failed) == 0
-
-results = TestResults()
+results = Results("comprehensive")
 
 def test_page_loads(page: Page, url: str, test_name: str, expected_text: str = None):
     """Test that a page loads without errors"""
     try:
-        response = page.goto(url, wait_until="domcontentloaded", timeout=30000)
-        page.wait_for_load_state("domcontentloaded")
-        time.sleep(0.5)  # Allow React to hydrate
+        response = goto(page, url)
 
         # Check for HTTP errors
         if response and response.status >= 400:
@@ -106,9 +88,7 @@ def test_login_page(page: Page):
     print("\n--- Testing Login Page ---")
 
     try:
-        page.goto(f"{BASE_URL}/login", wait_until="domcontentloaded")
-        page.wait_for_load_state("domcontentloaded")
-        time.sleep(0.5)
+        goto(page, f"{BASE_URL}/login")
 
         # Check for login form elements
         email_input = page.locator("input[type='email'], input[placeholder*='אימייל'], input[placeholder*='email']")
@@ -145,12 +125,11 @@ def test_dashboard_page(page: Page):
     print("\n--- Testing Dashboard Page ---")
 
     try:
-        page.goto(f"{BASE_URL}/dashboard", wait_until="domcontentloaded")
-        page.wait_for_load_state("domcontentloaded")
-        time.sleep(1)
+        goto(page, f"{BASE_URL}/dashboard")
+        wait_for_network_quiet(page)
 
         # Take screenshot for manual review
-        page.screenshot(path="/tmp/dashboard_screenshot.png", full_page=True)
+        capture(page, "/tmp/dashboard_screenshot.png", full_page=True, visual="comprehensive")
 
         # Check for main dashboard components
         # Header
@@ -165,7 +144,7 @@ def test_dashboard_page(page: Page):
         if dashboard_tab.count() > 0:
             dashboard_tab.wait_for(state="visible", timeout=5000)
             dashboard_tab.click(timeout=5000)
-            time.sleep(1)  # Wait for tab content to render
+            wait_for_animations(page)
 
         # Check for cards (now on dashboard tab)
         # Cards use rounded-xl or rounded-lg classes from shadcn/ui
@@ -188,7 +167,7 @@ def test_dashboard_page(page: Page):
             # Try clicking menu
             try:
                 menu_btn.first.click()
-                time.sleep(0.5)
+                wait_for_animations(page)
                 results.add_pass("Dashboard: Menu opens on click")
             except:
                 results.add_fail("Dashboard: Menu opens on click", "Could not click menu")
@@ -201,11 +180,9 @@ def test_budget_page(page: Page):
     print("\n--- Testing Budget Page ---")
 
     try:
-        page.goto(f"{BASE_URL}/budget", wait_until="domcontentloaded")
-        page.wait_for_load_state("domcontentloaded")
-        time.sleep(1)
+        goto(page, f"{BASE_URL}/budget")
 
-        page.screenshot(path="/tmp/budget_screenshot.png", full_page=True)
+        capture(page, "/tmp/budget_screenshot.png", full_page=True, visual="comprehensive")
 
         # Check for category tabs
         tabs = page.locator("button").filter(has_text="הכנסות")
@@ -219,7 +196,7 @@ def test_budget_page(page: Page):
                     tab = page.locator(f"button:has-text('{label}')").first
                     tab.wait_for(state="visible", timeout=5000)
                     tab.click(timeout=5000)
-                    time.sleep(0.3)
+                    wait_for_animations(page)
                     results.add_pass(f"Budget: Tab '{label}' clickable")
                 except Exception as e:
                     results.add_fail(f"Budget: Tab '{label}' clickable", str(e))
@@ -232,7 +209,7 @@ def test_budget_page(page: Page):
             results.add_pass("Budget: Add button exists")
             try:
                 add_btn.first.click()
-                time.sleep(0.5)
+                wait_for_animations(page)
                 results.add_pass("Budget: Add button clickable")
             except Exception as e:
                 results.add_fail("Budget: Add button clickable", str(e))
@@ -245,11 +222,9 @@ def test_setup_wizard(page: Page):
     print("\n--- Testing Setup Wizard ---")
 
     try:
-        page.goto(f"{BASE_URL}/setup", wait_until="domcontentloaded")
-        page.wait_for_load_state("domcontentloaded")
-        time.sleep(1)
+        goto(page, f"{BASE_URL}/setup")
 
-        page.screenshot(path="/tmp/setup_screenshot.png", full_page=True)
+        capture(page, "/tmp/setup_screenshot.png", full_page=True, visual="comprehensive")
 
         # Check for step indicators
         steps = page.locator("[class*='step'], [class*='Step']")
@@ -279,16 +254,14 @@ def test_sidebar_navigation(page: Page):
     print("\n--- Testing Sidebar Navigation ---")
 
     try:
-        page.goto(f"{BASE_URL}/dashboard", wait_until="domcontentloaded")
-        page.wait_for_load_state("domcontentloaded")
-        time.sleep(1)
+        goto(page, f"{BASE_URL}/dashboard")
 
         # Find and click menu button using aria-label
         menu_btn = page.locator("button[aria-label='פתח תפריט'], button[aria-label*='menu']").first
         if menu_btn.count() > 0:
             menu_btn.wait_for(state="visible", timeout=5000)
             menu_btn.click(timeout=5000)
-            time.sleep(0.5)
+            wait_for_animations(page)
 
             # Check sidebar is visible
             sidebar = page.locator("[class*='sidebar'], [class*='Sidebar'], aside, nav")
@@ -324,9 +297,7 @@ def test_responsive_design(page: Page):
     for width, height, name in viewports:
         try:
             page.set_viewport_size({"width": width, "height": height})
-            page.goto(f"{BASE_URL}/dashboard", wait_until="domcontentloaded")
-            page.wait_for_load_state("domcontentloaded")
-            time.sleep(0.5)
+            goto(page, f"{BASE_URL}/dashboard")
 
             # Check page renders without overflow
             body_width = page.evaluate("document.body.scrollWidth")
@@ -335,7 +306,7 @@ def test_responsive_design(page: Page):
             else:
                 results.add_fail(f"Responsive: {name} - No horizontal overflow", f"Body width: {body_width}")
 
-            page.screenshot(path=f"/tmp/responsive_{width}x{height}.png", full_page=True)
+            capture(page, f"/tmp/responsive_{width}x{height}.png", full_page=True, visual="comprehensive")
 
         except Exception as e:
             results.add_fail(f"Responsive: {name}", str(e))
@@ -355,9 +326,7 @@ def test_buttons_and_interactions(page: Page):
 
     for url, page_name in pages_with_buttons:
         try:
-            page.goto(url, wait_until="domcontentloaded")
-            page.wait_for_load_state("domcontentloaded")
-            time.sleep(0.5)
+            goto(page, url)
 
             # Find all buttons
             buttons = page.locator("button:visible")
@@ -388,15 +357,13 @@ def test_forms_validation(page: Page):
 
     try:
         # Test login form validation
-        page.goto(f"{BASE_URL}/login", wait_until="domcontentloaded")
-        page.wait_for_load_state("domcontentloaded")
-        time.sleep(0.5)
+        goto(page, f"{BASE_URL}/login")
 
         # Try submitting empty form
         submit_btn = page.locator("button[type='submit'], button:has-text('התחבר'), button:has-text('כניסה')").first
         if submit_btn:
             submit_btn.click()
-            time.sleep(0.5)
+            wait_for_network_quiet(page)
 
             # Check if form shows validation errors or prevents submission
             # (This is a basic check - the form should not navigate away)
@@ -413,9 +380,7 @@ def test_rtl_layout(page: Page):
     print("\n--- Testing RTL Layout ---")
 
     try:
-        page.goto(f"{BASE_URL}/dashboard", wait_until="domcontentloaded")
-        page.wait_for_load_state("domcontentloaded")
-        time.sleep(0.5)
+        goto(page, f"{BASE_URL}/dashboard")
 
         # Check HTML dir attribute or body direction
         html_dir = page.locator("html").get_attribute("dir")
@@ -446,9 +411,8 @@ def test_console_errors(page: Page):
     for path in pages:
         console_errors.clear()
         try:
-            page.goto(f"{BASE_URL}{path}", wait_until="domcontentloaded")
-            page.wait_for_load_state("domcontentloaded")
-            time.sleep(1)
+            goto(page, f"{BASE_URL}{path}")
+            wait_for_network_quiet(page)
 
             if len(console_errors) == 0:
                 results.add_pass(f"Console: No errors on {path}")
@@ -463,48 +427,75 @@ def test_console_errors(page: Page):
         except Exception as e:
             results.add_fail(f"Console: Check for {path}", str(e))
 
+ALL_TESTS = [
+    test_navigation,
+    test_login_page,
+    test_dashboard_page,
+    test_budget_page,
+    test_setup_wizard,
+    test_sidebar_navigation,
+    test_responsive_design,
+    test_buttons_and_interactions,
+    test_forms_validation,
+    test_rtl_layout,
+    test_console_errors,
+]
+
 def main():
     print("="*60)
     print("PiterPay Comprehensive QA Test Suite")
     print("="*60)
 
+    ensure_storage_state(BASE_URL)
+
+    schedule = Schedule([("comprehensive", test.__name__) for test in ALL_TESTS])
+    schedule.start(1)
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
-        context = browser.new_context(
-            viewport={"width": 1280, "height": 720},
-            locale="he-IL"
-        )
+        context = new_qa_context(browser, profile=RESOURCE_PROFILE)
         page = context.new_page()
 
         # Run all tests
-        test_navigation(page)
-        test_login_page(page)
-        test_dashboard_page(page)
-        test_budget_page(page)
-        test_setup_wizard(page)
-        test_sidebar_navigation(page)
-        test_responsive_design(page)
-        test_buttons_and_interactions(page)
-        test_forms_validation(page)
-        test_rtl_layout(page)
-        test_console_errors(page)
+        for index, test in enumerate(ALL_TESTS):
+            with schedule.timing(index):
+                test(page)
 
+        collect_vitals(context)
         browser.close()
+    schedule.save()
+
+    flush_screenshots()
+    for comparison in visual.results.failures():
+        results.add_fail(f"Visual {comparison.key}", comparison.details)
 
     # Print summary
     all_passed = results.summary()
+    wait_stats.print_summary()
+    hydration_metrics.print_summary()
+    vitals_metrics.print_summary()
+    asset_stats.print_summary()
+    profiles.usage.print_summary()
+    print_screenshot_summary()
+    visual.results.print_summary()
 
     # Save results to file
     with open("/tmp/qa_test_results.json", "w") as f:
         json.dump({
-            "passed": results.passed,
-            "failed": results.failed,
-            "total_passed": len(results.passed),
-            "total_failed": len(results.failed)
+            "run": RUN_ID,
+            "results_file": results.path,
+            "failed": results.failures,
+            "total_passed": results.passed,
+            "total_failed": results.failed,
+            "waits": wait_stats.summary(),
+            "hydration": hydration_metrics.summary(),
+            "vitals": vitals_metrics.summary(),
+            "resource_profiles": profiles.usage.export(),
+            "visual": visual.results.summary()
         }, f, indent=2, ensure_ascii=False)
 
     print("\nScreenshots saved to /tmp/")
     print("Results saved to /tmp/qa_test_results.json")
+    history.ingest_run()
 
     return 0 if all_passed else 1
 
@@ -5,47 +5,41 @@ Tests every functionality on every page in the system
 """
 
 from playwright.sync_api import sync_playwright, Page, expect
-import time
+import argparse
+import os
 import json
+from urllib.parse import urlparse
 
-BASE_URL = "http://localhost:5178"
+from qa_support import artifacts, collectors, history, parallel, profiles, replay, visual
+from qa_support.assets import stats as asset_stats
+from qa_support.auth import ensure_storage_state
+from qa_support.context import BASE_URL, new_qa_context
+from qa_support.hydration import goto, metrics as hydration_metrics
+from qa_support.navigation import metrics as navigation_metrics, navigate
+from qa_support.results import RUN_ID, Results
+from qa_support.schedule import Schedule
+from qa_support.screenshots import flush as flush_screenshots, print_summary as print_screenshot_summary
+from qa_support.timings import metrics as timing_metrics
+from qa_support.vitals import collect_pages as collect_vitals, metrics as vitals_metrics
+from qa_support.waits import stats as wait_stats, wait_for_animations, wait_for_network_quiet
 
-class TestResults:
-    def __init__(self):
-        self.passed = []
-        self.failed = []
 
-    def add_pass(self, test_name):
-        self.passed.append(test_name)
-        print(f"✅ PASS: {test_name}")
+# Resource profile of this suite's contexts (qa_support.profiles) - it takes screenshots
+RESOURCE_PROFILE = "full"
 
-    def add_fail(self, test_name, error):
-        self.failed.append({"test": test_name, "error": str(error)})
-        print(f"❌ FAIL: {test_name} - {error}")
+results = Results("deep")
 
-    def summary(self):
-        total = len(self.passed) + len(self.failed)
-        print("\n" + "="*60)
-        print(f"TOTAL TESTS: {total}")
-        print(f"PASSED: {len(self.passed)}")
-        print(f"FAILED: {len(self.failed)}")
-        print("="*60)
+def safe_goto(page: Page, url: str, test_name: str, soft: bool = False):
+    """Safely navigate to a page with proper waits
 
-        if self.failed:
-            print("\nFAILED TESTS:")
-            for f in self.failed:
-                print(f"  - {f['test']}: {f['error']}")
-
-        return len(self.failed) == 0
-
-results = TestResults()
-
-def safe_goto(page: Page, url: str, test_name: str):
-    """Safely navigate to a page with proper waits"""
+    soft=True moves through the client router when the app is already loaded.
+    """
+    results.route = urlparse(url).path
     try:
-        page.goto(url, wait_until="domcontentloaded", timeout=30000)
-        page.wait_for_load_state("domcontentloaded")
-        time.sleep(0.5)
+        if soft:
+            navigate(page, url)
+        else:
+            goto(page, url)
         return True
     except Exception as e:
         results.add_fail(f"{test_name}: Navigation", str(e))
@@ -63,7 +57,7 @@ def test_login_page_deep(page: Page):
     if not safe_goto(page, f"{BASE_URL}/login", "Login"):
         return
 
-    page.screenshot(path="/tmp/deep_login.png", full_page=True)
+    artifacts.screenshot(page, "/tmp/deep_login.png", full_page=True, visual="deep")
 
     # Test 1: Page structure
     try:
@@ -142,7 +136,7 @@ def test_login_page_deep(page: Page):
         email_input.clear()
         password_input.clear()
         submit_btn.click()
-        time.sleep(0.5)
+        wait_for_network_quiet(page)
 
         # Should stay on login page
         if "/login" in page.url or page.url == f"{BASE_URL}/":
@@ -158,7 +152,7 @@ def test_login_page_deep(page: Page):
         email_input.fill("invalid-email")
         submit_btn = page.locator("button[type='submit'], button:has-text('התחבר')").first
         submit_btn.click()
-        time.sleep(0.5)
+        wait_for_network_quiet(page)
 
         if "/login" in page.url or "/dashboard" not in page.url:
             results.add_pass("Login: Invalid email validation")
@@ -199,7 +193,7 @@ def test_dashboard_page_deep(page: Page):
     if not safe_goto(page, f"{BASE_URL}/dashboard", "Dashboard"):
         return
 
-    page.screenshot(path="/tmp/deep_dashboard.png", full_page=True)
+    artifacts.screenshot(page, "/tmp/deep_dashboard.png", full_page=True, visual="deep")
 
     # Test 1: Header component
     try:
@@ -284,7 +278,7 @@ def test_dashboard_page_deep(page: Page):
     try:
         dashboard_tab = page.locator("button:has-text('לוח הבקרה')").first
         dashboard_tab.click()
-        time.sleep(1)
+        wait_for_animations(page)
 
         # Check for summary cards (הכנסות, הוצאות, יתרה, תקציב נותר)
         income_text = page.locator("text=הכנסות")
@@ -322,7 +316,7 @@ def test_dashboard_page_deep(page: Page):
     try:
         details_tab = page.locator("button:has-text('פרטים')").first
         details_tab.click()
-        time.sleep(0.5)
+        wait_for_animations(page)
 
         recent_tx = page.locator("text=פעולות אחרונות")
         if recent_tx.count() > 0:
@@ -338,7 +332,7 @@ def test_dashboard_page_deep(page: Page):
         if menu_btn.count() > 0:
             results.add_pass("Dashboard: Menu button exists")
             menu_btn.click()
-            time.sleep(0.5)
+            wait_for_animations(page)
 
             # Check sidebar opened
             sidebar = page.locator("aside")
@@ -349,7 +343,7 @@ def test_dashboard_page_deep(page: Page):
                 close_btn = page.locator("button[aria-label='סגור תפריט']")
                 if close_btn.count() > 0:
                     close_btn.click()
-                    time.sleep(0.3)
+                    wait_for_animations(page)
                     results.add_pass("Dashboard: Sidebar closes")
             else:
                 results.add_fail("Dashboard: Sidebar opens", "Not visible")
@@ -362,13 +356,13 @@ def test_dashboard_page_deep(page: Page):
     try:
         # First switch to dashboard tab to see floating button
         page.locator("button:has-text('לוח הבקרה')").first.click()
-        time.sleep(0.5)
+        wait_for_animations(page)
 
         float_btn = page.locator("button[aria-label='פתח צ\\'אט']")
         if float_btn.count() > 0:
             results.add_pass("Dashboard: Floating chat button exists")
             float_btn.click()
-            time.sleep(0.3)
+            wait_for_animations(page)
 
             # Should switch to chat tab
             chat_header = page.locator("text=פיטר - היועץ התקציבי")
@@ -391,7 +385,7 @@ def test_budget_page_deep(page: Page):
     if not safe_goto(page, f"{BASE_URL}/budget", "Budget"):
         return
 
-    page.screenshot(path="/tmp/deep_budget.png", full_page=True)
+    artifacts.screenshot(page, "/tmp/deep_budget.png", full_page=True, visual="deep")
 
     # Test 1: Page title
     try:
@@ -414,7 +408,7 @@ def test_budget_page_deep(page: Page):
                 # Click and verify tab is active
                 tab.wait_for(state="visible", timeout=5000)
                 tab.click(timeout=5000)
-                time.sleep(0.3)
+                wait_for_animations(page)
                 results.add_pass(f"Budget: Tab '{tab_name}' clickable")
             else:
                 results.add_fail(f"Budget: Tab '{tab_name}' exists", "Not found")
@@ -427,7 +421,7 @@ def test_budget_page_deep(page: Page):
         if add_btn.count() > 0:
             results.add_pass("Budget: Add button exists")
             add_btn.first.click()
-            time.sleep(0.5)
+            wait_for_animations(page)
 
             # Check if modal/dialog opened
             dialog = page.locator("[role='dialog'], [class*='modal'], [class*='Dialog']")
@@ -438,11 +432,11 @@ def test_budget_page_deep(page: Page):
                 close_btn = page.locator("button:has-text('ביטול'), button:has-text('סגור'), button[aria-label='Close']")
                 if close_btn.count() > 0:
                     close_btn.first.click()
-                    time.sleep(0.3)
+                    wait_for_animations(page)
                 else:
                     # Press escape
                     page.keyboard.press("Escape")
-                    time.sleep(0.3)
+                    wait_for_animations(page)
             else:
                 results.add_pass("Budget: Add button clicked (inline form)")
         else:
@@ -454,22 +448,22 @@ def test_budget_page_deep(page: Page):
     try:
         # Income tab
         page.locator("button:has-text('הכנסות')").first.click()
-        time.sleep(0.3)
+        wait_for_animations(page)
         results.add_pass("Budget: Income tab content loaded")
 
         # Fixed expenses tab
         page.locator("button:has-text('הוצאות קבועות')").first.click()
-        time.sleep(0.3)
+        wait_for_animations(page)
         results.add_pass("Budget: Fixed expenses tab content loaded")
 
         # Variable expenses tab
         page.locator("button:has-text('הוצאות משתנות')").first.click()
-        time.sleep(0.3)
+        wait_for_animations(page)
         results.add_pass("Budget: Variable expenses tab content loaded")
 
         # Goals tab
         page.locator("button:has-text('יעדים')").first.click()
-        time.sleep(0.3)
+        wait_for_animations(page)
         results.add_pass("Budget: Goals tab content loaded")
     except Exception as e:
         results.add_fail("Budget: Tab content switching", str(e))
@@ -496,7 +490,7 @@ def test_setup_page_deep(page: Page):
     if not safe_goto(page, f"{BASE_URL}/setup", "Setup"):
         return
 
-    page.screenshot(path="/tmp/deep_setup.png", full_page=True)
+    artifacts.screenshot(page, "/tmp/deep_setup.png", full_page=True, visual="deep")
 
     # Test 1: Step indicators
     try:
@@ -582,7 +576,7 @@ def test_profile_page_deep(page: Page):
     if not safe_goto(page, f"{BASE_URL}/profile", "Profile"):
         return
 
-    page.screenshot(path="/tmp/deep_profile.png", full_page=True)
+    artifacts.screenshot(page, "/tmp/deep_profile.png", full_page=True, visual="deep")
 
     # Test 1: Page title or header
     try:
@@ -636,7 +630,7 @@ def test_household_page_deep(page: Page):
     if not safe_goto(page, f"{BASE_URL}/household", "Household"):
         return
 
-    page.screenshot(path="/tmp/deep_household.png", full_page=True)
+    artifacts.screenshot(page, "/tmp/deep_household.png", full_page=True, visual="deep")
 
     # Test 1: Page title
     try:
@@ -690,7 +684,7 @@ def test_savings_page_deep(page: Page):
     if not safe_goto(page, f"{BASE_URL}/savings", "Savings"):
         return
 
-    page.screenshot(path="/tmp/deep_savings.png", full_page=True)
+    artifacts.screenshot(page, "/tmp/deep_savings.png", full_page=True, visual="deep")
 
     # Test 1: Page content
     try:
@@ -724,7 +718,7 @@ def test_analysis_page_deep(page: Page):
     if not safe_goto(page, f"{BASE_URL}/analysis", "Analysis"):
         return
 
-    page.screenshot(path="/tmp/deep_analysis.png", full_page=True)
+    artifacts.screenshot(page, "/tmp/deep_analysis.png", full_page=True, visual="deep")
 
     # Test 1: Page content
     try:
@@ -758,7 +752,7 @@ def test_monthly_overview_page_deep(page: Page):
     if not safe_goto(page, f"{BASE_URL}/monthly-overview", "Monthly Overview"):
         return
 
-    page.screenshot(path="/tmp/deep_monthly.png", full_page=True)
+    artifacts.screenshot(page, "/tmp/deep_monthly.png", full_page=True, visual="deep")
 
     # Test 1: Page title
     try:
@@ -812,7 +806,7 @@ def test_tasks_page_deep(page: Page):
     if not safe_goto(page, f"{BASE_URL}/tasks", "Tasks"):
         return
 
-    page.screenshot(path="/tmp/deep_tasks.png", full_page=True)
+    artifacts.screenshot(page, "/tmp/deep_tasks.png", full_page=True, visual="deep")
 
     # Test 1: Page title
     try:
@@ -870,7 +864,7 @@ def test_guide_page_deep(page: Page):
     if not safe_goto(page, f"{BASE_URL}/guide", "Guide"):
         return
 
-    page.screenshot(path="/tmp/deep_guide.png", full_page=True)
+    artifacts.screenshot(page, "/tmp/deep_guide.png", full_page=True, visual="deep")
 
     # Test 1: Page title
     try:
@@ -914,7 +908,7 @@ def test_about_page_deep(page: Page):
     if not safe_goto(page, f"{BASE_URL}/about", "About"):
         return
 
-    page.screenshot(path="/tmp/deep_about.png", full_page=True)
+    artifacts.screenshot(page, "/tmp/deep_about.png", full_page=True, visual="deep")
 
     # Test 1: Page title
     try:
@@ -958,7 +952,7 @@ def test_contact_page_deep(page: Page):
     if not safe_goto(page, f"{BASE_URL}/contact", "Contact"):
         return
 
-    page.screenshot(path="/tmp/deep_contact.png", full_page=True)
+    artifacts.screenshot(page, "/tmp/deep_contact.png", full_page=True, visual="deep")
 
     # Test 1: Page title
     try:
@@ -1006,7 +1000,7 @@ def test_privacy_page_deep(page: Page):
     if not safe_goto(page, f"{BASE_URL}/privacy", "Privacy"):
         return
 
-    page.screenshot(path="/tmp/deep_privacy.png", full_page=True)
+    artifacts.screenshot(page, "/tmp/deep_privacy.png", full_page=True, visual="deep")
 
     # Test 1: Page title
     try:
@@ -1040,7 +1034,7 @@ def test_terms_page_deep(page: Page):
     if not safe_goto(page, f"{BASE_URL}/terms", "Terms"):
         return
 
-    page.screenshot(path="/tmp/deep_terms.png", full_page=True)
+    artifacts.screenshot(page, "/tmp/deep_terms.png", full_page=True, visual="deep")
 
     # Test 1: Page title
     try:
@@ -1078,14 +1072,14 @@ def test_navigation_consistency(page: Page):
 
     for path in pages:
         try:
-            if not safe_goto(page, f"{BASE_URL}{path}", f"Nav-{path}"):
+            if not safe_goto(page, f"{BASE_URL}{path}", f"Nav-{path}", soft=True):
                 continue
 
             # Open sidebar
             menu_btn = page.locator("button[aria-label='פתח תפריט']")
             if menu_btn.count() > 0:
                 menu_btn.click()
-                time.sleep(0.3)
+                wait_for_animations(page)
 
                 # Check sidebar links exist
                 sidebar = page.locator("aside")
@@ -1094,7 +1088,7 @@ def test_navigation_consistency(page: Page):
 
                     # Close sidebar
                     page.keyboard.press("Escape")
-                    time.sleep(0.2)
+                    wait_for_animations(page)
                 else:
                     results.add_fail(f"NavConsistency: Sidebar on {path}", "Not visible")
             else:
@@ -1102,6 +1096,7 @@ def test_navigation_consistency(page: Page):
         except Exception as e:
             results.add_fail(f"NavConsistency: {path}", str(e))
 
+@profiles.uses_profile("dom-only")
 def test_rtl_consistency(page: Page):
     """Test RTL layout consistency"""
     print("\n" + "="*60)
@@ -1160,59 +1155,119 @@ def test_responsive_all_pages(page: Page):
 # ============================================================
 # MAIN EXECUTION
 # ============================================================
-def main():
-    print("="*60)
-    print("PiterPay DEEP QA Test Suite - Page by Page")
-    print("="*60)
-
+PAGE_TESTS = [
+    test_login_page_deep,
+    test_dashboard_page_deep,
+    test_budget_page_deep,
+    test_setup_page_deep,
+    test_profile_page_deep,
+    test_household_page_deep,
+    test_savings_page_deep,
+    test_analysis_page_deep,
+    test_monthly_overview_page_deep,
+    test_tasks_page_deep,
+    test_guide_page_deep,
+    test_about_page_deep,
+    test_contact_page_deep,
+    test_privacy_page_deep,
+    test_terms_page_deep,
+]
+
+CROSS_PAGE_TESTS = [
+    test_navigation_consistency,
+    test_rtl_consistency,
+    test_responsive_all_pages,
+]
+
+def run_serial():
+    """Run every deep test on one shared page"""
+    tests = PAGE_TESTS + CROSS_PAGE_TESTS
+    schedule = Schedule([("deep", test.__name__) for test in tests])
+    schedule.start(1)
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
-        context = browser.new_context(
-            viewport={"width": 1280, "height": 720},
-            locale="he-IL"
-        )
+        context = new_qa_context(browser, profile=RESOURCE_PROFILE)
         page = context.new_page()
 
-        # Run all deep tests
-        test_login_page_deep(page)
-        test_dashboard_page_deep(page)
-        test_budget_page_deep(page)
-        test_setup_page_deep(page)
-        test_profile_page_deep(page)
-        test_household_page_deep(page)
-        test_savings_page_deep(page)
-        test_analysis_page_deep(page)
-        test_monthly_overview_page_deep(page)
-        test_tasks_page_deep(page)
-        test_guide_page_deep(page)
-        test_about_page_deep(page)
-        test_contact_page_deep(page)
-        test_privacy_page_deep(page)
-        test_terms_page_deep(page)
-
-        # Cross-page tests
-        test_navigation_consistency(page)
-        test_rtl_consistency(page)
-        test_responsive_all_pages(page)
+        for index, test in enumerate(tests):
+            with schedule.timing(index), artifacts.recording(page, test.__name__, lambda: results.failed):
+                test(page)
 
+        collect_vitals(context)
         browser.close()
+    schedule.save()
+
+    flush_screenshots()
+    for comparison in visual.results.failures():
+        results.add_fail(f"Visual {comparison.key}", comparison.details)
+
+def run_parallel(workers: int):
+    """Spread the deep tests over worker processes and merge their results"""
+    tasks = [("qa_deep_test", test.__name__) for test in PAGE_TESTS + CROSS_PAGE_TESTS]
+    schedule = Schedule([("deep", test_name) for _, test_name in tasks])
+    outcomes = parallel.run_tasks(parallel.run_isolated, tasks, workers, schedule)
+    schedule.save()
+    schedule.print_summary()
+    for outcome in outcomes:
+        results.merge(outcome["results"])
+        collectors.extend(outcome)
+
+def main(workers: int = 1):
+    print("="*60)
+    print("PiterPay DEEP QA Test Suite - Page by Page")
+    print("="*60)
+
+    ensure_storage_state(BASE_URL)
+
+    if workers == 1:
+        run_serial()
+    else:
+        workers = parallel.resolve_workers(workers)
+        print(f"Running with {workers} workers")
+        run_parallel(workers)
 
     # Print summary
     all_passed = results.summary()
+    wait_stats.print_summary()
+    hydration_metrics.print_summary()
+    vitals_metrics.print_summary()
+    timing_metrics.print_summary()
+    navigation_metrics.print_summary()
+    asset_stats.print_summary()
+    profiles.usage.print_summary()
+    replay.stats.print_summary()
+    print_screenshot_summary()
+    visual.results.print_summary()
 
     # Save results to file
     with open("/tmp/qa_deep_results.json", "w") as f:
         json.dump({
-            "passed": results.passed,
-            "failed": results.failed,
-            "total_passed": len(results.passed),
-            "total_failed": len(results.failed)
+            "run": RUN_ID,
+            "results_file": results.path,
+            "failed": results.failures,
+            "total_passed": results.passed,
+            "total_failed": results.failed,
+            "waits": wait_stats.summary(),
+            "hydration": hydration_metrics.summary(),
+            "vitals": vitals_metrics.summary(),
+            "load_breakdown": timing_metrics.summary(),
+            "navigation": navigation_metrics.summary(),
+            "asset_cache": asset_stats.summary(),
+            "resource_profiles": profiles.usage.export(),
+            "visual": visual.results.summary()
         }, f, indent=2, ensure_ascii=False)
 
-    print("\nScreenshots saved to /tmp/deep_*.png")
+    print(f"\nFailure artifacts saved to {artifacts.ARTIFACTS_DIR}")
     print("Results saved to /tmp/qa_deep_results.json")
+    history.ingest_run()
 
     return 0 if all_passed else 1
 
 if __name__ == "__main__":
-    exit(main())
+    parser = argparse.ArgumentParser(description="PiterPay deep QA suite")
+    parser.add_argument(
+        "--workers", type=int, default=int(os.environ.get("QA_WORKERS", "1")),
+        help="parallel workers, one browser each (0 = one per CPU core)"
+    )
+    args = parser.parse_args()
+    exit(main(args.workers))
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+QA Orchestrator for PiterPay
+Runs all six Python QA suites on a process pool (one browser per process)
+and writes a single merged report
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from datetime import datetime
+
+from qa_support import assets, budgets, collectors, coverage, history, hydration, navigation, parallel, profiles, replay, timings, visual, vitals
+from qa_support.auth import ensure_storage_state
+from qa_support.context import BASE_URL
+from qa_support.results import RESULTS_FILE, RUN_ID, STATUSES, Results
+from qa_support.schedule import Schedule
+from qa_support.suites import SUITES, collect_tasks, run_task
+
+REPORT_FILE = "/tmp/piterpay-qa-merged.json"
+
+def print_summary(report):
+    print("\n" + "="*60)
+    print("MERGED QA REPORT")
+    print("="*60)
+    for suite, totals in report["suites"].items():
+        print(f"  {suite:20} ✅ {totals['pass']:4d}  ❌ {totals['fail']:4d}  ⚠️  {totals['warning']:4d}")
+    print("-"*60)
+    totals = report["totals"]
+    print(f"TOTAL: {sum(totals.values())}  PASSED: {totals['pass']}  FAILED: {totals['fail']}  WARNINGS: {totals['warning']}")
+    print(f"Wall time: {report['wall_time_ms'] / 1000:.1f}s on {report['workers']} workers")
+    print("="*60)
+    schedule = report["schedule"]
+    if schedule:
+        print(f"SCHEDULE: longest first, makespan {schedule['makespan_ms'] / 1000:.1f}s vs ideal "
+              f"{schedule['ideal_ms'] / 1000:.1f}s ({schedule['efficiency']:.0%}), "
+              f"{schedule['from_history']}/{schedule['tasks']} estimates from history")
+    hydration.metrics.print_summary()
+    vitals.metrics.print_summary()
+    budgets.print_summary(report["budgets"])
+    timings.metrics.print_summary()
+    coverage.report.print_summary()
+    navigation.metrics.print_summary()
+    assets.stats.print_summary()
+    profiles.usage.print_summary()
+    replay.stats.print_summary()
+    visual.results.print_summary()
+
+    if report["failures"]:
+        print("\nFAILED TESTS:")
+        for f in report["failures"]:
+            print(f"  - [{f['suite']}] {f['test']}: {f['error']}")
+    print(f"\nEvery result of this run is in {report['results_file']} (run {report['run']})")
+
+def main(suites=None, workers=None):
+    tasks = collect_tasks(suites)
+    workers = min(parallel.resolve_workers(workers), len(tasks))
+
+    print("="*60)
+    print(f"PiterPay QA Orchestrator - {len(tasks)} tasks on {workers} workers")
+    print("="*60)
+
+    # Log in once here so the workers all start from the saved session
+    ensure_storage_state(BASE_URL)
+
+    schedule = Schedule(tasks)
+    start = time.time()
+    outcomes = parallel.run_tasks(run_task, tasks, workers, schedule)
+    wall_time_ms = (time.time() - start) * 1000
+    schedule.save()
+
+    per_suite = {}
+    for outcome in outcomes:
+        per_suite.setdefault(outcome["suite"], Results(outcome["suite"], echo=False)).merge(outcome["results"])
+        collectors.extend(outcome)
+    budget_checks = []
+    if vitals.metrics.samples:
+        per_suite["budgets"] = Results("budgets", echo=False)
+        budget_checks = budgets.enforce(per_suite["budgets"], vitals.metrics.samples)
+    totals = Counter()
+    for suite_results in per_suite.values():
+        totals.update(suite_results.counts)
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "workers": workers,
+        "wall_time_ms": wall_time_ms,
+        "run": RUN_ID,
+        "totals": {status: totals.get(status, 0) for status in STATUSES},
+        "suites": {suite: r.export()["counts"] for suite, r in per_suite.items()},
+        "schedule": schedule.summary(),
+        "tasks": [
+            {"suite": o["suite"], "unit": o["unit"], "duration_ms": o["duration_ms"],
+             "estimated_ms": round(schedule.estimates[(o["suite"], o["unit"])][0]),
+             "resource_profiles": o["resource_profiles"]}
+            for o in outcomes
+        ],
+        "hydration": hydration.metrics.summary(),
+        "vitals": vitals.metrics.summary(),
+        "budgets": [check.export() for check in budget_checks],
+        "load_breakdown": timings.metrics.summary(),
+        "coverage": coverage.report.export(),
+        "navigation": navigation.metrics.summary(),
+        "asset_cache": assets.stats.summary(),
+        "resource_profiles": profiles.usage.export(),
+        "replay": replay.stats.export(),
+        "visual": visual.results.summary(),
+        "results_file": RESULTS_FILE,
+        "failures": [{"suite": suite, **f} for suite, r in per_suite.items() for f in r.failures],
+    }
+
+    print_summary(report)
+
+    with open(REPORT_FILE, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nMerged report saved to {REPORT_FILE}")
+    history.ingest_run()
+
+    return 0 if totals.get("fail", 0) == 0 else 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run every PiterPay QA suite on a process pool")
+    parser.add_argument(
+        "--suites", default=",".join(SUITES),
+        help=f"comma-separated suites to run (default: {','.join(SUITES)})"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=int(os.environ.get("QA_WORKERS", "0")),
+        help="worker processes, one browser each (0 = one per CPU core)"
+    )
+    args = parser.parse_args()
+    exit(main(args.suites.split(","), args.workers))
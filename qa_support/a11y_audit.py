@@ -0,0 +1,185 @@
+"""
+Batched in-page accessibility audit
+Alt text, accessible names, labels, ARIA roles and focus order in one evaluation
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+RULES = ["img-alt", "button-name", "input-label", "aria-role", "focus-order"]
+
+AUDIT_JS = """
+() => {
+    const VALID_ROLES = new Set([
+        'alert', 'alertdialog', 'application', 'article', 'banner', 'blockquote', 'button', 'caption',
+        'cell', 'checkbox', 'code', 'columnheader', 'combobox', 'comment', 'complementary', 'contentinfo',
+        'definition', 'deletion', 'dialog', 'directory', 'document', 'emphasis', 'feed', 'figure', 'form',
+        'generic', 'grid', 'gridcell', 'group', 'heading', 'image', 'img', 'insertion', 'link', 'list',
+        'listbox', 'listitem', 'log', 'main', 'mark', 'marquee', 'math', 'menu', 'menubar', 'menuitem',
+        'menuitemcheckbox', 'menuitemradio', 'meter', 'navigation', 'none', 'note', 'option', 'paragraph',
+        'presentation', 'progressbar', 'radio', 'radiogroup', 'region', 'row', 'rowgroup', 'rowheader',
+        'scrollbar', 'search', 'searchbox', 'separator', 'slider', 'spinbutton', 'status', 'strong',
+        'subscript', 'suggestion', 'superscript', 'switch', 'tab', 'table', 'tablist', 'tabpanel', 'term',
+        'textbox', 'time', 'timer', 'toolbar', 'tooltip', 'tree', 'treegrid', 'treeitem',
+    ]);
+    // Roles that are only meaningful inside a specific container role
+    const REQUIRED_PARENT = {
+        tab: ['tablist'],
+        option: ['listbox', 'combobox', 'group'],
+        menuitem: ['menu', 'menubar', 'group'],
+        menuitemcheckbox: ['menu', 'menubar', 'group'],
+        menuitemradio: ['menu', 'menubar', 'group'],
+        listitem: ['list', 'directory'],
+        treeitem: ['tree', 'group'],
+        row: ['table', 'grid', 'treegrid', 'rowgroup'],
+    };
+    const IMPLICIT_ROLES = {UL: 'list', OL: 'list', TABLE: 'table', SELECT: 'listbox', DATALIST: 'listbox'};
+
+    const findings = [];
+    const add = (rule, el, status, message) => findings.push({rule, element: describe(el), status, message});
+
+    const text = s => (s || '').replace(/\\s+/g, ' ').trim();
+    const describe = el => {
+        let out = el.tagName.toLowerCase();
+        if (el.id) out += '#' + el.id;
+        const label = text(el.getAttribute('aria-label') || el.innerText || el.getAttribute('placeholder'));
+        if (label) out += ' "' + label.slice(0, 30) + '"';
+        return out;
+    };
+    const isVisible = el => {
+        if (getComputedStyle(el).visibility !== 'visible') return false;
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    };
+    const isOffscreen = el => {
+        const rect = el.getBoundingClientRect();
+        return rect.right <= 0 || rect.left >= window.innerWidth;
+    };
+    const byIds = ids => text((ids || '').split(/\\s+/).map(id => {
+        const ref = id && document.getElementById(id);
+        return ref ? ref.innerText : '';
+    }).join(' '));
+    const roleOf = el => (el.getAttribute('role') || '').trim().split(/\\s+/)[0] || IMPLICIT_ROLES[el.tagName] || '';
+
+    // Simplified accessible name computation (aria-labelledby > aria-label > content > title)
+    const accessibleName = el => {
+        const labelledBy = byIds(el.getAttribute('aria-labelledby'));
+        if (labelledBy) return labelledBy;
+        const ariaLabel = text(el.getAttribute('aria-label'));
+        if (ariaLabel) return ariaLabel;
+        const content = text(el.innerText);
+        if (content) return content;
+        const imgAlt = Array.from(el.querySelectorAll('img[alt]')).map(img => text(img.alt)).join(' ');
+        if (text(imgAlt)) return text(imgAlt);
+        const svgTitle = el.querySelector('svg title');
+        if (svgTitle && text(svgTitle.textContent)) return text(svgTitle.textContent);
+        return text(el.getAttribute('title'));
+    };
+
+    // img-alt: alt="" is a valid decorative image, a missing alt is not
+    for (const img of document.querySelectorAll('img')) {
+        if (!img.hasAttribute('alt')) add('img-alt', img, 'fail', 'Missing alt attribute');
+        else if (!text(img.alt)) add('img-alt', img, 'pass', 'Decorative image (alt="")');
+        else add('img-alt', img, 'pass', 'Has alt text');
+    }
+
+    // button-name
+    for (const btn of document.querySelectorAll("button, [role='button'], input[type='submit'], input[type='button']")) {
+        const name = btn.tagName === 'INPUT' ? text(btn.value || btn.getAttribute('aria-label')) : accessibleName(btn);
+        if (name) add('button-name', btn, 'pass', 'Accessible name: ' + name.slice(0, 40));
+        else add('button-name', btn, 'fail', 'No accessible name');
+    }
+
+    // input-label
+    const fields = document.querySelectorAll(
+        "input:not([type='hidden']):not([type='submit']):not([type='button']):not([type='image']), textarea, select"
+    );
+    for (const input of fields) {
+        const forLabel = input.id ? document.querySelector('label[for="' + CSS.escape(input.id) + '"]') : null;
+        const wrapping = input.closest('label');
+        const source =
+            byIds(input.getAttribute('aria-labelledby')) ? 'aria-labelledby' :
+            text(input.getAttribute('aria-label')) ? 'aria-label' :
+            forLabel && text(forLabel.innerText) ? 'label[for]' :
+            wrapping && text(wrapping.innerText) ? 'wrapping label' :
+            text(input.getAttribute('title')) ? 'title' : null;
+        if (source) add('input-label', input, 'pass', 'Labelled by ' + source);
+        else if (text(input.getAttribute('placeholder'))) add('input-label', input, 'warning', 'Only a placeholder, no label');
+        else add('input-label', input, 'fail', 'No label');
+    }
+
+    // aria-role
+    for (const el of document.querySelectorAll('[role]')) {
+        const role = roleOf(el);
+        if (!VALID_ROLES.has(role)) {
+            add('aria-role', el, 'fail', 'Invalid role "' + role + '"');
+            continue;
+        }
+        const parents = REQUIRED_PARENT[role];
+        if (parents) {
+            let ancestor = el.parentElement;
+            while (ancestor && ['none', 'presentation', 'generic', ''].includes(roleOf(ancestor))) {
+                ancestor = ancestor.parentElement;
+            }
+            if (!ancestor || !parents.includes(roleOf(ancestor))) {
+                add('aria-role', el, 'warning', 'Role "' + role + '" outside ' + parents.join('/'));
+                continue;
+            }
+        }
+        add('aria-role', el, 'pass', 'Role "' + role + '"');
+    }
+
+    // focus-order: browser tab sequence is positive tabindex first, then DOM order
+    const focusable = Array.from(document.querySelectorAll(
+        "a[href], button, input:not([type='hidden']), select, textarea, summary, iframe, " +
+        "[tabindex], [contenteditable=''], [contenteditable='true']"
+    )).filter(el => !el.matches(':disabled') && el.tabIndex >= 0);
+    const sequence = focusable
+        .map((el, index) => ({el, index, tab: el.tabIndex}))
+        .sort((a, b) => (a.tab || Infinity) - (b.tab || Infinity) || a.index - b.index)
+        .map(entry => entry.el);
+
+    const tabOrder = [];
+    for (const el of sequence) {
+        const desc = describe(el);
+        if (el.tabIndex > 0) {
+            add('focus-order', el, 'warning', 'Positive tabindex=' + el.tabIndex + ' overrides DOM order');
+        } else if (el.closest('[aria-hidden="true"]')) {
+            add('focus-order', el, 'fail', 'Focusable inside aria-hidden content');
+        } else if (!isVisible(el)) {
+            add('focus-order', el, 'warning', 'Focusable but not visible');
+        } else if (isOffscreen(el)) {
+            add('focus-order', el, 'warning', 'Focusable but off-screen');
+        } else {
+            add('focus-order', el, 'pass', 'Tab stop #' + (tabOrder.length + 1));
+        }
+        tabOrder.push(desc);
+    }
+
+    return {findings, tab_order: tabOrder};
+}
+"""
+
+
+@dataclass
+class AuditReport:
+    """Per-element findings of one accessibility audit"""
+    findings: List[Dict[str, Any]] = field(default_factory=list)
+    tab_order: List[str] = field(default_factory=list)
+
+    def by_rule(self, rule: str) -> List[Dict[str, Any]]:
+        return [f for f in self.findings if f["rule"] == rule]
+
+    def issues(self) -> List[Dict[str, Any]]:
+        """Findings that are not a pass"""
+        return [f for f in self.findings if f["status"] != "pass"]
+
+
+def run_audit(page) -> AuditReport:
+    """Audit a sync_api page"""
+    return AuditReport(**page.evaluate(AUDIT_JS))
+
+
+async def run_audit_async(page) -> AuditReport:
+    """Audit an async_api page"""
+    return AuditReport(**await page.evaluate(AUDIT_JS))
@@ -0,0 +1,161 @@
+"""
+Failure artifacts
+Screenshots, console buffers and traces kept per test under the QA_SCREENSHOTS/QA_TRACE policies
+"""
+
+import contextlib
+import os
+import re
+import weakref
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterator, List, Optional
+
+from qa_support import screenshots, visual as _visual
+
+POLICIES = ("always", "on-failure", "on-first-retry", "off")
+
+# Playwright's name for on-failure in its trace option
+ALIASES = {"retain-on-failure": "on-failure"}
+
+ARTIFACTS_DIR = Path(os.environ.get("QA_ARTIFACTS_DIR", "/tmp/piterpay-artifacts"))
+
+# Console messages kept per test
+CONSOLE_BUFFER = 200
+
+
+def _policy(variable: str, default: str) -> str:
+    policy = os.environ.get(variable, default)
+    policy = ALIASES.get(policy, policy)
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown {variable} policy: {policy} (expected one of {', '.join(POLICIES + tuple(ALIASES))})")
+    return policy
+
+
+SCREENSHOT_POLICY = _policy("QA_SCREENSHOTS", "on-failure")
+# Not on-first-retry: serial runs never retry, nor does the pool outside CI (QA_RETRIES)
+TRACE_POLICY = _policy("QA_TRACE", "retain-on-failure")
+
+
+def may_keep(policy: str, attempt: int) -> bool:
+    """Whether an artifact could be kept at all, i.e. is worth recording"""
+    if policy == "on-first-retry":
+        return attempt == 1
+    return policy != "off"
+
+
+def keeps(policy: str, attempt: int, failed: bool) -> bool:
+    """Whether a recorded artifact is kept once the test is over"""
+    if policy == "on-failure":
+        return failed
+    return may_keep(policy, attempt)
+
+
+def keeps_regardless(policy: str, attempt: int) -> bool:
+    """Whether an artifact is kept whatever the outcome, so it can be saved right away"""
+    return policy != "on-failure" and may_keep(policy, attempt)
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_-]+", "_", name).strip("_") or "test"
+
+
+# Contexts whose tracing is running; chunks are started per test
+_tracing = weakref.WeakSet()
+
+
+class Recording:
+    """Artifacts of one test on one page"""
+
+    def __init__(self, page, name: str, attempt: int = 0):
+        self.page = page
+        self.name = name
+        self.attempt = attempt
+        self.console: Deque[str] = deque(maxlen=CONSOLE_BUFFER)
+        self.tracing = may_keep(TRACE_POLICY, attempt)
+
+    @property
+    def directory(self) -> Path:
+        return ARTIFACTS_DIR / (_slug(self.name) + (f"-retry{self.attempt}" if self.attempt else ""))
+
+    def _on_console(self, msg):
+        self.console.append(f"[{msg.type}] {msg.text}")
+
+    def _on_page_error(self, error):
+        self.console.append(f"[pageerror] {error}")
+
+    def start(self):
+        if may_keep(SCREENSHOT_POLICY, self.attempt):
+            self.page.on("console", self._on_console)
+            self.page.on("pageerror", self._on_page_error)
+        if self.tracing:
+            context = self.page.context
+            if context not in _tracing:
+                context.tracing.start(screenshots=True, snapshots=True, sources=False)
+                _tracing.add(context)
+            context.tracing.start_chunk(title=self.name)
+
+    def finish(self, failed: bool) -> List[str]:
+        """Write or drop what was recorded; returns the paths written"""
+        kept: List[str] = []
+        if may_keep(SCREENSHOT_POLICY, self.attempt):
+            self.page.remove_listener("console", self._on_console)
+            self.page.remove_listener("pageerror", self._on_page_error)
+        if keeps(SCREENSHOT_POLICY, self.attempt, failed):
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if failed and not self.page.is_closed():
+                kept.append(screenshots.capture(self.page, str(self.directory / "failure.png"), full_page=True))
+            if self.console:
+                console_log = self.directory / "console.log"
+                console_log.write_text("\n".join(self.console) + "\n", encoding="utf-8")
+                kept.append(str(console_log))
+        if self.tracing:
+            if keeps(TRACE_POLICY, self.attempt, failed):
+                self.directory.mkdir(parents=True, exist_ok=True)
+                trace = self.directory / "trace.zip"
+                self.page.context.tracing.stop_chunk(path=str(trace))
+                kept.append(str(trace))
+            else:
+                self.page.context.tracing.stop_chunk()
+        return kept
+
+
+_active: Dict[int, Recording] = {}
+
+
+@contextlib.contextmanager
+def recording(page, name: str, failures: Callable[[], int], attempt: int = 0) -> Iterator[Recording]:
+    """Record artifacts for the test run in the block
+
+    failures returns the failure count of the results the test reports to;
+    the test failed when it went up or the block raised.
+    """
+    rec = Recording(page, name, attempt)
+    rec.start()
+    _active[id(page)] = rec
+    before = failures()
+    failed = True
+    try:
+        yield rec
+        failed = failures() > before
+    finally:
+        _active.pop(id(page), None)
+        kept = rec.finish(failed)
+        if kept:
+            print(f"📎 Artifacts for {name}: {rec.directory}")
+
+
+def screenshot(page, path: str, visual: Optional[str] = None, **options) -> Optional[str]:
+    """Screenshot for the test recording on page, taken only if the policy keeps it
+
+    Outside a recording the screenshot is always saved. Returns the path, or
+    None when no file is written (a failure still gets its failure.png).
+    visual is passed on to screenshots.capture(); the comparison runs even
+    when the file is not kept.
+    """
+    rec = _active.get(id(page))
+    if rec is None or keeps_regardless(SCREENSHOT_POLICY, rec.attempt):
+        return screenshots.capture(page, path, visual=visual, **options)
+    if visual and _visual.enabled():
+        screenshots.grab(page, visual, **options)
+    return None
@@ -0,0 +1,170 @@
+"""
+Static-asset cache shared by every context of a process
+Immutable JS/CSS chunks, fonts and icons are downloaded once per process
+"""
+
+import os
+import re
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from qa_support.collectors import register
+
+ENABLED = os.environ.get("QA_ASSET_CACHE", "1") != "0"
+
+MAX_BYTES = int(float(os.environ.get("QA_ASSET_CACHE_MB", "128")) * 1024 * 1024)
+
+# Requests routed through the cache
+ASSET_PATTERN = re.compile(r"/_next/static/|\.(?:woff2?|ttf|otf|png|jpe?g|gif|svg|ico|webp|avif)(?:\?|$)")
+
+# File names with a content hash (app-4f2a9c1b.js, font.7e3d2a90b1.woff2)
+HASHED_PATTERN = re.compile(r"[.\-_~][0-9a-f]{8,}\.\w+(?:\?|$)")
+
+# The body is stored decoded, so these no longer describe it
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+def cacheable(url: str, headers: Dict[str, str]) -> bool:
+    """Whether a response can be served again for the rest of the run"""
+    cache_control = headers.get("cache-control", "")
+    if "no-store" in cache_control:
+        return False
+    return "immutable" in cache_control or bool(HASHED_PATTERN.search(url))
+
+
+@dataclass
+class AssetCacheStats:
+    """Hit/miss counts of the asset cache"""
+    hits: int = 0
+    misses: int = 0
+    uncacheable: int = 0
+    evictions: int = 0
+    bytes_served: int = 0
+
+    def export(self) -> Dict[str, int]:
+        return asdict(self)
+
+    def snapshot(self) -> Dict[str, int]:
+        return self.export()
+
+    def since(self, snapshot: Optional[Dict[str, int]]) -> Dict[str, int]:
+        """Counts added after snapshot (an earlier snapshot()), to send back from a worker"""
+        snapshot = snapshot or {}
+        return {name: value - snapshot.get(name, 0) for name, value in self.export().items()}
+
+    def extend(self, exported: Dict[str, int]):
+        """Add counts exported by another process"""
+        for name, value in exported.items():
+            setattr(self, name, getattr(self, name) + value)
+
+    def summary(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {**self.export(), "hit_rate": self.hits / lookups if lookups else 0.0}
+
+    def print_summary(self):
+        lookups = self.hits + self.misses
+        if not lookups:
+            return
+        print(f"\nASSET CACHE: {self.hits}/{lookups} hits ({self.hits / lookups:.0%})  "
+              f"{self.bytes_served / 1024 / 1024:.1f}MB from memory  "
+              f"uncacheable {self.uncacheable}  evictions {self.evictions}")
+
+    def reset(self):
+        for name in self.export():
+            setattr(self, name, 0)
+
+
+Entry = Tuple[int, Dict[str, str], bytes]
+
+
+class AssetCache:
+    """Byte-capped LRU map of asset URL to (status, headers, body)"""
+
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[str, Entry]" = OrderedDict()
+        self.size = 0
+        self.stats = AssetCacheStats()
+
+    def get(self, url: str) -> Optional[Entry]:
+        entry = self.entries.get(url)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        self.entries.move_to_end(url)
+        self.stats.hits += 1
+        self.stats.bytes_served += len(entry[2])
+        return entry
+
+    def put(self, url: str, status: int, headers: Dict[str, str], body: bytes):
+        if len(body) > self.max_bytes:
+            return
+        if url in self.entries:
+            self.size -= len(self.entries.pop(url)[2])
+        headers = {k: v for k, v in headers.items() if k.lower() not in DROPPED_HEADERS}
+        self.entries[url] = (status, headers, body)
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, (_, _, evicted) = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+            self.stats.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+
+cache = AssetCache()
+stats = register("assets", cache.stats)
+
+
+def _store(route, response, body: bytes):
+    if response.ok and cacheable(route.request.url, response.headers):
+        cache.put(route.request.url, response.status, response.headers, body)
+    else:
+        stats.uncacheable += 1
+
+
+def install(context):
+    """Serve a sync_api context's static assets from the process-wide cache"""
+    if not ENABLED:
+        return
+
+    def handle(route):
+        if route.request.method != "GET":
+            route.fallback()
+            return
+        entry = cache.get(route.request.url)
+        if entry is not None:
+            status, headers, body = entry
+            route.fulfill(status=status, headers=headers, body=body)
+            return
+        response = route.fetch()
+        body = response.body()
+        _store(route, response, body)
+        route.fulfill(response=response, body=body)
+
+    context.route(ASSET_PATTERN, handle)
+
+
+async def install_async(context):
+    """Serve an async_api context's static assets from the process-wide cache"""
+    if not ENABLED:
+        return
+
+    async def handle(route):
+        if route.request.method != "GET":
+            await route.fallback()
+            return
+        entry = cache.get(route.request.url)
+        if entry is not None:
+            status, headers, body = entry
+            await route.fulfill(status=status, headers=headers, body=body)
+            return
+        response = await route.fetch()
+        body = await response.body()
+        _store(route, response, body)
+        await route.fulfill(response=response, body=body)
+
+    await context.route(ASSET_PATTERN, handle)
@@ -0,0 +1,180 @@
+"""
+Authenticated storage-state reuse
+Logs the QA user in once per run and starts every context from the saved session
+"""
+
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from qa_support import backend
+
+STATE_FILE = os.environ.get("QA_STORAGE_STATE", "/tmp/piterpay-qa-auth.json")
+
+# Re-login when the access token expires within this many seconds
+EXPIRY_MARGIN_S = 120
+
+SUPABASE_URL = os.environ.get("NEXT_PUBLIC_SUPABASE_URL", "")
+SUPABASE_ANON_KEY = os.environ.get("NEXT_PUBLIC_SUPABASE_ANON_KEY", "")
+
+# Set once a login attempt of this process failed
+_login_failed = False
+
+
+def credentials() -> Optional[Tuple[str, str]]:
+    """QA user email and password, or None when not configured"""
+    email = os.environ.get("QA_AUTH_EMAIL") or os.environ.get("PITERPAY_BOT_EMAIL")
+    password = os.environ.get("QA_AUTH_PASSWORD") or os.environ.get("PITERPAY_BOT_PASSWORD")
+    if email and password:
+        return email, password
+    return (backend.QA_EMAIL, backend.QA_PASSWORD) if backend.enabled() else None
+
+
+def supabase_url() -> str:
+    """Base URL of the Supabase project the app signs in against
+
+    With the stand-in: its URL when this process serves it, else the app's
+    NEXT_PUBLIC_SUPABASE_URL, else where `python -m qa_support.backend` serves.
+    """
+    if backend.enabled():
+        return backend.stand_in().url or SUPABASE_URL or f"http://{backend.DEFAULT_HOST}:{backend.DEFAULT_PORT}"
+    return SUPABASE_URL
+
+
+def storage_key() -> str:
+    """localStorage key supabase-js keeps the session under"""
+    return f"sb-{urlparse(supabase_url()).hostname.split('.')[0]}-auth-token"
+
+
+def _session(state: Dict[str, Any], origin: Optional[str]) -> Optional[Dict[str, Any]]:
+    for entry in state.get("origins", []):
+        if origin and entry["origin"] != origin:
+            continue
+        for item in entry.get("localStorage", []):
+            if item["name"].startswith("sb-") and item["name"].endswith("-auth-token"):
+                return json.loads(item["value"])
+    return None
+
+
+SESSION_JS = """
+() => Object.keys(localStorage).some(key => key.startsWith('sb-') && key.endsWith('-auth-token'))
+"""
+
+
+def has_session(page) -> bool:
+    """Whether the page carries a Supabase session"""
+    return page.evaluate(SESSION_JS)
+
+
+def invalidate():
+    """Forget the saved session"""
+    try:
+        os.remove(STATE_FILE)
+    except FileNotFoundError:
+        pass
+
+
+def saved_state(base_url: Optional[str] = None) -> Optional[str]:
+    """Path of the saved storage state while its session is still valid
+
+    An expired (or unreadable) state file is removed.
+    """
+    try:
+        with open(STATE_FILE, encoding="utf-8") as f:
+            session = _session(json.load(f), base_url.rstrip("/") if base_url else None)
+    except FileNotFoundError:
+        return None
+    except (ValueError, KeyError):
+        session = None
+
+    if not session or session.get("expires_at", 0) < time.time() + EXPIRY_MARGIN_S:
+        invalidate()
+        return None
+    return STATE_FILE
+
+
+def _password_grant(email: str, password: str) -> Optional[Dict[str, Any]]:
+    if backend.enabled():
+        session = backend.stand_in().sign_in(email, password)
+        if session is None:
+            print(f"⚠️  QA login failed: the stand-in has no user {email} with that password")
+        return session
+
+    request = urllib.request.Request(
+        f"{SUPABASE_URL}/auth/v1/token?grant_type=password",
+        data=json.dumps({"email": email, "password": password}).encode(),
+        headers={"apikey": SUPABASE_ANON_KEY, "Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return json.load(response)
+    except (urllib.error.URLError, ValueError) as e:
+        print(f"⚠️  QA login failed: {e}")
+        return None
+
+
+def session_state(base_url: str) -> Optional[Dict[str, Any]]:
+    """Sign the QA user in and return the session as a storage state, without saving it
+
+    None without credentials, or when this process already failed to log in.
+    """
+    global _login_failed
+    creds = credentials()
+    if _login_failed or not creds:
+        return None
+    if not backend.enabled() and not (SUPABASE_URL and SUPABASE_ANON_KEY):
+        return None
+
+    session = _password_grant(*creds)
+    if session is None:
+        _login_failed = True
+        return None
+
+    session.setdefault("expires_at", int(time.time()) + session.get("expires_in", 3600))
+    return {
+        "cookies": [],
+        "origins": [{
+            "origin": base_url.rstrip("/"),
+            "localStorage": [{"name": storage_key(), "value": json.dumps(session)}],
+        }],
+    }
+
+
+def login(base_url: str) -> Optional[str]:
+    """Sign the QA user in and save the session as a storage state file
+
+    None without credentials, or when this process already failed to log in.
+    """
+    state = session_state(base_url)
+    if state is None:
+        return None
+
+    # Write then rename, so workers never read a half-written file
+    tmp = f"{STATE_FILE}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, STATE_FILE)
+    return STATE_FILE
+
+
+def current_state(base_url: str) -> Optional[str]:
+    """Storage state for a new context, logging in again if the session expired"""
+    state = saved_state(base_url)
+    if state is None and credentials():
+        state = login(base_url)
+    return state
+
+
+def ensure_storage_state(base_url: str) -> Optional[str]:
+    """Reuse the saved session or log in once; None means run unauthenticated"""
+    state = saved_state(base_url) or login(base_url)
+    if state:
+        print(f"🔐 Authenticated session: {state}")
+    else:
+        print("🔓 No QA credentials (QA_AUTH_EMAIL/QA_AUTH_PASSWORD) or login failed - running unauthenticated")
+    return state
@@ -0,0 +1,569 @@
+"""
+Local Supabase stand-in
+Serves the app's piterpay_* tables and password login from in-memory fixtures
+"""
+
+import argparse
+import base64
+import copy
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from datetime import date, datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlparse
+
+# Browser requests to any hosted Supabase project are answered by the stand-in
+ROUTE_PATTERN = re.compile(r"^https?://[^/]+\.supabase\.co/(rest|auth)/v1/")
+
+# Credentials of the QA user in the default fixtures
+QA_EMAIL = "qa@piterpay.test"
+QA_PASSWORD = "qa-password"
+
+# Fixed ids, so a session issued by one process is valid in every worker's stand-in
+QA_AUTH_USER_ID = "00000000-0000-4000-8000-000000000001"
+QA_USER_ID = "00000000-0000-4000-8000-000000000002"
+QA_ACCOUNT_ID = "00000000-0000-4000-8000-000000000003"
+
+TOKEN_TTL_S = 3600
+
+# Where `python -m qa_support.backend` serves the stand-in by default
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 54321
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, POST, PATCH, PUT, DELETE, HEAD, OPTIONS",
+    "Access-Control-Allow-Headers": "*",
+    "Access-Control-Expose-Headers": "Content-Range",
+}
+
+Response = Tuple[int, Dict[str, str], bytes]
+
+
+def enabled() -> bool:
+    """Whether the suites should talk to the stand-in instead of Supabase"""
+    return os.environ.get("QA_BACKEND", "") == "stand-in"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def default_fixtures() -> Dict[str, List[Dict[str, Any]]]:
+    """The QA user with one account, two budgets and this month's transactions
+
+    Dashboard totals: income 12,345, expenses 3,000, net 9,345, budget
+    remaining 1,600 (food 75% used, transport 50% used).
+    """
+    month = date.today().replace(day=2).isoformat()
+    created = _now()
+    owned = {"user_id": QA_USER_ID, "project_id": "piterpay", "created_at": created}
+    return {
+        "piterpay_users": [{
+            "id": QA_USER_ID, "auth_user_id": QA_AUTH_USER_ID, "email": QA_EMAIL,
+            "display_name": "QA User", "household_id": None, "role": "owner",
+            "project_id": "piterpay", "created_at": created, "updated_at": created,
+        }],
+        "piterpay_accounts": [
+            {"id": QA_ACCOUNT_ID, "name": "עו״ש", "type": "checking", "balance": 9345,
+             "currency": "ILS", **owned},
+        ],
+        "piterpay_budgets": [
+            {"id": str(uuid.uuid4()), "category": "מזון", "amount": 2800, "period": "monthly", **owned},
+            {"id": str(uuid.uuid4()), "category": "תחבורה", "amount": 1800, "period": "monthly", **owned},
+        ],
+        "piterpay_transactions": [
+            {"id": str(uuid.uuid4()), "account_id": QA_ACCOUNT_ID, "amount": 12345, "type": "income",
+             "category": "משכורת", "description": "QA salary", "date": month, **owned},
+            {"id": str(uuid.uuid4()), "account_id": QA_ACCOUNT_ID, "amount": 2100, "type": "expense",
+             "category": "מזון", "description": "QA groceries", "date": month, **owned},
+            {"id": str(uuid.uuid4()), "account_id": QA_ACCOUNT_ID, "amount": 900, "type": "expense",
+             "category": "תחבורה", "description": "QA fuel", "date": month, **owned},
+        ],
+    }
+
+
+# ============================================================
+# PostgREST query parsing
+# ============================================================
+class PostgrestError(Exception):
+    """A request PostgREST would reject, rendered as its JSON error body"""
+
+    def __init__(self, status: int, code: str, message: str, details: Optional[str] = None):
+        super().__init__(message)
+        self.status = status
+        self.body = {"code": code, "message": message, "details": details, "hint": None}
+
+
+def _split_top_level(text: str) -> List[str]:
+    """Split on commas that are not inside parentheses"""
+    parts, depth, current = [], 0, ""
+    for ch in text:
+        if ch == "," and depth == 0:
+            parts.append(current)
+            current = ""
+            continue
+        depth += {"(": 1, ")": -1}.get(ch, 0)
+        current += ch
+    parts.append(current)
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _parse_select(text: str) -> List[Tuple[str, str, Optional[List]]]:
+    """select=... as (output name, column or table, nested select for embeds)"""
+    fields = []
+    for item in _split_top_level(text or "*"):
+        name = None
+        if ":" in item.split("(", 1)[0]:
+            name, item = item.split(":", 1)
+        if "(" in item:
+            target, inner = item.split("(", 1)
+            target = target.split("!", 1)[0]
+            fields.append((name or target, target, _parse_select(inner[:-1])))
+        else:
+            column = item.split("::", 1)[0]
+            fields.append((name or column, column, None))
+    return fields
+
+
+def _coerce(value: str, like: Any) -> Any:
+    """A filter value typed like the column value it is compared with"""
+    if isinstance(like, bool):
+        return value.lower() == "true"
+    if isinstance(like, (int, float)):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _like(pattern: str, case_insensitive: bool) -> re.Pattern:
+    regex = "".join(".*" if c in "*%" else "." if c == "_" else re.escape(c) for c in pattern)
+    return re.compile(f"^{regex}$", re.IGNORECASE | re.DOTALL if case_insensitive else re.DOTALL)
+
+
+def _matches(row_value: Any, op: str, value: str) -> bool:
+    if op == "is":
+        return {"null": row_value is None, "true": row_value is True,
+                "false": row_value is False}.get(value.lower(), False)
+    if op == "in":
+        options = [v.strip().strip('"') for v in value.strip("()").split(",")]
+        return row_value is not None and str(row_value) in options
+    if row_value is None:
+        return False
+    if op in ("like", "ilike"):
+        return bool(_like(value, op == "ilike").match(str(row_value)))
+    target = _coerce(value, row_value)
+    if isinstance(target, str):
+        row_value = str(row_value)
+    try:
+        return {
+            "eq": row_value == target, "neq": row_value != target,
+            "gt": row_value > target, "gte": row_value >= target,
+            "lt": row_value < target, "lte": row_value <= target,
+        }[op]
+    except KeyError:
+        raise PostgrestError(400, "PGRST100", f'"{op}" is not a supported operator')
+    except TypeError:
+        return False
+
+
+def _filter_fn(column: str, expression: str):
+    negate = expression.startswith("not.")
+    if negate:
+        expression = expression[4:]
+    op, _, value = expression.partition(".")
+    return lambda row: _matches(row.get(column), op, value) != negate
+
+
+def _order_key(value: Any):
+    # None sorts last ascending, as in PostgreSQL
+    return (value is None, value if value is not None else 0)
+
+
+# ============================================================
+# The stand-in
+# ============================================================
+class SupabaseStandIn:
+    """In-memory tables and auth users behind a PostgREST/GoTrue-shaped dispatch()"""
+
+    def __init__(self, fixtures: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                 users: Optional[Iterable[Dict[str, str]]] = None):
+        self.lock = threading.RLock()
+        self.tables: Dict[str, List[Dict[str, Any]]] = {}
+        self.users: Dict[str, Dict[str, str]] = {}
+        self.refresh_tokens: Dict[str, str] = {}
+        self.requests = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+        self.reset(fixtures, users)
+
+    # ------------------------------------------------------------------
+    # Fixtures
+    # ------------------------------------------------------------------
+    def reset(self, fixtures: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+              users: Optional[Iterable[Dict[str, str]]] = None):
+        """Drop all data and load fixtures (the default QA data when None)"""
+        with self.lock:
+            self.tables.clear()
+            self.users.clear()
+            self.refresh_tokens.clear()
+            self.seed_all(default_fixtures() if fixtures is None else fixtures)
+            for user in users if users is not None else [
+                {"id": QA_AUTH_USER_ID, "email": QA_EMAIL, "password": QA_PASSWORD},
+            ]:
+                self.add_user(**user)
+
+    def add_user(self, email: str, password: str, id: Optional[str] = None) -> str:
+        """Register an auth user that can sign in with the password grant"""
+        user_id = id or str(uuid.uuid4())
+        with self.lock:
+            self.users[email.lower()] = {"id": user_id, "email": email, "password": password}
+        return user_id
+
+    def seed(self, table: str, rows: Iterable[Dict[str, Any]], replace: bool = True) -> int:
+        """Bulk-load rows into a table (replacing its contents by default)"""
+        with self.lock:
+            target = self.tables.setdefault(table, [])
+            if replace:
+                target.clear()
+            for row in rows:
+                target.append(self._with_defaults(dict(row)))
+            return len(target)
+
+    def seed_all(self, fixtures: Dict[str, List[Dict[str, Any]]], replace: bool = True):
+        """seed() every table of a {table: rows} mapping"""
+        for table, rows in fixtures.items():
+            self.seed(table, rows, replace)
+
+    def rows(self, table: str) -> List[Dict[str, Any]]:
+        """A copy of a table's current rows"""
+        with self.lock:
+            return copy.deepcopy(self.tables.get(table, []))
+
+    @staticmethod
+    def _with_defaults(row: Dict[str, Any]) -> Dict[str, Any]:
+        row.setdefault("id", str(uuid.uuid4()))
+        row.setdefault("created_at", _now())
+        return row
+
+    # ------------------------------------------------------------------
+    # Auth
+    # ------------------------------------------------------------------
+    def _session(self, user: Dict[str, str]) -> Dict[str, Any]:
+        expires_at = int(time.time()) + TOKEN_TTL_S
+        claims = {"sub": user["id"], "email": user["email"], "role": "authenticated",
+                  "aud": "authenticated", "exp": expires_at, "iat": int(time.time())}
+        encode = lambda part: base64.urlsafe_b64encode(json.dumps(part).encode()).rstrip(b"=").decode()
+        refresh_token = uuid.uuid4().hex
+        self.refresh_tokens[refresh_token] = user["email"].lower()
+        return {
+            "access_token": f"{encode({'alg': 'none', 'typ': 'JWT'})}.{encode(claims)}.stand-in",
+            "token_type": "bearer",
+            "expires_in": TOKEN_TTL_S,
+            "expires_at": expires_at,
+            "refresh_token": refresh_token,
+            "user": {
+                "id": user["id"], "aud": "authenticated", "role": "authenticated", "email": user["email"],
+                "app_metadata": {"provider": "email", "providers": ["email"]}, "user_metadata": {},
+                "created_at": _now(),
+            },
+        }
+
+    def sign_in(self, email: str, password: str) -> Optional[Dict[str, Any]]:
+        """Session for a password login, or None for bad credentials"""
+        with self.lock:
+            user = self.users.get(email.lower())
+            if not user or user["password"] != password:
+                return None
+            return self._session(user)
+
+    @staticmethod
+    def _claims(headers: Dict[str, str]) -> Dict[str, Any]:
+        token = headers.get("authorization", "").removeprefix("Bearer ").strip()
+        try:
+            payload = token.split(".")[1]
+            return json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        except (IndexError, ValueError):
+            return {}
+
+    def _auth(self, method: str, path: str, query: Dict[str, str], headers: Dict[str, str],
+              body: Dict[str, Any]) -> Response:
+        endpoint = path.rsplit("/auth/v1/", 1)[-1].strip("/")
+        if endpoint == "token" and method == "POST":
+            if query.get("grant_type") == "refresh_token":
+                with self.lock:
+                    email = self.refresh_tokens.pop(body.get("refresh_token", ""), None)
+                    session = self._session(self.users[email]) if email in self.users else None
+            else:
+                session = self.sign_in(body.get("email", ""), body.get("password", ""))
+            if session is None:
+                return self._json(400, {"error": "invalid_grant", "error_description": "Invalid login credentials"})
+            return self._json(200, session)
+        if endpoint == "user" and method == "GET":
+            claims = self._claims(headers)
+            user = next((u for u in self.users.values() if u["id"] == claims.get("sub")), None)
+            if user is None:
+                return self._json(401, {"code": 401, "msg": "Invalid JWT"})
+            return self._json(200, self._session(user)["user"])
+        if endpoint == "logout":
+            return 204, dict(CORS_HEADERS), b""
+        return self._json(404, {"code": 404, "msg": f"Unsupported auth endpoint: {endpoint}"})
+
+    # ------------------------------------------------------------------
+    # PostgREST
+    # ------------------------------------------------------------------
+    def _owner_ids(self, claims: Dict[str, Any]) -> Optional[set]:
+        """piterpay_users ids of the signed-in user (None for anon/service requests)"""
+        if claims.get("role") != "authenticated":
+            return None
+        return {u["id"] for u in self.tables.get("piterpay_users", []) if u.get("auth_user_id") == claims.get("sub")}
+
+    def _visible(self, table: str, owners: Optional[set]) -> List[Dict[str, Any]]:
+        rows = self.tables.get(table, [])
+        if owners is None:
+            return rows
+        return [r for r in rows if "user_id" not in r or r["user_id"] in owners]
+
+    @staticmethod
+    def _singular(table: str) -> str:
+        name = table.removeprefix("piterpay_")
+        return name[:-1] if name.endswith("s") else name
+
+    def _embed(self, table: str, row: Dict[str, Any], alias: str, target: str, fields, owners):
+        related = self._visible(target, owners)
+        for key in (f"{alias}_id", f"{self._singular(target)}_id"):
+            if key in row:
+                parent = next((r for r in related if r.get("id") == row[key]), None)
+                return self._project(target, parent, fields, owners) if parent else None
+        key = f"{self._singular(table)}_id"
+        return [self._project(target, r, fields, owners) for r in related if r.get(key) == row.get("id")]
+
+    def _project(self, table: str, row: Dict[str, Any], fields, owners) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for name, column, nested in fields:
+            if nested is not None:
+                out[name] = self._embed(table, row, name, column, nested, owners)
+            elif column == "*":
+                out.update(copy.deepcopy(row))
+            else:
+                out[name] = copy.deepcopy(row.get(column))
+        return out
+
+    def _select_rows(self, table: str, params: List[Tuple[str, str]], owners) -> List[Dict[str, Any]]:
+        rows = self._visible(table, owners)
+        for column, expression in params:
+            if column in ("select", "order", "limit", "offset", "on_conflict", "columns"):
+                continue
+            if column in ("or", "and"):
+                raise PostgrestError(400, "PGRST100", f"'{column}' filters are not supported by the stand-in")
+            keep = _filter_fn(column, expression)
+            rows = [r for r in rows if keep(r)]
+        return rows
+
+    @staticmethod
+    def _ordered(rows: List[Dict[str, Any]], order: Optional[str]) -> List[Dict[str, Any]]:
+        for term in reversed(_split_top_level(order or "")):
+            column, *modifiers = term.split(".")
+            descending = "desc" in modifiers
+            rows = sorted(rows, key=lambda r: _order_key(r.get(column)), reverse=descending)
+        return rows
+
+    @staticmethod
+    def _json(status: int, payload: Any, headers: Optional[Dict[str, str]] = None) -> Response:
+        return status, {**CORS_HEADERS, "Content-Type": "application/json; charset=utf-8", **(headers or {})}, \
+            json.dumps(payload, ensure_ascii=False, default=str).encode()
+
+    def _rest(self, method: str, table: str, params: List[Tuple[str, str]], headers: Dict[str, str],
+              body: Any) -> Response:
+        query = dict(params)
+        prefer = headers.get("prefer", "")
+        owners = self._owner_ids(self._claims(headers))
+        fields = _parse_select(query.get("select", "*"))
+        single = "vnd.pgrst.object" in headers.get("accept", "")
+
+        if method in ("GET", "HEAD"):
+            rows = self._ordered(self._select_rows(table, params, owners), query.get("order"))
+            total = len(rows)
+            offset = int(query.get("offset", 0))
+            rows = rows[offset:offset + int(query["limit"])] if "limit" in query else rows[offset:]
+        elif method == "POST":
+            incoming = body if isinstance(body, list) else [body]
+            upsert = "resolution=merge-duplicates" in prefer or "resolution=ignore-duplicates" in prefer
+            conflict = query.get("on_conflict", "id").split(",")
+            target = self.tables.setdefault(table, [])
+            rows = []
+            for record in incoming:
+                existing = next((r for r in target if upsert and all(
+                    c in record and r.get(c) == record[c] for c in conflict)), None)
+                if existing is None:
+                    existing = self._with_defaults(dict(record))
+                    target.append(existing)
+                elif "resolution=merge-duplicates" in prefer:
+                    existing.update(record)
+                rows.append(existing)
+            total = len(rows)
+        elif method == "PATCH":
+            rows = self._select_rows(table, params, owners)
+            for row in rows:
+                row.update(body or {})
+            total = len(rows)
+        elif method == "DELETE":
+            rows = self._select_rows(table, params, owners)
+            doomed = {id(r) for r in rows}
+            self.tables[table] = [r for r in self.tables.get(table, []) if id(r) not in doomed]
+            total = len(rows)
+        else:
+            raise PostgrestError(405, "PGRST000", f"Method {method} is not supported")
+
+        payload = [self._project(table, r, fields, owners) for r in rows]
+        count = total if "count=" in prefer else "*"
+        start = int(query.get("offset", 0)) if method in ("GET", "HEAD") else 0
+        span = f"{start}-{start + len(payload) - 1}" if payload else "*"
+        extra = {"Content-Range": f"{span}/{count}"}
+
+        if method not in ("GET", "HEAD") and "return=representation" not in prefer:
+            return 201 if method == "POST" else 204, {**CORS_HEADERS, **extra}, b""
+        if single:
+            if len(payload) != 1:
+                raise PostgrestError(406, "PGRST116", "JSON object requested, multiple (or no) rows returned",
+                                     f"The result contains {len(payload)} rows")
+            status, out_headers, out = self._json(200, payload[0], extra)
+        else:
+            status, out_headers, out = self._json(201 if method == "POST" else 200, payload, extra)
+        return status, out_headers, b"" if method == "HEAD" else out
+
+    # ------------------------------------------------------------------
+    # Entry point
+    # ------------------------------------------------------------------
+    def dispatch(self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes]) -> Response:
+        """Answer one Supabase REST/auth request: (status, headers, body)"""
+        method = method.upper()
+        headers = {k.lower(): v for k, v in headers.items()}
+        if method == "OPTIONS":
+            return 204, dict(CORS_HEADERS), b""
+
+        parsed = urlparse(url)
+        params = parse_qsl(parsed.query, keep_blank_values=True)
+        try:
+            payload = json.loads(body) if body else None
+        except ValueError:
+            return self._json(400, {"code": "PGRST102", "message": "Empty or invalid json", "details": None,
+                                    "hint": None})
+
+        with self.lock:
+            self.requests += 1
+            try:
+                if "/auth/v1/" in parsed.path:
+                    return self._auth(method, parsed.path, dict(params), headers, payload or {})
+                if "/rest/v1/" in parsed.path:
+                    table = unquote(parsed.path.rsplit("/rest/v1/", 1)[-1].strip("/"))
+                    return self._rest(method, table, params, headers, payload)
+            except PostgrestError as e:
+                return self._json(e.status, e.body)
+        return self._json(404, {"message": f"No stand-in route for {parsed.path}"})
+
+    # ------------------------------------------------------------------
+    # HTTP server
+    # ------------------------------------------------------------------
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve over HTTP on a background thread; returns the base URL"""
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                status, headers, body = stand_in.dispatch(
+                    self.command, self.path, dict(self.headers), self.rfile.read(length) if length else None
+                )
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_HEAD = do_POST = do_PATCH = do_PUT = do_DELETE = do_OPTIONS = _handle
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self.url
+
+    @property
+    def url(self) -> Optional[str]:
+        if self._server is None:
+            return None
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+_stand_in: Optional[SupabaseStandIn] = None
+
+
+def stand_in() -> SupabaseStandIn:
+    """The process-wide stand-in, loaded with the default fixtures on first use"""
+    global _stand_in
+    if _stand_in is None:
+        _stand_in = SupabaseStandIn()
+    return _stand_in
+
+
+# ============================================================
+# Browser hookup
+# ============================================================
+def _fulfill_args(target: SupabaseStandIn, request) -> Dict[str, Any]:
+    body = request.post_data_buffer
+    status, headers, payload = target.dispatch(request.method, request.url, request.headers, body)
+    return {"status": status, "headers": headers, "body": payload}
+
+
+def route_to_stand_in(context, target: Optional[SupabaseStandIn] = None):
+    """Answer a sync_api context's Supabase REST/auth requests from the stand-in"""
+    target = target or stand_in()
+    context.route(ROUTE_PATTERN, lambda route: route.fulfill(**_fulfill_args(target, route.request)))
+
+
+async def route_to_stand_in_async(context, target: Optional[SupabaseStandIn] = None):
+    """Answer an async_api context's Supabase REST/auth requests from the stand-in"""
+    target = target or stand_in()
+
+    async def handler(route):
+        await route.fulfill(**_fulfill_args(target, route.request))
+
+    await context.route(ROUTE_PATTERN, handler)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the Supabase stand-in over HTTP")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    server = stand_in()
+    print(f"🧪 Supabase stand-in on {server.start(args.host, args.port)} "
+          f"(sign in as {QA_EMAIL} / {QA_PASSWORD})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
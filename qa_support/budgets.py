@@ -0,0 +1,184 @@
+"""
+Performance budgets
+Checks the web vitals of every route against tests/performance-budgets.json and its history baseline
+"""
+
+import json
+import os
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from qa_support import coverage, history
+from qa_support.results import Results
+from qa_support.vitals import VitalsSample, p75
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+BUDGETS_FILE = Path(os.environ.get("QA_BUDGETS_FILE", ROOT_DIR / "tests" / "performance-budgets.json"))
+
+# Budgeted metric: (label, unit)
+METRICS = {
+    "lcp_ms": ("LCP", "ms"),
+    "js_kb": ("JS", "KB"),
+    "requests": ("requests", ""),
+    "hydration_ms": ("hydration", "ms"),
+}
+
+# Runs of history the baselines are taken from
+BASELINE_RUNS = 10
+
+# The only resource profile budgets apply to
+BUDGET_PROFILE = "full"
+
+Key = Tuple[str, str]  # (route, viewport)
+
+
+def load(path: Path = BUDGETS_FILE) -> Dict[str, Dict[str, Dict[str, float]]]:
+    with open(path, encoding="utf-8") as f:
+        budgets = json.load(f)
+    for route, viewports in budgets.items():
+        for viewport, limits in viewports.items():
+            unknown = set(limits) - set(METRICS)
+            if unknown:
+                raise ValueError(f"Unknown budget metric for {route} {viewport}: {', '.join(sorted(unknown))} "
+                                 f"(expected one of {', '.join(METRICS)})")
+    return budgets
+
+
+def budget_for(budgets: Dict[str, Dict[str, Dict[str, float]]], route: str, viewport: str) -> Dict[str, float]:
+    """Limits for a route at a viewport, the most specific entry winning"""
+    limits: Dict[str, float] = {}
+    for r, v in (("*", "*"), ("*", viewport), (route, "*"), (route, viewport)):
+        limits.update(budgets.get(r, {}).get(v, {}))
+    return limits
+
+
+def measure(samples: Iterable[VitalsSample]) -> Dict[Key, Dict[str, float]]:
+    """75th percentile of every budgeted metric per route and viewport
+
+    Only full-profile document loads count; soft navigations have no LCP and
+    load only what the new route adds.
+    """
+    per_key: Dict[Key, Dict[str, List[float]]] = {}
+    for s in samples:
+        if s.profile != BUDGET_PROFILE or s.navigation != "hard":
+            continue
+        values = per_key.setdefault((s.route, s.viewport), {metric: [] for metric in METRICS})
+        if s.lcp_ms is not None:
+            values["lcp_ms"].append(s.lcp_ms)
+        if s.hydration_ms is not None:
+            values["hydration_ms"].append(s.hydration_ms)
+        values["js_kb"].append(s.js_bytes / 1024)
+        values["requests"].append(s.requests)
+    return {key: {metric: p75(v) for metric, v in values.items() if v} for key, values in per_key.items()}
+
+
+def _format(metric: str, value: float) -> str:
+    return f"{value:.0f}{METRICS[metric][1]}"
+
+
+@dataclass
+class Check:
+    route: str
+    viewport: str
+    metric: str
+    value: float
+    budget: float
+    baseline: Optional[float] = None
+
+    @property
+    def passed(self) -> bool:
+        return self.value <= self.budget
+
+    @property
+    def name(self) -> str:
+        return f"Budget {METRICS[self.metric][0]} {self.route} @ {self.viewport}"
+
+    @property
+    def details(self) -> str:
+        over = self.value - self.budget
+        text = (f"{_format(self.metric, self.value)} "
+                + (f"over the {_format(self.metric, self.budget)} budget by {_format(self.metric, over)} "
+                   f"(+{over / self.budget:.0%})" if over > 0 else
+                   f"within the {_format(self.metric, self.budget)} budget"))
+        if self.baseline:
+            change = (self.value - self.baseline) / self.baseline
+            text += f"; baseline {_format(self.metric, self.baseline)} ({change:+.0%})"
+        return text
+
+    def export(self) -> Dict[str, Any]:
+        return {"route": self.route, "viewport": self.viewport, "metric": self.metric, "value": self.value,
+                "budget": self.budget, "baseline": self.baseline, "passed": self.passed, "details": self.details}
+
+
+def _baseline() -> Dict[Tuple[str, str, str], float]:
+    if not history.enabled() or not os.path.exists(history.HISTORY_DB):
+        return {}
+    try:
+        db = history.connect()
+        try:
+            return history.baseline_measurements(db, BASELINE_RUNS)
+        finally:
+            db.close()
+    except sqlite3.Error as e:
+        print(f"⚠️  Could not read budget baselines from {history.HISTORY_DB}: {e}")
+        return {}
+
+
+def _save(measured: Dict[Key, Dict[str, float]]):
+    if not history.enabled() or not measured:
+        return
+    try:
+        db = history.connect()
+        try:
+            history.store_measurements(db, measured)
+        finally:
+            db.close()
+    except sqlite3.Error as e:
+        print(f"⚠️  Could not store budget measurements in {history.HISTORY_DB}: {e}")
+
+
+def evaluate(samples: Iterable[VitalsSample], budgets: Optional[Dict] = None,
+             baseline: Optional[Dict[Tuple[str, str, str], float]] = None) -> List[Check]:
+    """Every budget that applies to the measured routes and viewports"""
+    budgets = load() if budgets is None else budgets
+    measured = measure(samples)
+    baseline = _baseline() if baseline is None else baseline
+    checks = []
+    for (route, viewport), values in sorted(measured.items()):
+        for metric, limit in budget_for(budgets, route, viewport).items():
+            if metric in values:
+                checks.append(Check(route, viewport, metric, values[metric], limit,
+                                    baseline.get((route, viewport, metric))))
+    return checks
+
+
+def enforce(results: Results, samples: Iterable[VitalsSample], budgets: Optional[Dict] = None) -> List[Check]:
+    """Report every budget check to results and return the checks
+
+    The measurements are stored in the history as the next runs' baseline.
+    Nothing is checked or stored when coverage is being measured.
+    """
+    if coverage.enabled():
+        print("⚠️  Budgets skipped: QA_COVERAGE=1 slows the JS they measure")
+        return []
+    samples = list(samples)
+    checks = evaluate(samples, budgets)
+    for check in checks:
+        if check.passed:
+            results.add_pass(check.name, check.details, route=check.route)
+        else:
+            results.add_fail(check.name, check.details, route=check.route)
+    _save(measure(samples))
+    return checks
+
+
+def print_summary(checks: List[Dict[str, Any]]):
+    """Print exported checks"""
+    if not checks:
+        return
+    exceeded = [c for c in checks if not c["passed"]]
+    print(f"\nBUDGETS: {len(checks) - len(exceeded)}/{len(checks)} kept")
+    for c in exceeded:
+        print(f"  ❌ {c['route']} @ {c['viewport']} {METRICS[c['metric']][0]}: {c['details']}")
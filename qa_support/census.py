@@ -0,0 +1,111 @@
+"""
+Single-roundtrip DOM census
+Element counts, state flags and attributes collected in one in-page evaluation
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Counted selectors, in the order they are reported in elements_found
+COUNT_SELECTORS = {
+    "buttons": "button",
+    "links": "a",
+    "inputs": "input",
+    "textareas": "textarea",
+    "selects": "select",
+    "checkboxes": "input[type='checkbox']",
+    "radio_buttons": "input[type='radio']",
+    "forms": "form",
+    "images": "img",
+    "headings": "h1, h2, h3, h4, h5, h6",
+    "modals_dialogs": "[role='dialog'], [role='alertdialog'], .modal",
+    "dropdown_menus": "[role='menu'], [role='listbox']",
+    "tabs": "[role='tab']",
+    "icons": "svg, [class*='icon']",
+}
+
+HAMBURGER_SELECTOR = "[class*='hamburger'], [class*='menu-toggle'], button[aria-label*='menu']"
+
+# Visibility and disabled state follow Playwright's is_visible()/is_disabled()
+CENSUS_JS = """
+({countSelectors, hamburgerSelector}) => {
+    const all = sel => Array.from(document.querySelectorAll(sel));
+    const isVisible = el => {
+        if (getComputedStyle(el).visibility !== 'visible') return false;
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    };
+    const isDisabled = el => el.matches(':disabled') || !!el.closest('[aria-disabled="true"]');
+
+    const counts = {};
+    for (const [key, sel] of Object.entries(countSelectors)) counts[key] = all(sel).length;
+
+    const h1 = document.querySelector('h1');
+    const nav = document.querySelector("nav, [role='navigation']");
+    const html = document.documentElement;
+
+    return {
+        counts,
+        title: document.title,
+        has_main: !!document.querySelector("main, [role='main'], #main, .main"),
+        h1_text: h1 ? h1.innerText : null,
+        html_dir: html.getAttribute('dir'),
+        html_lang: html.getAttribute('lang'),
+        nav_links: nav ? nav.querySelectorAll('a').length : null,
+        has_hamburger: !!document.querySelector(hamburgerSelector),
+        buttons: all('button').map(el => ({
+            text: el.innerText,
+            visible: isVisible(el),
+            disabled: isDisabled(el),
+        })),
+        links: all('a').map(el => ({
+            href: el.getAttribute('href'),
+            text: el.innerText,
+        })),
+        inputs: all('input, textarea, select').map(el => ({
+            type: el.getAttribute('type'),
+            name: el.getAttribute('name'),
+            placeholder: el.getAttribute('placeholder'),
+            readonly: el.hasAttribute('readonly'),
+            visible: isVisible(el),
+            disabled: isDisabled(el),
+        })),
+        forms: all('form').map(el => ({
+            method: el.getAttribute('method'),
+            inputs: el.querySelectorAll('input, textarea, select').length,
+            submits: el.querySelectorAll("button[type='submit'], input[type='submit']").length,
+        })),
+    };
+}
+"""
+
+
+@dataclass
+class DomCensus:
+    """Snapshot of the page's interactive elements at one point in time"""
+    counts: Dict[str, int] = field(default_factory=dict)
+    title: str = ""
+    has_main: bool = False
+    h1_text: Optional[str] = None
+    html_dir: Optional[str] = None
+    html_lang: Optional[str] = None
+    nav_links: Optional[int] = None
+    has_hamburger: bool = False
+    buttons: List[Dict[str, Any]] = field(default_factory=list)
+    links: List[Dict[str, Any]] = field(default_factory=list)
+    inputs: List[Dict[str, Any]] = field(default_factory=list)
+    forms: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def _census_args() -> Dict[str, Any]:
+    return {"countSelectors": COUNT_SELECTORS, "hamburgerSelector": HAMBURGER_SELECTOR}
+
+
+def take_census(page) -> DomCensus:
+    """Take a census of a sync_api page"""
+    return DomCensus(**page.evaluate(CENSUS_JS, _census_args()))
+
+
+async def take_census_async(page) -> DomCensus:
+    """Take a census of an async_api page"""
+    return DomCensus(**await page.evaluate(CENSUS_JS, _census_args()))
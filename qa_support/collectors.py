@@ -0,0 +1,82 @@
+"""
+Process-wide collectors
+Stats recorded in pool workers and merged back in the parent process.
+"""
+
+import threading
+from dataclasses import asdict
+from multiprocessing import util
+from typing import Any, Callable, Dict, Generic, List, Optional, Type, TypeVar
+
+T = TypeVar("T")
+
+
+def on_exit(callback: Callable[[], Any], priority: int):
+    """Run callback when this process exits, pool workers included (higher priority runs first)"""
+    # atexit does not fire in pool workers, multiprocessing finalizers do
+    util.Finalize(None, callback, exitpriority=priority)
+
+
+class SampleCollector(Generic[T]):
+    """Samples (dataclasses of sample_type) recorded in this process
+
+    Subclasses add summary() and print_summary().
+    """
+    sample_type: Type[T]
+
+    def __init__(self):
+        self.samples: List[T] = []
+        self.lock = threading.Lock()
+
+    def record(self, sample: T) -> T:
+        with self.lock:
+            self.samples.append(sample)
+        return sample
+
+    def export(self, start: int = 0) -> List[Dict[str, Any]]:
+        """Samples from index start on, as plain dicts that can cross process boundaries"""
+        return [asdict(s) for s in self.samples[start:]]
+
+    def load(self, exported: Dict[str, Any]) -> T:
+        return self.sample_type(**exported)
+
+    def extend(self, exported: List[Dict[str, Any]]):
+        """Merge samples exported by another process"""
+        self.samples.extend(self.load(s) for s in exported)
+
+    def snapshot(self) -> int:
+        return len(self.samples)
+
+    def since(self, snapshot: Optional[int]) -> List[Dict[str, Any]]:
+        """Samples recorded after snapshot (an earlier snapshot()), to send back from a worker"""
+        return self.export(snapshot or 0)
+
+    def reset(self):
+        self.samples.clear()
+
+
+# Collectors handed back from pool workers, by the outcome key they go under
+_registry: Dict[str, Any] = {}
+
+
+def register(name: str, collector):
+    """Hand a collector (snapshot/since/extend) back from workers under name; returns it"""
+    _registry[name] = collector
+    return collector
+
+
+def snapshot() -> Dict[str, Any]:
+    """Where every registered collector stands"""
+    return {name: c.snapshot() for name, c in _registry.items()}
+
+
+def since(snapshots: Dict[str, Any]) -> Dict[str, Any]:
+    """What every registered collector recorded after snapshots (an earlier snapshot())"""
+    return {name: c.since(snapshots.get(name)) for name, c in _registry.items()}
+
+
+def extend(outcome: Dict[str, Any]):
+    """Merge what a worker handed back into this process's collectors"""
+    for name, c in _registry.items():
+        if name in outcome:
+            c.extend(outcome[name])
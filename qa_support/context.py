@@ -0,0 +1,70 @@
+"""
+Browser context factory shared by every suite
+One viewport and locale, plus the page instrumentation the shared helpers rely on
+"""
+
+import os
+from typing import Optional
+
+from qa_support import assets, auth, backend, profiles, replay, vitals
+from qa_support.hydration import install_probe, install_probe_async
+from qa_support.network import install_tracker
+
+# The app under test: the dev server, or the production server started by
+# qa_support.server
+BASE_URL = os.environ.get("QA_BASE_URL", "http://localhost:5178").rstrip("/")
+
+CONTEXT_OPTIONS = {
+    "viewport": {"width": 1280, "height": 720},
+    "locale": "he-IL",
+}
+
+
+def backend_mode() -> str:
+    """Where the contexts' Supabase calls are answered, for reports"""
+    if backend.enabled():
+        return "stand-in"
+    return replay.mode() or "live"
+
+
+def _options(authenticated: bool, overrides):
+    options = {**CONTEXT_OPTIONS, **overrides}
+    if authenticated and "storage_state" not in options:
+        state = auth.current_state(BASE_URL)
+        if state:
+            options["storage_state"] = state
+    return options
+
+
+def new_qa_context(browser, authenticated: bool = True, profile: Optional[str] = None, **overrides):
+    """Open an instrumented context on a sync_api browser
+
+    profile names the resource profile (qa_support.profiles) to load pages with.
+    """
+    context = browser.new_context(**_options(authenticated, overrides))
+    install_probe(context)
+    vitals.install(context, profiles.resolve(profile).name)
+    install_tracker(context)
+    assets.install(context)
+    if backend.enabled():
+        backend.route_to_stand_in(context)
+    elif replay.mode():
+        replay.install(context)
+    # Routed last so it sees requests before the asset cache does
+    profiles.install(context, BASE_URL, profile)
+    return context
+
+
+async def new_qa_context_async(browser, authenticated: bool = True, profile: Optional[str] = None, **overrides):
+    """Open an instrumented context on an async_api browser"""
+    context = await browser.new_context(**_options(authenticated, overrides))
+    await install_probe_async(context)
+    await vitals.install_async(context, profiles.resolve(profile).name)
+    install_tracker(context)
+    await assets.install_async(context)
+    if backend.enabled():
+        await backend.route_to_stand_in_async(context)
+    elif replay.mode():
+        await replay.install_async(context)
+    await profiles.install_async(context, BASE_URL, profile)
+    return context
@@ -0,0 +1,454 @@
+"""
+JS and CSS coverage per route (Chromium only)
+How much of what a route downloads it uses, per chunk and per source directory
+"""
+
+import base64
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import unquote, urljoin, urlparse
+
+from qa_support.collectors import SampleCollector, register
+
+REPORT_FILE = os.environ.get("QA_COVERAGE_FILE", "/tmp/piterpay-coverage.json")
+
+UNMAPPED = "(unmapped)"
+
+Range = Tuple[int, int]
+
+
+def enabled() -> bool:
+    return os.environ.get("QA_COVERAGE", "") == "1"
+
+
+# ============================================================
+# Ranges
+# ============================================================
+def used_js_ranges(functions: Sequence[Dict[str, Any]]) -> List[Range]:
+    """Disjoint [start, end) ranges that ran, from V8 block coverage
+
+    V8 reports nested ranges (a function, its blocks, their blocks) each with
+    its own count; a byte ran when the innermost range containing it has a
+    count above zero.
+    """
+    points = []
+    for function in functions:
+        for r in function["ranges"]:
+            length = r["endOffset"] - r["startOffset"]
+            # At one offset: ends before starts, outer starts before inner ones, inner ends before outer ones
+            points.append((r["startOffset"], 1, -length, r["count"]))
+            points.append((r["endOffset"], 0, length, None))
+    points.sort(key=lambda p: (p[0], p[1], p[2]))
+
+    used: List[Range] = []
+    counts: List[int] = []
+    last = 0
+    for offset, is_start, _, count in points:
+        if counts and counts[-1] > 0 and last < offset:
+            if used and used[-1][1] == last:
+                used[-1] = (used[-1][0], offset)
+            else:
+                used.append((last, offset))
+        last = offset
+        if is_start:
+            counts.append(count)
+        elif counts:
+            counts.pop()
+    return used
+
+
+def merge_ranges(ranges: Sequence[Range]) -> List[Range]:
+    merged: List[Range] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _length(ranges: Sequence[Range]) -> int:
+    return sum(end - start for start, end in ranges)
+
+
+# ============================================================
+# Source maps
+# ============================================================
+_BASE64 = {c: i for i, c in enumerate("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/")}
+
+# Per generated line: (column, source index or None), by column
+Lines = List[List[Tuple[int, Optional[int]]]]
+
+
+def _vlq(segment: str) -> List[int]:
+    values, value, shift = [], 0, 0
+    for char in segment:
+        digit = _BASE64[char]
+        value += (digit & 31) << shift
+        if digit & 32:
+            shift += 5
+        else:
+            values.append(-(value >> 1) if value & 1 else value >> 1)
+            value = shift = 0
+    return values
+
+
+def decode_mappings(mappings: str) -> Lines:
+    """Generated columns and the source they map to, per generated line"""
+    lines: Lines = []
+    source = 0
+    for line in mappings.split(";"):
+        column = 0
+        segments = []
+        for segment in line.split(","):
+            if not segment:
+                continue
+            values = _vlq(segment)
+            column += values[0]
+            if len(values) >= 4:
+                source += values[1]
+                segments.append((column, source))
+            else:
+                segments.append((column, None))
+        lines.append(segments)
+    return lines
+
+
+def load_map(data: Dict[str, Any]) -> Tuple[List[str], Lines]:
+    """Sources and decoded lines of a source map, index maps (sections) included"""
+    if "sections" not in data:
+        root = data.get("sourceRoot") or ""
+        return [root + s for s in data.get("sources", [])], decode_mappings(data.get("mappings", ""))
+
+    sources: List[str] = []
+    lines: Lines = []
+    for section in data["sections"]:
+        section_sources, section_lines = load_map(section["map"])
+        first = len(sources)
+        sources += section_sources
+        line_offset, column_offset = section["offset"]["line"], section["offset"]["column"]
+        while len(lines) < line_offset:
+            lines.append([])
+        for i, segments in enumerate(section_lines):
+            shifted = [(column + (column_offset if i == 0 else 0), None if s is None else s + first)
+                       for column, s in segments]
+            if line_offset + i < len(lines):
+                lines[line_offset + i] = sorted(lines[line_offset + i] + shifted)
+            else:
+                lines.append(shifted)
+    return sources, lines
+
+
+def source_group(source: str) -> str:
+    """src/<directory>, node_modules/<package>, or the source itself"""
+    path = unquote(source).split("[project]/")[-1]
+    path = re.sub(r"^[a-z]+://+(_N_E/)?", "", path)
+    if "node_modules/" in path:
+        parts = path.rsplit("node_modules/", 1)[1].split("/")
+        return "node_modules/" + "/".join(parts[:2] if parts[0].startswith("@") else parts[:1])
+    match = re.search(r"(?:^|/)src/([^/]+)", path)
+    if match:
+        return f"src/{match.group(1)}" if "." not in match.group(1) else "src"
+    return path.lstrip("./") or UNMAPPED
+
+
+def map_segments(text: str, sources: List[str], lines: Lines) -> List[Tuple[int, int, str]]:
+    """Offset ranges of the generated text with the source group they came from"""
+    starts = [0] + [m.end() for m in re.finditer("\n", text)]
+    segments: List[Tuple[int, int, str]] = []
+    for number, line in enumerate(lines[:len(starts)]):
+        base = starts[number]
+        line_end = starts[number + 1] - 1 if number + 1 < len(starts) else len(text)
+        for i, (column, source) in enumerate(line):
+            start = base + column
+            end = base + line[i + 1][0] if i + 1 < len(line) else line_end
+            if end <= start:
+                continue
+            group = source_group(sources[source]) if source is not None and source < len(sources) else UNMAPPED
+            if segments and segments[-1][2] == group and segments[-1][1] == start:
+                segments[-1] = (segments[-1][0], end, group)
+            else:
+                segments.append((start, end, group))
+    return segments
+
+
+def attribute(segments: Sequence[Tuple[int, int, str]], used: Sequence[Range], total: int) -> Dict[str, List[int]]:
+    """[total, used] bytes per source group; bytes outside the mapped segments are unmapped"""
+    groups: Dict[str, List[int]] = {}
+    i = 0
+    for start, end, group in segments:
+        covered = 0
+        while i < len(used) and used[i][1] <= start:
+            i += 1
+        j = i
+        while j < len(used) and used[j][0] < end:
+            covered += min(end, used[j][1]) - max(start, used[j][0])
+            j += 1
+        entry = groups.setdefault(group, [0, 0])
+        entry[0] += end - start
+        entry[1] += covered
+    mapped_total = sum(g[0] for g in groups.values())
+    mapped_used = sum(g[1] for g in groups.values())
+    if total > mapped_total:
+        entry = groups.setdefault(UNMAPPED, [0, 0])
+        entry[0] += total - mapped_total
+        entry[1] += max(0, _length(used) - mapped_used)
+    return groups
+
+
+# Segments per script URL: chunks are shared between routes
+_segments: Dict[str, Optional[List[Tuple[int, int, str]]]] = {}
+
+
+def _fetch_map(page, script_url: str, map_url: str) -> Optional[Dict[str, Any]]:
+    if map_url.startswith("data:"):
+        header, _, payload = map_url.partition(",")
+        raw = base64.b64decode(payload) if header.endswith(";base64") else unquote(payload).encode()
+        return json.loads(raw)
+    response = page.context.request.get(urljoin(script_url, map_url))
+    return response.json() if response.ok else None
+
+
+async def _fetch_map_async(page, script_url: str, map_url: str) -> Optional[Dict[str, Any]]:
+    if map_url.startswith("data:"):
+        return _fetch_map(page, script_url, map_url)
+    response = await page.context.request.get(urljoin(script_url, map_url))
+    return await response.json() if response.ok else None
+
+
+# ============================================================
+# Results
+# ============================================================
+@dataclass
+class ChunkCoverage:
+    url: str
+    kind: str  # js or css
+    total: int
+    used: int
+
+    @property
+    def unused(self) -> int:
+        return self.total - self.used
+
+
+@dataclass
+class RouteCoverage:
+    route: str
+    chunks: List[ChunkCoverage] = field(default_factory=list)
+    # source group -> [total, used] bytes, for chunks with a source map
+    sources: Dict[str, List[int]] = field(default_factory=dict)
+
+    def totals(self, kind: str) -> Tuple[int, int]:
+        chunks = [c for c in self.chunks if c.kind == kind]
+        return sum(c.total for c in chunks), sum(c.used for c in chunks)
+
+    def add_sources(self, groups: Dict[str, List[int]]):
+        for group, (total, used) in groups.items():
+            entry = self.sources.setdefault(group, [0, 0])
+            entry[0] += total
+            entry[1] += used
+
+    def line(self) -> str:
+        js_total, js_used = self.totals("js")
+        css_total, css_used = self.totals("css")
+        return (f"JS {_kb(js_used)}/{_kb(js_total)} used ({_share(js_used, js_total)}), "
+                f"CSS {_kb(css_used)}/{_kb(css_total)} used ({_share(css_used, css_total)})")
+
+
+def _kb(size: int) -> str:
+    return f"{size / 1024:.0f}KB"
+
+
+def _share(part: int, whole: int) -> str:
+    return f"{part / whole:.0%}" if whole else "-"
+
+
+class CoverageReport(SampleCollector[RouteCoverage]):
+    """Coverage of every route measured in this process"""
+    sample_type = RouteCoverage
+
+    def load(self, exported: Dict[str, Any]) -> RouteCoverage:
+        return RouteCoverage(exported["route"], [ChunkCoverage(**c) for c in exported["chunks"]], exported["sources"])
+
+    def print_summary(self, top: int = 3):
+        if not self.samples:
+            return
+        print("\nCOVERAGE (used / downloaded):")
+        print(f"  {'route':20} {'JS':>18} {'CSS':>16}   most unused")
+        for r in sorted(self.samples, key=lambda r: r.route):
+            js_total, js_used = r.totals("js")
+            css_total, css_used = r.totals("css")
+            if r.sources:
+                worst = sorted(((t - u, g) for g, (t, u) in r.sources.items() if g != UNMAPPED), reverse=True)
+            else:
+                worst = sorted(((c.unused, urlparse(c.url).path.rsplit("/", 1)[-1]) for c in r.chunks), reverse=True)
+            unused = ", ".join(f"{name} {_kb(size)}" for size, name in worst[:top] if size > 0)
+            print(f"  {r.route:20} {_kb(js_used):>6}/{_kb(js_total):>6} {_share(js_used, js_total):>4} "
+                  f"{_kb(css_used):>5}/{_kb(css_total):>5} {_share(css_used, css_total):>4}   {unused}")
+
+    def save(self, path: str = REPORT_FILE):
+        if not self.samples:
+            return
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.export(), f, ensure_ascii=False, indent=2)
+        print(f"Coverage per route and chunk saved to {path}")
+
+
+report = register("coverage", CoverageReport())
+
+
+# ============================================================
+# CDP sessions
+# ============================================================
+START_COMMANDS = [
+    ("Debugger.enable", None),
+    ("Profiler.enable", None),
+    ("Profiler.startPreciseCoverage", {"callCount": False, "detailed": True}),
+    ("DOM.enable", None),
+    ("CSS.enable", None),
+    ("CSS.startRuleUsageTracking", None),
+]
+
+
+class _Session:
+    def __init__(self, page):
+        self.page = page
+        self.scripts: Dict[str, Dict[str, Any]] = {}
+        self.sheets: Dict[str, Dict[str, Any]] = {}
+
+    def _listen(self, cdp):
+        self.cdp = cdp
+        cdp.on("Debugger.scriptParsed", self._on_script)
+        cdp.on("CSS.styleSheetAdded", self._on_sheet)
+
+    def _on_script(self, event):
+        if event.get("url", "").startswith("http"):
+            self.scripts[event["scriptId"]] = event
+
+    def _on_sheet(self, event):
+        header = event["header"]
+        if header.get("sourceURL", "").startswith("http"):
+            self.sheets[header["styleSheetId"]] = header
+
+    def _unmapped(self, js: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Scripts of js with a source map that has not been read yet (each is read once per process)"""
+        pending = []
+        for entry in js:
+            script = self.scripts.get(entry["scriptId"])
+            if script is not None and script["url"] not in _segments:
+                _segments[script["url"]] = None
+                if script.get("sourceMapURL"):
+                    pending.append(script)
+        return pending
+
+    @staticmethod
+    def _map(script: Dict[str, Any], data: Optional[Dict[str, Any]], source: Optional[str]):
+        if data and source is not None:
+            _segments[script["url"]] = map_segments(source, *load_map(data))
+
+    def _coverage(self, route: str, js: List[Dict[str, Any]], css: List[Dict[str, Any]]) -> RouteCoverage:
+        coverage = RouteCoverage(route)
+        for entry in js:
+            script = self.scripts.get(entry["scriptId"])
+            if script is None:
+                continue
+            used_ranges = used_js_ranges(entry["functions"])
+            used = _length(used_ranges)
+            coverage.chunks.append(ChunkCoverage(script["url"], "js", script.get("length") or used, used))
+            if _segments.get(script["url"]) is not None:
+                coverage.add_sources(attribute(_segments[script["url"]], used_ranges, script.get("length") or 0))
+
+        css_used: Dict[str, List[Range]] = {}
+        for rule in css:
+            if rule["used"] and rule["styleSheetId"] in self.sheets:
+                css_used.setdefault(rule["styleSheetId"], []).append((int(rule["startOffset"]), int(rule["endOffset"])))
+        for sheet_id, header in self.sheets.items():
+            used = _length(merge_ranges(css_used.get(sheet_id, [])))
+            coverage.chunks.append(ChunkCoverage(header["sourceURL"], "css", int(header.get("length", 0)), used))
+        return report.record(coverage)
+
+
+class CoverageSession(_Session):
+    """Coverage of one route on a sync_api page; start() before loading it"""
+
+    def start(self) -> "CoverageSession":
+        self._listen(self.page.context.new_cdp_session(self.page))
+        for method, params in START_COMMANDS:
+            self.cdp.send(method, params)
+        return self
+
+    def take(self, route: str) -> RouteCoverage:
+        """Stop measuring and record the route's coverage"""
+        js = self.cdp.send("Profiler.takePreciseCoverage")["result"]
+        css = self.cdp.send("CSS.stopRuleUsageTracking")["ruleUsage"]
+        self.cdp.send("Profiler.stopPreciseCoverage")
+        for script in self._unmapped(js):
+            try:
+                data = _fetch_map(self.page, script["url"], script["sourceMapURL"])
+                source = self.cdp.send("Debugger.getScriptSource", {"scriptId": script["scriptId"]}) if data else {}
+                self._map(script, data, source.get("scriptSource"))
+            except Exception as e:
+                print(f"⚠️  Could not read the source map of {script['url']}: {e}")
+        self.cdp.detach()
+        return self._coverage(route, js, css)
+
+    def stop(self):
+        """Stop measuring without recording anything (the route did not load)"""
+        try:
+            self.cdp.detach()
+        except Exception:
+            pass  # already detached, or the page is gone
+
+
+class CoverageSessionAsync(_Session):
+    """Coverage of one route on an async_api page"""
+
+    async def start(self) -> "CoverageSessionAsync":
+        self._listen(await self.page.context.new_cdp_session(self.page))
+        for method, params in START_COMMANDS:
+            await self.cdp.send(method, params)
+        return self
+
+    async def take(self, route: str) -> RouteCoverage:
+        js = (await self.cdp.send("Profiler.takePreciseCoverage"))["result"]
+        css = (await self.cdp.send("CSS.stopRuleUsageTracking"))["ruleUsage"]
+        await self.cdp.send("Profiler.stopPreciseCoverage")
+        for script in self._unmapped(js):
+            try:
+                data = await _fetch_map_async(self.page, script["url"], script["sourceMapURL"])
+                source = await self.cdp.send("Debugger.getScriptSource", {"scriptId": script["scriptId"]}) if data else {}
+                self._map(script, data, source.get("scriptSource"))
+            except Exception as e:
+                print(f"⚠️  Could not read the source map of {script['url']}: {e}")
+        await self.cdp.detach()
+        return self._coverage(route, js, css)
+
+    async def stop(self):
+        try:
+            await self.cdp.detach()
+        except Exception:
+            pass
+
+
+def start(page) -> Optional[CoverageSession]:
+    """A started session when QA_COVERAGE=1 and the browser is Chromium, else None"""
+    if not enabled():
+        return None
+    try:
+        return CoverageSession(page).start()
+    except Exception as e:
+        print(f"⚠️  Coverage needs Chromium (CDP): {e}")
+        return None
+
+
+async def start_async(page) -> Optional[CoverageSessionAsync]:
+    if not enabled():
+        return None
+    try:
+        return await CoverageSessionAsync(page).start()
+    except Exception as e:
+        print(f"⚠️  Coverage needs Chromium (CDP): {e}")
+        return None
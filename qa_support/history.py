@@ -0,0 +1,307 @@
+"""
+Results history
+Copies every run into a local SQLite database to compare durations and pass rates across runs
+"""
+
+import argparse
+import os
+import sqlite3
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from qa_support import results
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+HISTORY_DB = os.environ.get("QA_HISTORY_DB", str(Path.home() / ".cache" / "piterpay-qa" / "history.sqlite3"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run TEXT PRIMARY KEY,
+    started TEXT NOT NULL,
+    commit_sha TEXT,
+    branch TEXT,
+    base_url TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run TEXT NOT NULL REFERENCES runs(run),
+    ts TEXT NOT NULL,
+    suite TEXT NOT NULL,
+    test TEXT NOT NULL,
+    route TEXT,
+    status TEXT NOT NULL,
+    details TEXT,
+    duration_ms REAL,
+    attempt INTEGER NOT NULL DEFAULT 0,
+    worker INTEGER
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    run TEXT NOT NULL,
+    suite TEXT NOT NULL,
+    unit TEXT NOT NULL,
+    worker INTEGER,
+    duration_ms REAL NOT NULL,
+    estimated_ms REAL
+);
+CREATE TABLE IF NOT EXISTS measurements (
+    run TEXT NOT NULL,
+    route TEXT NOT NULL,
+    viewport TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_test ON results(test, run);
+CREATE INDEX IF NOT EXISTS results_route ON results(route, run);
+CREATE INDEX IF NOT EXISTS results_run ON results(run, status);
+CREATE INDEX IF NOT EXISTS runs_commit ON runs(commit_sha);
+CREATE INDEX IF NOT EXISTS tasks_unit ON tasks(suite, unit, run);
+CREATE INDEX IF NOT EXISTS measurements_route ON measurements(route, viewport, metric, run);
+"""
+
+
+def enabled() -> bool:
+    return os.environ.get("QA_HISTORY", "1") != "0"
+
+
+def connect(path: str = HISTORY_DB) -> sqlite3.Connection:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(path)
+    db.row_factory = sqlite3.Row
+    db.executescript(SCHEMA)
+    return db
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        out = subprocess.run(["git", *args], cwd=ROOT_DIR, capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if out.returncode != 0:
+        return None
+    return out.stdout.strip() or None
+
+
+def ingest(run: str = results.RUN_ID, path: str = results.RESULTS_FILE, db: Optional[sqlite3.Connection] = None,
+           commit: Optional[str] = None) -> int:
+    """Copy a run's records from the results file into the history; returns the record count
+
+    Ingesting a run again replaces what was stored for it.
+    """
+    own = db is None
+    db = db or connect()
+    try:
+        rows = [
+            (r["run"], r["ts"], r["suite"], r["test"], r.get("route"), r["status"], r.get("details"),
+             r.get("duration_ms"), r.get("attempt", 0), r.get("worker"))
+            for r in results.read(path, run)
+        ]
+        if not rows:
+            return 0
+        with db:
+            db.execute("DELETE FROM results WHERE run = ?", (run,))
+            db.execute(
+                "INSERT OR REPLACE INTO runs (run, started, commit_sha, branch, base_url) VALUES (?, ?, ?, ?, ?)",
+                (run, min(row[1] for row in rows), commit or _git("rev-parse", "HEAD"),
+                 _git("rev-parse", "--abbrev-ref", "HEAD"), os.environ.get("QA_BASE_URL")),
+            )
+            db.executemany("INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+    finally:
+        if own:
+            db.close()
+
+
+def ingest_run():
+    """Store this process's run in the history, unless QA_HISTORY=0"""
+    if not enabled():
+        return
+    try:
+        count = ingest()
+    except sqlite3.Error as e:
+        print(f"⚠️  Could not store the run in {HISTORY_DB}: {e}")
+        return
+    if count:
+        print(f"🗄️  Stored {count} results of run {results.RUN_ID} in {HISTORY_DB}")
+
+
+def store_tasks(db: sqlite3.Connection, timings: List[Dict[str, Any]], run: str = results.RUN_ID):
+    """Store how long the tasks of a scheduled run took (Schedule.export())"""
+    with db:
+        db.executemany(
+            "INSERT INTO tasks (run, suite, unit, worker, duration_ms, estimated_ms) VALUES (?, ?, ?, ?, ?, ?)",
+            [(run, t["suite"], t["unit"], t["worker"], t["duration_ms"], t["estimated_ms"]) for t in timings],
+        )
+
+
+def store_measurements(db: sqlite3.Connection, measured: Dict[tuple, Dict[str, float]], run: str = results.RUN_ID):
+    """Store the budgeted metrics of a run, {(route, viewport): {metric: value}}"""
+    with db:
+        db.execute("DELETE FROM measurements WHERE run = ?", (run,))
+        db.executemany(
+            "INSERT INTO measurements (run, route, viewport, metric, value) VALUES (?, ?, ?, ?, ?)",
+            [(run, route, viewport, metric, value)
+             for (route, viewport), values in measured.items() for metric, value in values.items()],
+        )
+
+
+# ============================================================
+# Queries
+# ============================================================
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0-100) of sorted values"""
+    if not values:
+        return 0.0
+    rank = max(1, -(-len(values) * q // 100))
+    return values[int(rank) - 1]
+
+
+def _recent_runs(db: sqlite3.Connection, runs: int) -> List[str]:
+    return [r["run"] for r in db.execute("SELECT run FROM runs ORDER BY started DESC LIMIT ?", (runs,))]
+
+
+def _placeholders(values: Iterable[Any]) -> str:
+    return ",".join("?" for _ in values)
+
+
+def _durations(db: sqlite3.Connection, recent: List[str], suite: Optional[str] = None, test: Optional[str] = None,
+               route: Optional[str] = None) -> List[sqlite3.Row]:
+    """Durations in the given runs, shortest first: every test (its task) and every check timed on its own
+
+    test matches task units as well as result names. Tasks have no route, so
+    with a route only timed results are left.
+    """
+    def where(conditions) -> Tuple[str, List[Any]]:
+        used = [(column, value) for column, value in conditions if value is not None]
+        return "".join(f" AND {column} = ?" for column, _ in used), [value for _, value in used]
+
+    filters, args = where([("suite", suite), ("test", test), ("route", route)])
+    query = (f"SELECT run, suite, test, route, duration_ms FROM results "
+             f"WHERE run IN ({_placeholders(recent)}) AND duration_ms IS NOT NULL{filters}")
+    query_args: List[Any] = list(recent) + args
+    if route is None:
+        filters, args = where([("suite", suite), ("unit", test)])
+        query += (f" UNION ALL SELECT run, suite, unit AS test, NULL AS route, duration_ms FROM tasks "
+                  f"WHERE run IN ({_placeholders(recent)}){filters}")
+        query_args += list(recent) + args
+    return db.execute(query + " ORDER BY duration_ms", query_args).fetchall()
+
+
+def duration_trend(db: sqlite3.Connection, test: Optional[str] = None, route: Optional[str] = None,
+                   runs: int = 20) -> List[Dict[str, Any]]:
+    """p50/p95 duration per run (oldest first), of one test, one route or everything"""
+    recent = _recent_runs(db, runs)
+    per_run: Dict[str, Dict[str, Any]] = {
+        row["run"]: {"run": row["run"], "started": row["started"], "commit": row["commit_sha"], "durations": []}
+        for row in db.execute(f"SELECT run, started, commit_sha FROM runs WHERE run IN ({_placeholders(recent)})",
+                              recent)
+    }
+    for row in _durations(db, recent, test=test, route=route):
+        per_run[row["run"]]["durations"].append(row["duration_ms"])
+    out = []
+    for entry in sorted(per_run.values(), key=lambda e: e["started"]):
+        durations = entry.pop("durations")
+        if durations:
+            out.append({**entry, "count": len(durations),
+                        "p50_ms": percentile(durations, 50), "p95_ms": percentile(durations, 95)})
+    return out
+
+
+def slowest_tests(db: sqlite3.Connection, limit: int = 10, runs: int = 10,
+                  suite: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Tests with the highest p95 duration over the last runs"""
+    per_test: Dict[tuple, List[float]] = {}
+    for row in _durations(db, _recent_runs(db, runs), suite=suite):
+        per_test.setdefault((row["suite"], row["test"], row["route"]), []).append(row["duration_ms"])
+    out = [
+        {"suite": suite, "test": test, "route": route, "count": len(durations),
+         "p50_ms": percentile(durations, 50), "p95_ms": percentile(durations, 95), "total_ms": sum(durations)}
+        for (suite, test, route), durations in per_test.items()
+    ]
+    return sorted(out, key=lambda t: t["p95_ms"], reverse=True)[:limit]
+
+
+def task_durations(db: sqlite3.Connection, runs: int = 10) -> Dict[tuple, float]:
+    """Median duration of every (suite, unit) task over the last runs that scheduled it"""
+    recent = [r["run"] for r in db.execute(
+        "SELECT run FROM tasks GROUP BY run ORDER BY MIN(rowid) DESC LIMIT ?", (runs,))]
+    per_task: Dict[tuple, List[float]] = {}
+    query = f"SELECT suite, unit, duration_ms FROM tasks WHERE run IN ({_placeholders(recent)}) ORDER BY duration_ms"
+    for row in db.execute(query, recent):
+        per_task.setdefault((row["suite"], row["unit"]), []).append(row["duration_ms"])
+    return {key: percentile(durations, 50) for key, durations in per_task.items()}
+
+
+def baseline_measurements(db: sqlite3.Connection, runs: int = 10,
+                          exclude: Optional[str] = results.RUN_ID) -> Dict[tuple, float]:
+    """Median of every (route, viewport, metric) over the last runs that measured it"""
+    recent = [r["run"] for r in db.execute(
+        "SELECT run FROM measurements WHERE run IS NOT ? GROUP BY run ORDER BY MIN(rowid) DESC LIMIT ?",
+        (exclude, runs))]
+    per_metric: Dict[tuple, List[float]] = {}
+    query = (f"SELECT route, viewport, metric, value FROM measurements "
+             f"WHERE run IN ({_placeholders(recent)}) ORDER BY value")
+    for row in db.execute(query, recent):
+        per_metric.setdefault((row["route"], row["viewport"], row["metric"]), []).append(row["value"])
+    return {key: percentile(values, 50) for key, values in per_metric.items()}
+
+
+def pass_rate(db: sqlite3.Connection, by: str = "run", suite: Optional[str] = None,
+              runs: int = 30) -> List[Dict[str, Any]]:
+    """Share of passing results per run or per day (oldest first); warnings and skips are left out"""
+    period = {"run": "ru.run", "day": "substr(ru.started, 1, 10)"}[by]
+    recent = _recent_runs(db, runs)
+    query = (f"SELECT {period} AS period, MIN(ru.started) AS started, "
+             f"SUM(r.status = 'pass') AS passed, SUM(r.status = 'fail') AS failed "
+             f"FROM results r JOIN runs ru USING (run) WHERE r.run IN ({_placeholders(recent)})")
+    args: List[Any] = list(recent)
+    if suite is not None:
+        query += " AND r.suite = ?"
+        args.append(suite)
+    rows = db.execute(query + " GROUP BY period ORDER BY started", args)
+    return [
+        {"period": row["period"], "passed": row["passed"], "failed": row["failed"],
+         "pass_rate": row["passed"] / (row["passed"] + row["failed"]) if row["passed"] + row["failed"] else None}
+        for row in rows
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the PiterPay QA results history")
+    parser.add_argument("--db", default=HISTORY_DB)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest_cmd = commands.add_parser("ingest", help="store a run from the results file")
+    ingest_cmd.add_argument("run", help="run id (the run field of the records)")
+    ingest_cmd.add_argument("--file", default=results.RESULTS_FILE)
+
+    trend_cmd = commands.add_parser("trend", help="p50/p95 duration per run")
+    trend_cmd.add_argument("--test")
+    trend_cmd.add_argument("--route")
+    trend_cmd.add_argument("--runs", type=int, default=20)
+
+    slowest_cmd = commands.add_parser("slowest", help="tests with the highest p95 duration")
+    slowest_cmd.add_argument("--limit", type=int, default=10)
+    slowest_cmd.add_argument("--runs", type=int, default=10)
+    slowest_cmd.add_argument("--suite")
+
+    rate_cmd = commands.add_parser("pass-rate", help="pass rate over time")
+    rate_cmd.add_argument("--by", choices=["run", "day"], default="run")
+    rate_cmd.add_argument("--suite")
+    rate_cmd.add_argument("--runs", type=int, default=30)
+
+    args = parser.parse_args()
+    db = connect(args.db)
+    if args.command == "ingest":
+        print(f"Stored {ingest(args.run, args.file, db)} results of run {args.run}")
+    elif args.command == "trend":
+        for t in duration_trend(db, args.test, args.route, args.runs):
+            print(f"  {t['started'][:19]}  {(t['commit'] or '-')[:10]:10}  {t['count']:5d} results  "
+                  f"p50 {t['p50_ms']:8.0f}ms  p95 {t['p95_ms']:8.0f}ms")
+    elif args.command == "slowest":
+        for t in slowest_tests(db, args.limit, args.runs, args.suite):
+            print(f"  p95 {t['p95_ms']:8.0f}ms  p50 {t['p50_ms']:8.0f}ms  x{t['count']:<4d} [{t['suite']}] {t['test']}")
+    else:
+        for r in pass_rate(db, args.by, args.suite, args.runs):
+            rate = f"{r['pass_rate']:.1%}" if r["pass_rate"] is not None else "-"
+            print(f"  {r['period']:24}  {rate:>7}  ✅ {r['passed']:5d}  ❌ {r['failed']:5d}")
+    db.close()
@@ -0,0 +1,146 @@
+"""
+React hydration detector
+Navigations return as soon as React has hydrated the page
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+from qa_support.collectors import SampleCollector, register
+from qa_support.waits import wait_for_hydration, wait_for_hydration_async, wait_for_settled, wait_for_settled_async
+
+# Times are performance.now() values, i.e. ms since navigation start
+PROBE_JS = """
+(() => {
+    const state = window.__qaHydration = {hydratedAt: null, routerAt: null, commits: 0};
+
+    if (!window.__REACT_DEVTOOLS_GLOBAL_HOOK__) {
+        const renderers = new Map();
+        window.__REACT_DEVTOOLS_GLOBAL_HOOK__ = {
+            supportsFiber: true,
+            isDisabled: false,
+            renderers,
+            inject(renderer) {
+                const id = renderers.size + 1;
+                renderers.set(id, renderer);
+                return id;
+            },
+            onCommitFiberRoot(id, root) {
+                state.commits += 1;
+                const rootState = root && root.current && root.current.memoizedState;
+                if (state.hydratedAt === null && !(rootState && rootState.isDehydrated)) {
+                    state.hydratedAt = performance.now();
+                }
+            },
+            onCommitFiberUnmount() {},
+            onPostCommitFiberRoot() {},
+            checkDCE() {},
+        };
+    }
+
+    const watchRouter = () => {
+        if (window.next && window.next.router) state.routerAt = performance.now();
+        else requestAnimationFrame(watchRouter);
+    };
+    requestAnimationFrame(watchRouter);
+})();
+"""
+
+# Falls back to "now" when the probe is missing or React never reported a commit
+HYDRATION_TIME_JS = """
+() => {
+    const state = window.__qaHydration;
+    if (state && state.hydratedAt !== null) return {ms: state.hydratedAt, source: 'commit'};
+    if (state && state.routerAt !== null) return {ms: state.routerAt, source: 'router'};
+    return {ms: performance.now(), source: 'poll'};
+}
+"""
+
+
+@dataclass
+class HydrationSample:
+    """Hydration time of one navigation"""
+    route: str
+    hydration_ms: Optional[float]
+    source: str
+
+
+class HydrationMetrics(SampleCollector[HydrationSample]):
+    """Hydration time of every navigation in this process, grouped by route"""
+    sample_type = HydrationSample
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        out: Dict[str, Dict[str, float]] = {}
+        for s in self.samples:
+            entry = out.setdefault(s.route, {"count": 0, "mean_ms": 0.0, "max_ms": 0.0, "not_hydrated": 0})
+            entry["count"] += 1
+            if s.hydration_ms is None:
+                entry["not_hydrated"] += 1
+                continue
+            hydrated = entry["count"] - entry["not_hydrated"]
+            entry["mean_ms"] += (s.hydration_ms - entry["mean_ms"]) / hydrated
+            entry["max_ms"] = max(entry["max_ms"], s.hydration_ms)
+        return out
+
+    def print_summary(self):
+        if not self.samples:
+            return
+        print("\nHYDRATION:")
+        for route, s in sorted(self.summary().items()):
+            print(f"  {route:20} {s['count']:3d} loads  mean {s['mean_ms']:6.0f}ms  "
+                  f"max {s['max_ms']:6.0f}ms  not hydrated {s['not_hydrated']}")
+
+
+metrics = register("hydration", HydrationMetrics())
+
+
+def install_probe(context):
+    """Install the hydration probe on every page of a sync_api context"""
+    context.add_init_script(PROBE_JS)
+
+
+async def install_probe_async(context):
+    """Install the hydration probe on every page of an async_api context"""
+    await context.add_init_script(PROBE_JS)
+
+
+def _sample(page_url: str, hydrated: bool, timing: Optional[Dict[str, Any]]) -> HydrationSample:
+    route = urlparse(page_url).path or "/"
+    if not hydrated or timing is None:
+        return metrics.record(HydrationSample(route, None, "timeout"))
+    return metrics.record(HydrationSample(route, timing["ms"], timing["source"]))
+
+
+def record_hydration(page, timeout_ms: Optional[float] = None) -> HydrationSample:
+    """Wait for the current document to hydrate and record how long it took"""
+    hydrated = wait_for_hydration(page, timeout_ms)
+    timing = page.evaluate(HYDRATION_TIME_JS) if hydrated else None
+    return _sample(page.url, hydrated.satisfied, timing)
+
+
+async def record_hydration_async(page, timeout_ms: Optional[float] = None) -> HydrationSample:
+    hydrated = await wait_for_hydration_async(page, timeout_ms)
+    timing = await page.evaluate(HYDRATION_TIME_JS) if hydrated else None
+    return _sample(page.url, hydrated.satisfied, timing)
+
+
+def goto(page, url: str, wait_until: str = "domcontentloaded", timeout: float = 30000, settle: bool = False):
+    """Navigate and return the response once the page is hydrated
+
+    settle=True also waits for the page's data requests (see qa_support.network).
+    """
+    response = page.goto(url, wait_until=wait_until, timeout=timeout)
+    record_hydration(page)
+    if settle:
+        wait_for_settled(page)
+    return response
+
+
+async def goto_async(page, url: str, wait_until: str = "domcontentloaded", timeout: float = 30000,
+                     settle: bool = False):
+    response = await page.goto(url, wait_until=wait_until, timeout=timeout)
+    await record_hydration_async(page)
+    if settle:
+        await wait_for_settled_async(page)
+    return response
@@ -0,0 +1,146 @@
+"""
+Client-side route navigator
+Moves between routes through the Next.js router instead of full document loads
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import urljoin, urlparse
+
+from playwright.sync_api import Error as PlaywrightError
+
+from qa_support.collectors import SampleCollector, register
+from qa_support.hydration import goto, goto_async
+from qa_support.waits import (
+    wait_for_hydration,
+    wait_for_settled,
+    wait_for_settled_async,
+    wait_for_url_change,
+)
+
+# How long a soft navigation may take before falling back to goto() (ms)
+SOFT_TIMEOUT_MS = 10000
+
+# Resolves with the ms from router.push() until the new route has rendered
+# (the app router updates location once it commits the new tree), null when
+# the page has no client router
+SOFT_NAVIGATE_JS = """
+async ({path, timeoutMs}) => {
+    const router = window.next && window.next.router;
+    if (!router || typeof router.push !== 'function') return null;
+    const frame = () => new Promise(resolve => requestAnimationFrame(resolve));
+    const start = performance.now();
+    router.push(path);
+    while (location.pathname + location.search !== path) {
+        if (performance.now() - start > timeoutMs) return {ms: performance.now() - start, arrived: false};
+        await frame();
+    }
+    await frame();
+    return {ms: performance.now() - start, arrived: true};
+}
+"""
+
+
+@dataclass
+class NavigationSample:
+    """One route change: soft (client router, link click) or hard (document load)"""
+    route: str
+    kind: str
+    ms: float
+
+
+class NavigationMetrics(SampleCollector[NavigationSample]):
+    """Route changes of this process, grouped by target route"""
+    sample_type = NavigationSample
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        out: Dict[str, Dict[str, float]] = {}
+        for s in self.samples:
+            entry = out.setdefault(s.route, {"soft": 0, "soft_mean_ms": 0.0, "soft_max_ms": 0.0,
+                                             "hard": 0, "hard_mean_ms": 0.0})
+            entry[s.kind] += 1
+            mean = f"{s.kind}_mean_ms"
+            entry[mean] += (s.ms - entry[mean]) / entry[s.kind]
+            if s.kind == "soft":
+                entry["soft_max_ms"] = max(entry["soft_max_ms"], s.ms)
+        return out
+
+    def print_summary(self):
+        if not any(s.kind == "soft" for s in self.samples):
+            return
+        print("\nSOFT NAVIGATION:")
+        for route, s in sorted(self.summary().items()):
+            print(f"  {route:20} {s['soft']:3d} soft  mean {s['soft_mean_ms']:6.0f}ms  "
+                  f"max {s['soft_max_ms']:6.0f}ms  {s['hard']:3d} full loads  mean {s['hard_mean_ms']:6.0f}ms")
+
+
+metrics = register("navigation", NavigationMetrics())
+
+
+def _target(page_url: str, url: str) -> Optional[str]:
+    """Path (plus query) to push, or None when the URL is not on the page's origin"""
+    current, target = urlparse(page_url), urlparse(urljoin(page_url, url))
+    if current.scheme not in ("http", "https") or (current.scheme, current.netloc) != (target.scheme, target.netloc):
+        return None
+    return target.path + (f"?{target.query}" if target.query else "")
+
+
+def _route(url: str) -> str:
+    return urlparse(url).path or "/"
+
+
+def navigate(page, url: str, settle: bool = False) -> NavigationSample:
+    """Move to url through the client router, or with goto() when that is not possible
+
+    url is absolute or relative to the current page.
+    """
+    path = _target(page.url, url)
+    if path is not None:
+        try:
+            soft = page.evaluate(SOFT_NAVIGATE_JS, {"path": path, "timeoutMs": SOFT_TIMEOUT_MS})
+        except PlaywrightError:
+            soft = None
+        if soft and soft["arrived"]:
+            if settle:
+                wait_for_settled(page)
+            return metrics.record(NavigationSample(_route(url), "soft", soft["ms"]))
+
+    start = time.perf_counter()
+    goto(page, urljoin(page.url, url), settle=settle)
+    return metrics.record(NavigationSample(_route(url), "hard", (time.perf_counter() - start) * 1000))
+
+
+async def navigate_async(page, url: str, settle: bool = False) -> NavigationSample:
+    path = _target(page.url, url)
+    if path is not None:
+        try:
+            soft = await page.evaluate(SOFT_NAVIGATE_JS, {"path": path, "timeoutMs": SOFT_TIMEOUT_MS})
+        except PlaywrightError:
+            soft = None
+        if soft and soft["arrived"]:
+            if settle:
+                await wait_for_settled_async(page)
+            return metrics.record(NavigationSample(_route(url), "soft", soft["ms"]))
+
+    start = time.perf_counter()
+    await goto_async(page, urljoin(page.url, url), settle=settle)
+    return metrics.record(NavigationSample(_route(url), "hard", (time.perf_counter() - start) * 1000))
+
+
+def click_through(page, locator, expected_path: Optional[str] = None) -> Optional[NavigationSample]:
+    """Click a client-side link and record the soft navigation it makes
+
+    Returns None when the click does not change the URL (e.g. the link points
+    at the current route).
+    """
+    previous = page.url
+    if expected_path and urlparse(previous).path == expected_path:
+        locator.click()
+        return None
+    start = time.perf_counter()
+    locator.click()
+    if not wait_for_url_change(page, previous):
+        return None
+    wait_for_hydration(page)
+    return metrics.record(NavigationSample(_route(page.url), "soft", (time.perf_counter() - start) * 1000))
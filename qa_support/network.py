@@ -0,0 +1,99 @@
+"""
+In-flight request tracker
+A page is settled when only long-lived connections are still open
+"""
+
+import re
+import time
+import weakref
+from typing import Dict, Iterable, List, Optional, Set
+
+TRACKED_TYPES = {"fetch", "xhr"}
+
+# Requests that stay open for the lifetime of the page
+ALLOW_LIST = [
+    r"/realtime/v1/",
+    r"/_next/webpack-hmr",
+    r"/__nextjs_",
+]
+
+_trackers: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _page_of(request):
+    """The page a request belongs to (None for service worker requests)"""
+    try:
+        return request.frame.page
+    except Exception:
+        return None
+
+
+class RequestTracker:
+    """Outstanding fetch/XHR requests of one browser context, per page"""
+
+    def __init__(self, allow: Iterable[str] = ()):
+        self.allow = [re.compile(p) for p in [*ALLOW_LIST, *allow]]
+        self.pending: Dict[object, Set[object]] = {}
+        self.last_activity: Dict[object, float] = {}
+
+    def attach(self, context):
+        context.on("request", self._on_request)
+        context.on("requestfinished", self._on_done)
+        context.on("requestfailed", self._on_done)
+        context.on("page", self._on_page)
+
+    def _on_page(self, page):
+        page.on("close", self._on_close)
+        page.on("framenavigated", lambda frame: self._on_navigated(page, frame))
+
+    def tracks(self, request) -> bool:
+        return request.resource_type in TRACKED_TYPES and not any(p.search(request.url) for p in self.allow)
+
+    def _on_request(self, request):
+        page = _page_of(request)
+        if page is not None and self.tracks(request):
+            self.pending.setdefault(page, set()).add(request)
+            self.last_activity[page] = time.perf_counter()
+
+    def _on_done(self, request):
+        page = _page_of(request)
+        if page is not None and request in self.pending.get(page, ()):
+            self.pending[page].discard(request)
+            self.last_activity[page] = time.perf_counter()
+
+    def _on_navigated(self, page, frame):
+        # A new document starts its own fetches once its scripts run
+        if frame.parent_frame is None:
+            self.last_activity[page] = time.perf_counter()
+
+    def _on_close(self, page):
+        self.pending.pop(page, None)
+        self.last_activity.pop(page, None)
+
+    def outstanding(self, page) -> List[str]:
+        """URLs of the tracked requests the page is still waiting for"""
+        return [request.url for request in self.pending.get(page, ())]
+
+    def idle_ms(self, page, since: Optional[float] = None) -> Optional[float]:
+        """How long the page has had no tracked request open (None while one is)
+
+        Quiet time is counted from the page's last navigation or request, and
+        not from before since (a perf_counter() value, usually when a wait started).
+        """
+        if self.pending.get(page):
+            return None
+        last = max(self.last_activity.get(page, float("-inf")), since if since is not None else float("-inf"))
+        return float("inf") if last == float("-inf") else (time.perf_counter() - last) * 1000
+
+
+def install_tracker(context, allow: Iterable[str] = ()) -> RequestTracker:
+    """Track the requests of every page of a context (sync_api or async_api)"""
+    tracker = RequestTracker(allow)
+    tracker.attach(context)
+    _trackers[context] = tracker
+    return tracker
+
+
+def tracker_for(page) -> Optional[RequestTracker]:
+    """The tracker installed on the page's context, if any"""
+    return _trackers.get(page.context)
@@ -0,0 +1,156 @@
+"""
+Parallel executor for the Python QA suites
+
+Each worker process owns a single Chromium instance and every task gets its
+own browser context, so suites written against one shared page can run side
+by side without leaking state into each other.
+"""
+
+import importlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from playwright.sync_api import Browser, BrowserContext, sync_playwright
+
+# Every collector module is imported so the registry is complete in workers
+from qa_support import artifacts, assets, collectors, coverage, hydration, navigation, profiles, replay, screenshots, timings, visual, vitals, waits
+from qa_support.context import new_qa_context
+from qa_support.results import Results
+from qa_support.schedule import Schedule
+
+# Extra attempts for a failing test, like the retries of playwright.config.ts
+RETRIES = int(os.environ.get("QA_RETRIES", "2" if os.environ.get("CI") else "0"))
+
+_playwright = None
+_browser: Optional[Browser] = None
+
+
+def _shutdown_browser():
+    """Close the per-process browser (also runs when a pool worker exits)"""
+    global _playwright, _browser
+    if _browser is not None:
+        try:
+            _browser.close()
+        finally:
+            _playwright.stop()
+            _browser = None
+            _playwright = None
+
+
+def get_browser() -> Browser:
+    """Return the browser for this process, launching it on first use"""
+    global _playwright, _browser
+    if _browser is None:
+        _playwright = sync_playwright().start()
+        _browser = _playwright.chromium.launch(headless=True)
+        collectors.on_exit(_shutdown_browser, priority=10)
+    return _browser
+
+
+def new_context(profile: Optional[str] = None, **overrides) -> BrowserContext:
+    """Open a fresh context on this process's browser"""
+    return new_qa_context(get_browser(), profile=profile, **overrides)
+
+
+def _run_attempt(module, test_name: str, attempt: int, first_comparison: int):
+    """Run a test once in a fresh context, recording its artifacts"""
+    context = new_context(profiles.profile_for(module, getattr(module, test_name)))
+    try:
+        page = context.new_page()
+        with artifacts.recording(page, test_name, lambda: module.results.failed, attempt):
+            try:
+                getattr(module, test_name)(page)
+            except Exception as e:
+                module.results.add_fail(f"{test_name}: Worker", str(e))
+            if visual.enabled():
+                screenshots.flush()
+                for comparison in visual.results.samples[first_comparison:]:
+                    if not comparison.passed:
+                        module.results.add_fail(f"{test_name}: Visual {comparison.key}", comparison.details)
+    finally:
+        vitals.collect_pages(context)
+        context.close()
+
+
+def run_isolated(task: Tuple[str, str]) -> Dict[str, Any]:
+    """Executor task for suites that report through a module-level `results`
+
+    task is (module name, test function name). The test gets a fresh context
+    and its own Results, whose records go straight to the results file; their
+    counters and failures are handed back together with what the test added to
+    every registered collector (qa_support.collectors).
+    The context uses the resource profile the test (or its module) declares.
+    A failed visual comparison is reported as a failure of the test.
+    A failing test is run again up to RETRIES times; only the last attempt's
+    counters are handed back (the file has the records of every attempt).
+    """
+    module_name, test_name = task
+    marks = collectors.snapshot()
+    module = importlib.import_module(module_name)
+    shared = module.results
+    try:
+        for attempt in range(RETRIES + 1):
+            first_comparison = len(visual.results.samples)
+            module.results = Results(shared.suite, attempt=attempt)
+            _run_attempt(module, test_name, attempt, first_comparison)
+            if not module.results.failed:
+                break
+        task_results = module.results
+    finally:
+        module.results = shared
+    return {
+        "results": task_results.export(),
+        "attempts": attempt + 1,
+        **collectors.since(marks),
+    }
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """Map a requested worker count to a real one (0 or None = all cores)"""
+    if not workers or workers < 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def _timed(runner: Callable[[Any], Any], task: Any) -> Tuple[int, float, float, Any]:
+    start = time.time()
+    outcome = runner(task)
+    return os.getpid(), start, time.time(), outcome
+
+
+def run_tasks(runner: Callable[[Any], Any], tasks: Sequence[Any], workers: Optional[int] = None,
+              schedule: Optional[Schedule] = None) -> List[Any]:
+    """Run runner(task) for every task and return the outcomes in task order
+
+    runner must be a module-level function so it can be sent to the worker
+    processes. With a single worker everything runs in this process.
+    With a schedule the tasks are handed out in its (longest-first) order and
+    their timings are recorded on it.
+    """
+    workers = min(resolve_workers(workers), max(len(tasks), 1))
+    order = schedule.order if schedule is not None else range(len(tasks))
+    if schedule is not None:
+        schedule.start(workers)
+    outcomes: List[Any] = [None] * len(tasks)
+
+    def finish(index: int, timed: Tuple[int, float, float, Any]):
+        worker, start, end, outcomes[index] = timed
+        if schedule is not None:
+            schedule.record(index, worker, start, end)
+
+    if workers == 1:
+        try:
+            for index in order:
+                finish(index, _timed(runner, tasks[index]))
+            return outcomes
+        finally:
+            _shutdown_browser()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # The pool starts tasks in submission order
+        futures = {pool.submit(_timed, runner, tasks[index]): index for index in order}
+        for future in as_completed(futures):
+            finish(futures[future], future.result())
+    return outcomes
@@ -0,0 +1,178 @@
+"""
+Resource profiles
+Which images, fonts, media and stylesheets a context may load
+"""
+
+import base64
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Optional, Set
+from urllib.parse import urlparse
+
+from qa_support import auth
+from qa_support.collectors import register
+
+DEFAULT_PROFILE = "full"
+
+# 1x1 transparent GIF
+PLACEHOLDER_IMAGE = base64.b64decode("R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7")
+
+# Hosted Supabase projects, first-party when NEXT_PUBLIC_SUPABASE_URL is not set
+SUPABASE_HOSTS = re.compile(r"^.+\.supabase\.co$")
+
+# Requests a profile without host blocking has to look at
+MEDIA_PATTERN = re.compile(
+    r"\.(?:png|jpe?g|gif|svg|ico|webp|avif|woff2?|ttf|otf|mp4|webm|mp3|ogg|wav)(?:\?|$)|/_next/image\?"
+)
+
+
+@dataclass(frozen=True)
+class ResourceProfile:
+    name: str
+    stubbed_types: FrozenSet[str] = frozenset()
+    blocked_types: FrozenSet[str] = frozenset()
+    block_third_party: bool = False
+
+    @property
+    def active(self) -> bool:
+        return bool(self.stubbed_types or self.blocked_types or self.block_third_party)
+
+    @property
+    def pattern(self):
+        """Requests the profile has to see"""
+        return "**/*" if self.block_third_party or "stylesheet" in self.stubbed_types else MEDIA_PATTERN
+
+
+PROFILES: Dict[str, ResourceProfile] = {
+    "full": ResourceProfile("full"),
+    "no-media": ResourceProfile(
+        "no-media",
+        stubbed_types=frozenset({"image"}),
+        blocked_types=frozenset({"font", "media"}),
+    ),
+    "dom-only": ResourceProfile(
+        "dom-only",
+        stubbed_types=frozenset({"image", "stylesheet"}),
+        blocked_types=frozenset({"font", "media"}),
+        block_third_party=True,
+    ),
+}
+
+STUBS = {
+    "image": {"status": 200, "content_type": "image/gif", "body": PLACEHOLDER_IMAGE},
+    "stylesheet": {"status": 200, "content_type": "text/css", "body": ""},
+}
+
+def resolve(name: Optional[str] = None) -> ResourceProfile:
+    """The profile to use: QA_RESOURCE_PROFILE, else name, else full"""
+    name = os.environ.get("QA_RESOURCE_PROFILE") or name or DEFAULT_PROFILE
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown resource profile: {name} (expected one of {', '.join(PROFILES)})")
+
+
+def uses_profile(name: str) -> Callable:
+    """Declare the resource profile a test needs when it gets its own context"""
+    resolve(name)
+
+    def mark(test):
+        test.resource_profile = name
+        return test
+
+    return mark
+
+
+def profile_for(module, test=None) -> str:
+    """Name of the profile declared for a test (or suite module)"""
+    return getattr(test, "resource_profile", None) or getattr(module, "RESOURCE_PROFILE", DEFAULT_PROFILE)
+
+
+class ProfileUsage(Counter):
+    """Contexts opened per profile in this process"""
+
+    def export(self) -> Dict[str, int]:
+        return dict(self)
+
+    def snapshot(self) -> Dict[str, int]:
+        return self.export()
+
+    def since(self, snapshot: Optional[Dict[str, int]]) -> Dict[str, int]:
+        """Contexts opened after snapshot (an earlier snapshot()), to send back from a worker"""
+        snapshot = snapshot or {}
+        return {name: count - snapshot.get(name, 0) for name, count in self.items() if count > snapshot.get(name, 0)}
+
+    def extend(self, exported: Dict[str, int]):
+        """Add context counts exported by another process"""
+        self.update(exported)
+
+    def print_summary(self):
+        if self:
+            print("\nRESOURCE PROFILES: " + "  ".join(f"{name} {count}" for name, count in sorted(self.items())))
+
+
+usage = register("resource_profiles", ProfileUsage())
+
+
+def first_party_hosts(base_url: str) -> Set[str]:
+    """Hosts that are never third-party: the app under test and its Supabase"""
+    return {host for host in (urlparse(base_url).hostname, urlparse(auth.SUPABASE_URL).hostname) if host}
+
+
+def _first_party(host: str, hosts: Set[str]) -> bool:
+    return host in hosts or (not auth.SUPABASE_URL and bool(SUPABASE_HOSTS.match(host)))
+
+
+def _decide(profile: ResourceProfile, request, hosts: Set[str]) -> Optional[Dict]:
+    """fulfill() arguments for a stubbed request, {} for a blocked one, None to let it through"""
+    if profile.block_third_party and not _first_party(urlparse(request.url).hostname or "", hosts):
+        return {}
+    if request.resource_type in profile.blocked_types:
+        return {}
+    if request.resource_type in profile.stubbed_types:
+        return STUBS[request.resource_type]
+    return None
+
+
+def install(context, base_url: str, name: Optional[str] = None) -> ResourceProfile:
+    """Apply a resource profile to a sync_api context testing the app at base_url"""
+    profile = resolve(name)
+    usage[profile.name] += 1
+    if not profile.active:
+        return profile
+    hosts = first_party_hosts(base_url)
+
+    def handle(route):
+        stub = _decide(profile, route.request, hosts)
+        if stub is None:
+            route.fallback()
+        elif stub:
+            route.fulfill(**stub)
+        else:
+            route.abort("blockedbyclient")
+
+    context.route(profile.pattern, handle)
+    return profile
+
+
+async def install_async(context, base_url: str, name: Optional[str] = None) -> ResourceProfile:
+    """Apply a resource profile to an async_api context testing the app at base_url"""
+    profile = resolve(name)
+    usage[profile.name] += 1
+    if not profile.active:
+        return profile
+    hosts = first_party_hosts(base_url)
+
+    async def handle(route):
+        stub = _decide(profile, route.request, hosts)
+        if stub is None:
+            await route.fallback()
+        elif stub:
+            await route.fulfill(**stub)
+        else:
+            await route.abort("blockedbyclient")
+
+    await context.route(profile.pattern, handle)
+    return profile
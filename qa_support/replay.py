@@ -0,0 +1,292 @@
+"""
+Backend record/replay
+Records Supabase calls into a HAR archive and answers them from it (QA_REPLAY)
+"""
+
+import base64
+import fcntl
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlparse
+
+from qa_support import collectors
+from qa_support.backend import ROUTE_PATTERN
+
+ARCHIVE = os.environ.get("QA_REPLAY_ARCHIVE", "/tmp/piterpay-qa-backend.har")
+
+# Never written to the archive
+SECRET_HEADERS = {"authorization", "apikey", "cookie"}
+
+# Redacted in auth response bodies
+SECRET_FIELDS = {"access_token", "refresh_token", "provider_token", "provider_refresh_token"}
+
+REDACTED = "redacted"
+
+# The body is stored decoded, so these no longer describe it
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+# Set in the environment, so pool workers started later share it
+RUN_ID = os.environ.setdefault("QA_REPLAY_RUN", uuid.uuid4().hex)
+
+Key = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+
+
+def mode() -> str:
+    """"record", "replay" or "" (live backend)"""
+    value = os.environ.get("QA_REPLAY", "")
+    return value if value in ("record", "replay") else ""
+
+
+def request_key(method: str, url: str) -> Key:
+    """What a recorded exchange is matched on"""
+    parsed = urlparse(url)
+    return method.upper(), parsed.path, tuple(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+
+
+def _har_body(body: bytes, mime_type: str) -> Dict[str, Any]:
+    try:
+        return {"size": len(body), "mimeType": mime_type, "text": body.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"size": len(body), "mimeType": mime_type, "text": base64.b64encode(body).decode(),
+                "encoding": "base64"}
+
+
+def _redact_token(name: str, value: Any) -> Any:
+    if not isinstance(value, str):
+        return value
+    parts = value.split(".")
+    if name == "access_token" and len(parts) == 3:
+        return f"{parts[0]}.{parts[1]}.{REDACTED}"
+    return REDACTED
+
+
+def _redacted(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _redact_token(k, v) if k in SECRET_FIELDS else _redacted(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_redacted(v) for v in value]
+    return value
+
+
+def redact_auth_body(body: bytes) -> bytes:
+    """An auth response body with its tokens redacted; non-JSON bodies are dropped"""
+    try:
+        return json.dumps(_redacted(json.loads(body))).encode("utf-8")
+    except ValueError:
+        return b""
+
+
+def _body_of(content: Dict[str, Any]) -> bytes:
+    text = content.get("text", "")
+    return base64.b64decode(text) if content.get("encoding") == "base64" else text.encode("utf-8")
+
+
+@dataclass
+class ReplayStats:
+    """Exchanges recorded and replayed in this process"""
+    recorded: int = 0
+    hits: int = 0
+    misses: int = 0
+
+    def export(self) -> Dict[str, int]:
+        return asdict(self)
+
+    def snapshot(self) -> Dict[str, int]:
+        return self.export()
+
+    def since(self, snapshot: Optional[Dict[str, int]]) -> Dict[str, int]:
+        """Counts after snapshot (an earlier snapshot()), to send back from a worker"""
+        snapshot = snapshot or {}
+        return {name: count - snapshot.get(name, 0) for name, count in self.export().items()}
+
+    def extend(self, exported: Dict[str, int]):
+        """Add counts exported by another process"""
+        for name, count in exported.items():
+            setattr(self, name, getattr(self, name) + count)
+
+    def print_summary(self):
+        if self.recorded or self.hits or self.misses:
+            print(f"\nREPLAY: {mode()} {ARCHIVE}  recorded {self.recorded}  "
+                  f"hits {self.hits}  misses {self.misses}")
+
+
+stats = collectors.register("replay", ReplayStats())
+
+
+class Archive:
+    """The recorded exchanges of this process, and the loaded archive to replay"""
+
+    def __init__(self, path: str = ARCHIVE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.new_entries: List[Dict[str, Any]] = []
+        self.saved = 0
+        self._index: Optional[Dict[Key, List[Dict[str, Any]]]] = None
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+    def record(self, request, status: int, headers: Dict[str, str], body: bytes, elapsed_ms: float):
+        parsed = urlparse(request.url)
+        if "/auth/v1/" in parsed.path:
+            body = redact_auth_body(body)
+        entry = {
+            "_run": RUN_ID,
+            "startedDateTime": datetime.now(timezone.utc).isoformat(),
+            "time": round(elapsed_ms, 1),
+            "request": {
+                "method": request.method,
+                "url": request.url,
+                "queryString": [{"name": k, "value": v}
+                                for k, v in parse_qsl(parsed.query, keep_blank_values=True)],
+                "headers": [{"name": k, "value": v} for k, v in request.headers.items()
+                            if k.lower() not in SECRET_HEADERS],
+                # Auth request bodies carry passwords and refresh tokens
+                **({"postData": {"mimeType": request.headers.get("content-type", ""), "text": request.post_data}}
+                   if request.post_data and "/auth/v1/" not in parsed.path else {}),
+            },
+            "response": {
+                "status": status,
+                "headers": [{"name": k, "value": v} for k, v in headers.items()
+                            if k.lower() not in DROPPED_HEADERS],
+                "content": _har_body(body, headers.get("content-type", "")),
+            },
+        }
+        with self.lock:
+            self.new_entries.append(entry)
+            stats.recorded += 1
+
+    def _read(self) -> List[Dict[str, Any]]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)["log"]["entries"]
+        except (FileNotFoundError, ValueError, KeyError):
+            return []
+
+    def save(self):
+        """Merge this process's new entries into the archive file"""
+        with self.lock:
+            pending, self.saved = self.new_entries[self.saved:], len(self.new_entries)
+        if not pending:
+            return
+        with open(f"{self.path}.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            existing = self._read()
+            recorded = [e for e in existing if e.get("_run") == RUN_ID] + pending
+            keys = {request_key(e["request"]["method"], e["request"]["url"]) for e in recorded}
+            entries = [e for e in existing if e.get("_run") != RUN_ID
+                       and request_key(e["request"]["method"], e["request"]["url"]) not in keys] + recorded
+            har = {"log": {"version": "1.2", "creator": {"name": "piterpay-qa", "version": "1"},
+                           "entries": entries}}
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(har, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+
+    # ------------------------------------------------------------------
+    # Replaying
+    # ------------------------------------------------------------------
+    def index(self) -> Dict[Key, List[Dict[str, Any]]]:
+        if self._index is None:
+            self._index = {}
+            for entry in self._read():
+                key = request_key(entry["request"]["method"], entry["request"]["url"])
+                self._index.setdefault(key, []).append(entry["response"])
+            if not self._index:
+                print(f"⚠️  Replay archive {self.path} is empty or missing - backend calls go to the network")
+        return self._index
+
+
+_archive: Optional[Archive] = None
+
+
+def archive() -> Archive:
+    """The process-wide archive, saved when the process exits"""
+    global _archive
+    if _archive is None:
+        _archive = Archive()
+        collectors.on_exit(_archive.save, priority=20)
+    return _archive
+
+
+class Replayer:
+    """Replays archived responses to one context, in recorded order per request"""
+
+    def __init__(self, source: Archive):
+        self.source = source
+        self.served: Dict[Key, int] = {}
+
+    def response_for(self, request) -> Optional[Dict[str, Any]]:
+        key = request_key(request.method, request.url)
+        responses = self.source.index().get(key)
+        if not responses:
+            stats.misses += 1
+            return None
+        served = self.served.get(key, 0)
+        self.served[key] = served + 1
+        stats.hits += 1
+        response = responses[min(served, len(responses) - 1)]
+        return {
+            "status": response["status"],
+            "headers": {h["name"]: h["value"] for h in response["headers"]},
+            "body": _body_of(response["content"]),
+        }
+
+
+# ============================================================
+# Browser hookup
+# ============================================================
+def install(context):
+    """Record or replay a sync_api context's backend calls, per QA_REPLAY"""
+    if mode() == "record":
+        def record(route):
+            start = time.perf_counter()
+            response = route.fetch()
+            body = response.body()
+            archive().record(route.request, response.status, response.headers, body,
+                             (time.perf_counter() - start) * 1000)
+            route.fulfill(response=response, body=body)
+
+        context.route(ROUTE_PATTERN, record)
+    elif mode() == "replay":
+        replayer = Replayer(archive())
+
+        def replay(route):
+            response = replayer.response_for(route.request)
+            if response is None:
+                route.continue_()
+            else:
+                route.fulfill(**response)
+
+        context.route(ROUTE_PATTERN, replay)
+
+
+async def install_async(context):
+    """Record or replay an async_api context's backend calls, per QA_REPLAY"""
+    if mode() == "record":
+        async def record(route):
+            start = time.perf_counter()
+            response = await route.fetch()
+            body = await response.body()
+            archive().record(route.request, response.status, response.headers, body,
+                             (time.perf_counter() - start) * 1000)
+            await route.fulfill(response=response, body=body)
+
+        await context.route(ROUTE_PATTERN, record)
+    elif mode() == "replay":
+        replayer = Replayer(archive())
+
+        async def replay(route):
+            response = replayer.response_for(route.request)
+            if response is None:
+                await route.continue_()
+            else:
+                await route.fulfill(**response)
+
+        await context.route(ROUTE_PATTERN, replay)
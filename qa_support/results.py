@@ -0,0 +1,178 @@
+"""
+Streaming test results
+Every result of every suite is appended to one JSONL file as it is reported
+"""
+
+import json
+import os
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from qa_support import collectors
+
+RESULTS_FILE = os.environ.get("QA_RESULTS_FILE", "/tmp/piterpay-qa-results.jsonl")
+
+# Sortable, shared with worker processes through the environment
+RUN_ID = os.environ.setdefault("QA_RUN_ID", f"{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}")
+
+STATUSES = ("pass", "fail", "warning", "skip")
+
+# Warnings kept in memory for summaries (all of them are in the file)
+KEPT_WARNINGS = 100
+
+_descriptors: Dict[str, int] = {}
+
+
+def _close_descriptors():
+    for fd in _descriptors.values():
+        os.close(fd)
+    _descriptors.clear()
+
+
+collectors.on_exit(_close_descriptors, priority=5)
+
+
+def append(record: Dict[str, Any], path: str = RESULTS_FILE):
+    """Append one record to path as a single write"""
+    fd = _descriptors.get(path)
+    if fd is None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        fd = _descriptors[path] = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    # One write() per record on an O_APPEND descriptor: workers never interleave
+    os.write(fd, (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+
+
+def read(path: str = RESULTS_FILE, run: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Records in path (of one run when run is given), skipping a torn last line"""
+    try:
+        f = open(path, encoding="utf-8")
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if run is None or record.get("run") == run:
+                yield record
+
+
+class Results:
+    """Results of one suite, streamed to the results file as they are reported"""
+
+    def __init__(self, suite: str, path: str = RESULTS_FILE, echo: bool = True, attempt: int = 0):
+        self.suite = suite
+        self.attempt = attempt
+        self.path = path
+        self.echo = echo
+        self.route: Optional[str] = None
+        self.counts: Counter = Counter()
+        self.failures: List[Dict[str, Any]] = []
+        self.warning_records: List[Dict[str, Any]] = []
+
+    def start(self, route: Optional[str] = None):
+        """Set the route later records default to"""
+        self.route = route
+
+    def record(self, test: str, status: str, details: str = "", duration_ms: Optional[float] = None,
+               route: Optional[str] = None) -> Dict[str, Any]:
+        record = {
+            "run": RUN_ID,
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "worker": os.getpid(),
+            "suite": self.suite,
+            "test": test,
+            "route": route or self.route,
+            "status": status,
+            "details": str(details),
+            "duration_ms": None if duration_ms is None else round(duration_ms, 1),
+            "attempt": self.attempt,
+        }
+        append(record, self.path)
+        self._count(record)
+        if self.echo:
+            self._print(record)
+        return record
+
+    def _count(self, record: Dict[str, Any]):
+        self.counts[record["status"]] += 1
+        if record["status"] == "fail":
+            self.failures.append({"test": record["test"], "error": record["details"], "route": record["route"]})
+        elif record["status"] == "warning" and len(self.warning_records) < KEPT_WARNINGS:
+            self.warning_records.append({"test": record["test"], "details": record["details"], "route": record["route"]})
+
+    @staticmethod
+    def _print(record: Dict[str, Any]):
+        if record["status"] == "pass":
+            print(f"✅ PASS: {record['test']}")
+        elif record["status"] == "fail":
+            print(f"❌ FAIL: {record['test']} - {record['details']}")
+        elif record["status"] == "warning":
+            print(f"⚠️  WARN: {record['test']}" + (f" - {record['details']}" if record["details"] else ""))
+        else:
+            print(f"⏭️  SKIP: {record['test']}")
+
+    def add_pass(self, test: str, details: str = "", **fields) -> Dict[str, Any]:
+        return self.record(test, "pass", details, **fields)
+
+    def add_fail(self, test: str, error, **fields) -> Dict[str, Any]:
+        return self.record(test, "fail", str(error), **fields)
+
+    def add_warning(self, test: str, details: str = "", **fields) -> Dict[str, Any]:
+        return self.record(test, "warning", details, **fields)
+
+    def add_skip(self, test: str, details: str = "", **fields) -> Dict[str, Any]:
+        return self.record(test, "skip", details, **fields)
+
+    @property
+    def passed(self) -> int:
+        return self.counts["pass"]
+
+    @property
+    def failed(self) -> int:
+        return self.counts["fail"]
+
+    @property
+    def warnings(self) -> int:
+        return self.counts["warning"]
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def export(self) -> Dict[str, Any]:
+        """Counters and kept records as plain data that can cross process boundaries"""
+        return {
+            "suite": self.suite,
+            "counts": {status: self.counts.get(status, 0) for status in STATUSES},
+            "failures": self.failures,
+            "warnings": self.warning_records,
+        }
+
+    def merge(self, exported: Dict[str, Any]):
+        """Add the counters of results another process exported (its records are already in the file)"""
+        self.counts.update(exported["counts"])
+        self.failures.extend(exported["failures"])
+        room = KEPT_WARNINGS - len(self.warning_records)
+        self.warning_records.extend(exported["warnings"][:max(room, 0)])
+
+    def summary(self) -> bool:
+        """Print the totals and failures; True when nothing failed"""
+        print("\n" + "="*60)
+        print(f"TOTAL TESTS: {self.total}")
+        print(f"PASSED: {self.passed}")
+        print(f"FAILED: {self.failed}")
+        if self.warnings:
+            print(f"WARNINGS: {self.warnings}")
+        print("="*60)
+
+        if self.failures:
+            print("\nFAILED TESTS:")
+            for f in self.failures:
+                print(f"  - {f['test']}: {f['error']}")
+
+        print(f"\nResults streamed to {self.path} (run {RUN_ID})")
+        return self.failed == 0
@@ -0,0 +1,163 @@
+"""
+Longest-first scheduling
+Hands pool tasks out by their median duration in the history, longest first
+"""
+
+import os
+import sqlite3
+import statistics
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from qa_support import history
+
+Key = Tuple[str, str]  # (suite, unit)
+
+# Rough duration of a task of each suite when nothing is known about it
+SUITE_ESTIMATES_MS = {
+    "deep": 6000,
+    "comprehensive": 5000,
+    "journey": 10000,
+    "e2e-comprehensive": 8000,
+    "interaction": 6000,
+    "e2e": 4000,
+}
+DEFAULT_ESTIMATE_MS = 5000
+
+# Name fragments of tasks that visit many pages or viewports; first match wins
+NAME_WEIGHTS = [
+    ("all_pages", 9.0),
+    ("responsive", 3.0),
+    ("consistency", 3.0),
+    ("complete_session", 3.0),
+    ("mobile", 2.0),
+    ("navigation", 2.0),
+]
+
+# Runs of history the estimates are taken from
+HISTORY_RUNS = 10
+
+
+def _weight(unit: str) -> float:
+    return next((weight for fragment, weight in NAME_WEIGHTS if fragment in unit), 1.0)
+
+
+def estimate(keys: Sequence[Key], known: Optional[Dict[Key, float]] = None) -> Dict[Key, Tuple[float, bool]]:
+    """Estimated duration of every task, and whether it came from the history"""
+    if known is None:
+        known = {}
+        if history.enabled() and os.path.exists(history.HISTORY_DB):
+            try:
+                db = history.connect()
+                try:
+                    known = history.task_durations(db, HISTORY_RUNS)
+                finally:
+                    db.close()
+            except sqlite3.Error as e:
+                print(f"⚠️  Could not read task durations from {history.HISTORY_DB}: {e}")
+
+    per_suite: Dict[str, List[float]] = {}
+    for (suite, _), duration in known.items():
+        per_suite.setdefault(suite, []).append(duration)
+
+    estimates = {}
+    for suite, unit in keys:
+        if (suite, unit) in known:
+            estimates[(suite, unit)] = (known[(suite, unit)], True)
+            continue
+        base = (statistics.median(per_suite[suite]) if suite in per_suite
+                else SUITE_ESTIMATES_MS.get(suite, DEFAULT_ESTIMATE_MS))
+        estimates[(suite, unit)] = (base * _weight(unit), False)
+    return estimates
+
+
+@dataclass
+class Timing:
+    suite: str
+    unit: str
+    worker: int
+    start: float
+    end: float
+    estimated_ms: float
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end - self.start) * 1000
+
+
+class Schedule:
+    """Longest-first order of a batch of tasks, and how the run went
+
+    keys holds the (suite, unit) of every task, in task order.
+    """
+
+    def __init__(self, keys: Sequence[Key], known: Optional[Dict[Key, float]] = None):
+        self.keys = list(keys)
+        self.estimates = estimate(self.keys, known)
+        self.order = sorted(range(len(self.keys)), key=lambda i: self.estimates[self.keys[i]][0], reverse=True)
+        self.workers = 1
+        self.started: Optional[float] = None
+        self.timings: List[Timing] = []
+
+    def start(self, workers: int):
+        self.workers = workers
+        self.started = time.time()
+        self.timings.clear()
+
+    def record(self, index: int, worker: int, start: float, end: float):
+        key = self.keys[index]
+        self.timings.append(Timing(key[0], key[1], worker, start, end, self.estimates[key][0]))
+
+    @contextmanager
+    def timing(self, index: int) -> Iterator[None]:
+        """Time task index run in this process, for runs that go through the tasks one by one"""
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.record(index, os.getpid(), start, time.time())
+
+    def summary(self) -> Dict[str, Any]:
+        if not self.timings:
+            return {}
+        started = self.started or min(t.start for t in self.timings)
+        makespan_ms = (max(t.end for t in self.timings) - started) * 1000
+        work_ms = sum(t.duration_ms for t in self.timings)
+        ideal_ms = max(work_ms / self.workers, max(t.duration_ms for t in self.timings))
+        return {
+            "order": "longest-first",
+            "workers": self.workers,
+            "tasks": len(self.timings),
+            "from_history": sum(1 for _, from_history in self.estimates.values() if from_history),
+            "work_ms": round(work_ms),
+            "makespan_ms": round(makespan_ms),
+            "ideal_ms": round(ideal_ms),
+            "efficiency": round(ideal_ms / makespan_ms, 3) if makespan_ms else 1.0,
+            "idle_ms": round(makespan_ms * self.workers - work_ms),
+        }
+
+    def export(self) -> List[Dict[str, Any]]:
+        return [{**asdict(t), "duration_ms": round(t.duration_ms, 1)} for t in self.timings]
+
+    def print_summary(self):
+        s = self.summary()
+        if not s:
+            return
+        print(f"\nSCHEDULE: makespan {s['makespan_ms'] / 1000:.1f}s  ideal {s['ideal_ms'] / 1000:.1f}s "
+              f"({s['efficiency']:.0%})  idle {s['idle_ms'] / 1000:.1f}s on {s['workers']} workers  "
+              f"estimates from history {s['from_history']}/{s['tasks']}")
+
+    def save(self):
+        """Store the task durations in the history for the next schedule"""
+        if not history.enabled() or not self.timings:
+            return
+        try:
+            db = history.connect()
+            try:
+                history.store_tasks(db, self.export())
+            finally:
+                db.close()
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not store task durations in {history.HISTORY_DB}: {e}")
@@ -0,0 +1,186 @@
+"""
+Off-thread screenshot pipeline
+Screenshots are hashed and written on a thread pool while the test goes on
+"""
+
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+from qa_support import collectors, visual as _visual
+
+MAX_PENDING_BYTES = int(float(os.environ.get("QA_SCREENSHOT_QUEUE_MB", "64")) * 1024 * 1024)
+
+WRITER_THREADS = 2
+
+
+@dataclass
+class ScreenshotStats:
+    captured: int = 0
+    written: int = 0
+    unchanged: int = 0
+    linked: int = 0
+    bytes_written: int = 0
+    capture_ms: float = 0.0
+    write_ms: float = 0.0
+    blocked_ms: float = 0.0
+
+    def print_summary(self):
+        if not self.captured:
+            return
+        print(f"\nSCREENSHOTS: {self.captured} captured in {self.capture_ms / 1000:.1f}s  "
+              f"written {self.written} ({self.bytes_written / 1024 / 1024:.1f}MB, {self.write_ms / 1000:.1f}s off-thread)  "
+              f"unchanged {self.unchanged}  linked {self.linked}  waited on queue {self.blocked_ms:.0f}ms")
+
+
+def _sha256_of_file(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+class ScreenshotWriter:
+    """Writes screenshot bytes on a thread pool, deduplicated by content hash"""
+
+    def __init__(self, max_pending_bytes: int = MAX_PENDING_BYTES, threads: int = WRITER_THREADS):
+        self.max_pending_bytes = max_pending_bytes
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="screenshots")
+        self.pending_bytes = 0
+        self.pending = set()
+        self.room = threading.Condition()
+        self.by_hash: Dict[str, str] = {}
+        self.stats = ScreenshotStats()
+
+    def submit(self, path: Optional[str], data: bytes, compare: Optional[Tuple[str, Sequence]] = None):
+        """Queue data to be written to path, waiting while the queue is full
+
+        compare is a (baseline key, mask rectangles) pair to check the image
+        against once it is written. With path None the image is only compared.
+        """
+        start = time.perf_counter()
+        with self.room:
+            # An image larger than the cap is let through once the queue is empty
+            self.room.wait_for(lambda: self.pending_bytes == 0
+                               or self.pending_bytes + len(data) <= self.max_pending_bytes)
+            self.pending_bytes += len(data)
+            future = self.pool.submit(self._write, path, data, compare)
+            self.pending.add(future)
+        self.stats.blocked_ms += (time.perf_counter() - start) * 1000
+        future.add_done_callback(lambda f: self._release(f, len(data)))
+
+    def _release(self, future, size: int):
+        with self.room:
+            self.pending_bytes -= size
+            self.pending.discard(future)
+            self.room.notify_all()
+
+    def _write(self, path: Optional[str], data: bytes, compare: Optional[Tuple[str, Sequence]] = None):
+        if path is not None:
+            start = time.perf_counter()
+            self._save(path, data)
+            self._count(write_ms=(time.perf_counter() - start) * 1000)
+        if compare is not None:
+            try:
+                _visual.check(compare[0], data, compare[1])
+            except Exception as e:
+                print(f"⚠️  Could not compare screenshot with baseline {compare[0]}: {e}")
+
+    def _save(self, path: str, data: bytes):
+        digest = hashlib.sha256(data).hexdigest()
+        try:
+            if os.path.exists(path) and os.path.getsize(path) == len(data) and _sha256_of_file(path) == digest:
+                self._count(unchanged=1)
+                return
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            original = self.by_hash.get(digest)
+            if original and _sha256_of_file(original) == digest:
+                try:
+                    os.link(original, tmp)
+                    os.replace(tmp, path)
+                    self._count(linked=1)
+                    return
+                except OSError:
+                    pass
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+            self.by_hash.setdefault(digest, path)
+            self._count(written=1, bytes_written=len(data))
+        except OSError as e:
+            print(f"⚠️  Could not save screenshot {path}: {e}")
+
+    def _count(self, **deltas):
+        with self.room:
+            for name, value in deltas.items():
+                setattr(self.stats, name, getattr(self.stats, name) + value)
+
+    def flush(self):
+        """Wait until every queued screenshot is on disk"""
+        with self.room:
+            self.room.wait_for(lambda: not self.pending)
+
+
+writer = ScreenshotWriter()
+stats = writer.stats
+flush = writer.flush
+
+collectors.on_exit(flush, priority=20)
+
+
+def print_summary():
+    """Wait for pending writes, then print the pipeline's counters"""
+    flush()
+    stats.print_summary()
+
+
+def capture(page, path: str, visual: Optional[str] = None, **options) -> str:
+    """Take a screenshot of a sync_api page and save it to path off-thread; returns path
+
+    visual names the suite whose baseline for the page's route, viewport and
+    locale the screenshot is compared with when visual regression is enabled.
+    """
+    compare = _visual.page_key(page, visual) if visual and _visual.enabled() else None
+    start = time.perf_counter()
+    data = page.screenshot(**options)
+    stats.captured += 1
+    stats.capture_ms += (time.perf_counter() - start) * 1000
+    writer.submit(path, data, compare)
+    return path
+
+
+def grab(page, visual: Optional[str] = None, **options) -> bytes:
+    """Take a screenshot of a sync_api page without saving it; returns the PNG bytes
+
+    Queues the same visual comparison as capture(); submit the bytes to the
+    writer later to keep them.
+    """
+    compare = _visual.page_key(page, visual) if visual and _visual.enabled() else None
+    start = time.perf_counter()
+    data = page.screenshot(**options)
+    stats.captured += 1
+    stats.capture_ms += (time.perf_counter() - start) * 1000
+    if compare is not None:
+        writer.submit(None, data, compare)
+    return data
+
+
+async def capture_async(page, path: str, visual: Optional[str] = None, **options) -> str:
+    """Take a screenshot of an async_api page and save it to path off-thread
+
+    While the queue is full this blocks the event loop until the writers have
+    caught up.
+    """
+    compare = await _visual.page_key_async(page, visual) if visual and _visual.enabled() else None
+    start = time.perf_counter()
+    data = await page.screenshot(**options)
+    stats.captured += 1
+    stats.capture_ms += (time.perf_counter() - start) * 1000
+    writer.submit(path, data, compare)
+    return path
@@ -0,0 +1,210 @@
+"""
+Managed Next.js server for the QA suites
+Builds the app when its sources changed, starts it and warms every route
+"""
+
+import argparse
+import contextlib
+import hashlib
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+BUILD_DIR = ROOT_DIR / ".next"
+HASH_FILE = BUILD_DIR / "qa-build-hash"
+LOG_FILE = os.environ.get("QA_SERVER_LOG", "/tmp/piterpay-qa-server.log")
+
+# Inputs of the production build
+BUILD_INPUTS = ["src", "public", "package-lock.json", "next.config.ts", "tsconfig.json", "postcss.config.mjs"]
+
+STARTUP_TIMEOUT_S = 60
+WARM_UP_TIMEOUT_S = 60
+
+
+def build_hash() -> str:
+    """Hash of everything the production build depends on"""
+    digest = hashlib.sha256()
+    for name in BUILD_INPUTS:
+        root = ROOT_DIR / name
+        files = sorted(p for p in root.rglob("*") if p.is_file()) if root.is_dir() else [root]
+        for path in files:
+            if path.exists():
+                digest.update(str(path.relative_to(ROOT_DIR)).encode())
+                digest.update(path.read_bytes())
+    for key in sorted(k for k in os.environ if k.startswith("NEXT_PUBLIC_")):
+        digest.update(f"{key}={os.environ[key]}".encode())
+    return digest.hexdigest()
+
+
+def routes() -> List[str]:
+    """Every static route of the app (one per src/app/**/page.tsx)"""
+    app_dir = ROOT_DIR / "src" / "app"
+    out = []
+    for page in sorted(app_dir.rglob("page.tsx")):
+        segments = [s for s in page.parent.relative_to(app_dir).parts if not (s.startswith("(") and s.endswith(")"))]
+        if any(s.startswith("[") for s in segments):
+            continue
+        out.append("/" + "/".join(segments))
+    return out
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def ensure_build(force: bool = False) -> bool:
+    """Run `next build` unless .next already matches the sources; True when it built"""
+    current = build_hash()
+    if not force and (BUILD_DIR / "BUILD_ID").exists() and HASH_FILE.exists() \
+            and HASH_FILE.read_text().strip() == current:
+        print(f"📦 Reusing production build ({current[:12]})")
+        return False
+
+    print(f"📦 Building for production ({current[:12]})...")
+    start = time.time()
+    with open(LOG_FILE, "a", encoding="utf-8") as log:
+        result = subprocess.run(["npx", "next", "build"], cwd=ROOT_DIR, stdout=log, stderr=subprocess.STDOUT)
+    if result.returncode != 0:
+        raise RuntimeError(f"next build failed (exit {result.returncode}), see {LOG_FILE}")
+    HASH_FILE.write_text(current)
+    print(f"📦 Built in {time.time() - start:.0f}s")
+    return True
+
+
+def _get(url: str, timeout: float) -> Optional[int]:
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except (urllib.error.URLError, OSError):
+        return None
+
+
+class ManagedServer:
+    """`next start` on a free port, started from an up-to-date production build"""
+
+    def __init__(self, port: Optional[int] = None, host: str = "127.0.0.1"):
+        self.host = host
+        self.port = port or free_port()
+        self.process: Optional[subprocess.Popen] = None
+        self.warm_up_ms: Dict[str, float] = {}
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self, build: bool = True) -> str:
+        if build:
+            ensure_build()
+        log = open(LOG_FILE, "a", encoding="utf-8")
+        self.process = subprocess.Popen(
+            ["npx", "next", "start", "-p", str(self.port), "-H", self.host],
+            cwd=ROOT_DIR, stdout=log, stderr=subprocess.STDOUT,
+            # Its own process group, so stop() reaches the server npx starts too
+            start_new_session=True,
+        )
+        log.close()
+        self._wait_until_ready()
+        print(f"🚀 next start on {self.base_url}")
+        return self.base_url
+
+    def _wait_until_ready(self):
+        deadline = time.time() + STARTUP_TIMEOUT_S
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"next start exited with {self.process.returncode}, see {LOG_FILE}")
+            if _get(self.base_url, timeout=2) is not None:
+                return
+            time.sleep(0.2)
+        self.stop()
+        raise RuntimeError(f"next start did not answer within {STARTUP_TIMEOUT_S}s, see {LOG_FILE}")
+
+    def warm_up(self, paths: Optional[List[str]] = None) -> Dict[str, float]:
+        """Request every route once; returns ms per route"""
+        def fetch(path: str):
+            start = time.perf_counter()
+            status = _get(f"{self.base_url}{path}", timeout=WARM_UP_TIMEOUT_S)
+            return path, status, (time.perf_counter() - start) * 1000
+
+        paths = paths if paths is not None else routes()
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            for path, status, ms in pool.map(fetch, paths):
+                self.warm_up_ms[path] = ms
+                if status is None or status >= 500:
+                    print(f"⚠️  Warm-up {path}: {status or 'no response'}")
+        print(f"🔥 Warmed up {len(paths)} routes (slowest {max(self.warm_up_ms.values(), default=0):.0f}ms)")
+        return self.warm_up_ms
+
+    def _signal(self, sig: int):
+        try:
+            os.killpg(self.process.pid, sig)
+        except ProcessLookupError:
+            pass
+
+    def stop(self):
+        """Stop npx and the next start it runs (even when npx already exited)"""
+        if self.process is not None:
+            self._signal(signal.SIGTERM)
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._signal(signal.SIGKILL)
+                self.process.wait()
+        self.process = None
+
+
+@contextlib.contextmanager
+def managed_server(port: Optional[int] = None, warm_up: bool = True) -> Iterator[str]:
+    """Build, start and warm up the app; yields its base URL and exports it as QA_BASE_URL
+
+    Suites read QA_BASE_URL when they are imported, so import them inside the block.
+    """
+    server = ManagedServer(port)
+    previous = os.environ.get("QA_BASE_URL")
+    try:
+        os.environ["QA_BASE_URL"] = server.start()
+        if warm_up:
+            server.warm_up()
+        yield server.base_url
+    finally:
+        server.stop()
+        if previous is None:
+            os.environ.pop("QA_BASE_URL", None)
+        else:
+            os.environ["QA_BASE_URL"] = previous
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run a command against a freshly built, warmed-up production server",
+        usage="python -m qa_support.server [--port N] [--rebuild] -- COMMAND...",
+    )
+    parser.add_argument("--port", type=int, default=None, help="Port for next start (default: a free one)")
+    parser.add_argument("--rebuild", action="store_true", help="Build even if .next matches the sources")
+    parser.add_argument("command", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+
+    if args.rebuild:
+        ensure_build(force=True)
+    with managed_server(args.port) as base_url:
+        if not command:
+            print(f"Serving on {base_url} - Ctrl+C to stop")
+            with contextlib.suppress(KeyboardInterrupt):
+                while True:
+                    time.sleep(1)
+            sys.exit(0)
+        sys.exit(subprocess.run(command, env={**os.environ, "QA_BASE_URL": base_url}).returncode)
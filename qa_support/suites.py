@@ -0,0 +1,167 @@
+"""
+Adapters that turn the six Python QA suites into independent tasks
+A runner executes one unit of a suite in a fresh context and hands back its counters
+"""
+
+import importlib
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from qa_support import collectors, parallel, screenshots, visual, vitals
+from qa_support.results import Results
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+E2E_DIR = ROOT_DIR / "tests" / "e2e"
+
+for _path in (ROOT_DIR, E2E_DIR):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+SUITES = ["deep", "comprehensive", "journey", "e2e-comprehensive", "interaction", "e2e"]
+
+# piter_pay_e2e checks that are not tied to a single route
+E2E_SITE_CHECKS = ["navigation", "rtl_support", "ui_components", "responsive_viewport"]
+
+Task = Tuple[str, str]
+
+
+def _results_module_tasks(suite: str, module_name: str, list_names: List[str]) -> List[Task]:
+    module = importlib.import_module(module_name)
+    return [(suite, test.__name__) for name in list_names for test in getattr(module, name)]
+
+
+def collect_tasks(suites: List[str] = None) -> List[Task]:
+    """List every (suite, unit) task for the requested suites, in suite order"""
+    suites = suites or SUITES
+    tasks: List[Task] = []
+    for suite in suites:
+        if suite == "deep":
+            tasks += _results_module_tasks(suite, "qa_deep_test", ["PAGE_TESTS", "CROSS_PAGE_TESTS"])
+        elif suite == "comprehensive":
+            tasks += _results_module_tasks(suite, "qa_comprehensive_test", ["ALL_TESTS"])
+        elif suite == "journey":
+            tasks += _results_module_tasks(suite, "qa_user_journey_test", ["ALL_JOURNEYS"])
+        elif suite == "e2e-comprehensive":
+            from comprehensive_qa_test import PAGES_TO_TEST
+            tasks += [(suite, url) for url, _ in PAGES_TO_TEST]
+        elif suite == "interaction":
+            from interaction_tests import InteractionTester
+            tasks += [(suite, method) for method in InteractionTester.TEST_METHODS]
+        elif suite == "e2e":
+            from piter_pay_e2e import ROUTES
+            tasks += [(suite, unit) for unit in ["pwa_manifest"] + [r["path"] for r in ROUTES] + E2E_SITE_CHECKS]
+        else:
+            raise ValueError(f"Unknown suite: {suite} (expected one of {', '.join(SUITES)})")
+    return tasks
+
+
+# ============================================================
+# Per-suite runners
+# ============================================================
+RESULTS_MODULES = {
+    "deep": "qa_deep_test",
+    "comprehensive": "qa_comprehensive_test",
+    "journey": "qa_user_journey_test",
+}
+
+
+def _run_results_module(suite: str, unit: str) -> Dict[str, Any]:
+    return parallel.run_isolated((RESULTS_MODULES[suite], unit))["results"]
+
+
+def _run_e2e_comprehensive(suite: str, unit: str) -> Dict[str, Any]:
+    from comprehensive_qa_test import RESOURCE_PROFILE, ComprehensiveQATester, PAGES_TO_TEST
+
+    name = dict(PAGES_TO_TEST)[unit]
+    tester = ComprehensiveQATester()
+    context = parallel.new_context(RESOURCE_PROFILE)
+    try:
+        tester.page = context.new_page()
+        tester.setup_console_listener()
+        report = tester.test_page(unit, name)
+    finally:
+        vitals.collect_pages(context)
+        context.close()
+
+    for issue in report.issues:
+        tester.results.add_fail(f"{name}: Load", issue, route=unit)
+    if report.console_errors:
+        tester.results.add_warning(f"{name}: Console errors", "; ".join(report.console_errors[:5]), route=unit)
+    return tester.results.export()
+
+
+def _run_interaction(suite: str, unit: str) -> Dict[str, Any]:
+    from interaction_tests import RESOURCE_PROFILE, InteractionTester
+
+    tester = InteractionTester()
+    context = parallel.new_context(RESOURCE_PROFILE)
+    try:
+        getattr(tester, unit)(context.new_page())
+    except Exception as e:
+        tester.log_result(f"{unit}: Worker", False, str(e))
+    finally:
+        vitals.collect_pages(context)
+        context.close()
+    return tester.results.export()
+
+
+def _run_e2e(suite: str, unit: str) -> Dict[str, Any]:
+    import piter_pay_e2e as e2e
+
+    results = Results(suite)
+    context = parallel.new_context(e2e.RESOURCE_PROFILE)
+    try:
+        page = context.new_page()
+        if unit == "pwa_manifest":
+            e2e.test_pwa_manifest(page, results)
+        elif unit in E2E_SITE_CHECKS:
+            getattr(e2e, f"test_{unit}")(page, results)
+        else:
+            e2e.test_route(page, next(r for r in e2e.ROUTES if r["path"] == unit), results)
+    except Exception as e:
+        results.add_fail(f"{unit}: Worker", str(e))
+    finally:
+        vitals.collect_pages(context)
+        context.close()
+    return results.export()
+
+
+RUNNERS = {
+    "deep": _run_results_module,
+    "comprehensive": _run_results_module,
+    "journey": _run_results_module,
+    "e2e-comprehensive": _run_e2e_comprehensive,
+    "interaction": _run_interaction,
+    "e2e": _run_e2e,
+}
+
+
+def run_task(task: Task) -> Dict[str, Any]:
+    """Executor task: run one suite unit and return the counters of its results"""
+    suite, unit = task
+    start = time.time()
+    marks = collectors.snapshot()
+    try:
+        exported = RUNNERS[suite](suite, unit)
+    except Exception as e:
+        worker = Results(suite)
+        worker.add_fail(f"{unit}: Worker", str(e))
+        exported = worker.export()
+    # run_isolated already turns failed comparisons into failures of the test
+    if visual.enabled() and suite not in RESULTS_MODULES:
+        screenshots.flush()
+        comparisons = Results(suite)
+        for c in visual.results.samples[marks["visual"]:]:
+            if not c.passed:
+                comparisons.add_fail(f"{unit}: Visual {c.key}", c.details)
+        comparisons.merge(exported)
+        exported = comparisons.export()
+    return {
+        "suite": suite,
+        "unit": unit,
+        "duration_ms": (time.time() - start) * 1000,
+        "results": exported,
+        **collectors.since(marks),
+    }
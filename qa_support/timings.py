@@ -0,0 +1,148 @@
+"""
+Navigation timing breakdown
+Splits the load of a document into server, bundle, evaluation and data phases
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from qa_support.collectors import SampleCollector, register
+
+# Times are ms; milestones are relative to navigation start
+BREAKDOWN_JS = """
+() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    if (!nav) return null;
+    const resources = performance.getEntriesByType('resource');
+    const scripts = resources.filter(r => r.initiatorType === 'script' || /\\.m?js(\\?|$)/.test(r.name));
+    const supabase = resources
+        .filter(r => /\\/(rest|auth)\\/v1\\//.test(r.name))
+        .sort((a, b) => a.responseEnd - b.responseEnd)[0];
+    const hydration = window.__qaHydration;
+    const hydratedAt = hydration ? (hydration.hydratedAt ?? hydration.routerAt) : null;
+    const scriptsEnd = scripts.length ? Math.max(...scripts.map(r => r.responseEnd)) : null;
+    return {
+        dns: nav.domainLookupEnd - nav.domainLookupStart,
+        connect: nav.connectEnd - nav.connectStart,
+        ttfb: nav.responseStart - nav.requestStart,
+        html: nav.responseEnd - nav.responseStart,
+        bundle: scriptsEnd !== null ? Math.max(0, scriptsEnd - nav.responseEnd) : null,
+        evaluation: scriptsEnd !== null && hydratedAt !== null ? Math.max(0, hydratedAt - scriptsEnd) : null,
+        domContentLoaded: nav.domContentLoadedEventEnd || null,
+        hydration: hydratedAt,
+        supabase: supabase ? supabase.responseEnd : null,
+        supabaseWait: supabase ? supabase.responseEnd - supabase.startTime : null,
+        scripts: scripts.length,
+    };
+}
+"""
+
+# Phases slowest() chooses from, with what they point at
+CAUSES = {
+    "ttfb_ms": "server",
+    "bundle_ms": "bundle",
+    "evaluation_ms": "evaluation",
+    "supabase_wait_ms": "data",
+}
+
+
+@dataclass
+class TimingBreakdown:
+    """Where the load time of one document went"""
+    route: str
+    dns_ms: float = 0.0
+    connect_ms: float = 0.0
+    ttfb_ms: float = 0.0
+    html_ms: float = 0.0
+    bundle_ms: Optional[float] = None
+    evaluation_ms: Optional[float] = None
+    dom_content_loaded_ms: Optional[float] = None
+    hydration_ms: Optional[float] = None
+    supabase_ms: Optional[float] = None
+    supabase_wait_ms: Optional[float] = None
+    scripts: int = 0
+
+    def slowest(self) -> Optional[str]:
+        """server, bundle, evaluation or data: the cause that took longest"""
+        phases = {cause: getattr(self, phase) for phase, cause in CAUSES.items() if getattr(self, phase) is not None}
+        return max(phases, key=phases.get) if phases else None
+
+    def line(self) -> str:
+        def ms(value):
+            return f"{value:.0f}ms" if value is not None else "-"
+
+        return (f"DNS+connect {ms(self.dns_ms + self.connect_ms)}, TTFB {ms(self.ttfb_ms)}, "
+                f"HTML {ms(self.html_ms)}, bundle {ms(self.bundle_ms)}, evaluation {ms(self.evaluation_ms)}, "
+                f"DCL {ms(self.dom_content_loaded_ms)}, hydrated {ms(self.hydration_ms)}, "
+                f"first Supabase response {ms(self.supabase_ms)}")
+
+
+class TimingMetrics(SampleCollector[TimingBreakdown]):
+    """Timing breakdowns of this process, grouped by route"""
+    sample_type = TimingBreakdown
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Mean of every phase per route, and the cause that took longest on average"""
+        out: Dict[str, Dict[str, Any]] = {}
+        per_route: Dict[str, List[TimingBreakdown]] = {}
+        for s in self.samples:
+            per_route.setdefault(s.route, []).append(s)
+        for route, samples in per_route.items():
+            mean = TimingBreakdown(route)
+            for name in asdict(mean):
+                if name in ("route", "scripts"):
+                    continue
+                values = [getattr(s, name) for s in samples if getattr(s, name) is not None]
+                setattr(mean, name, sum(values) / len(values) if values else None)
+            out[route] = {"count": len(samples), **{k: v for k, v in asdict(mean).items() if k != "route"},
+                          "slowest": mean.slowest()}
+        return out
+
+    def print_summary(self):
+        if not self.samples:
+            return
+
+        def ms(value):
+            return f"{value:6.0f}ms" if value is not None else "     -  "
+
+        print("\nLOAD BREAKDOWN (mean):")
+        for route, s in sorted(self.summary().items()):
+            print(f"  {route:20} {s['count']:3d} loads  connect {ms(s['dns_ms'] + s['connect_ms'])}  "
+                  f"TTFB {ms(s['ttfb_ms'])}  HTML {ms(s['html_ms'])}  bundle {ms(s['bundle_ms'])}  "
+                  f"eval {ms(s['evaluation_ms'])}  DCL {ms(s['dom_content_loaded_ms'])}  "
+                  f"hydrated {ms(s['hydration_ms'])}  Supabase {ms(s['supabase_ms'])}  slowest: {s['slowest'] or '-'}")
+
+
+metrics = register("timings", TimingMetrics())
+
+
+def _record(page_url: str, timing: Optional[Dict[str, Any]]) -> Optional[TimingBreakdown]:
+    if not timing:
+        return None
+    return metrics.record(TimingBreakdown(
+        route=urlparse(page_url).path or "/",
+        dns_ms=timing["dns"],
+        connect_ms=timing["connect"],
+        ttfb_ms=timing["ttfb"],
+        html_ms=timing["html"],
+        bundle_ms=timing["bundle"],
+        evaluation_ms=timing["evaluation"],
+        dom_content_loaded_ms=timing["domContentLoaded"],
+        hydration_ms=timing["hydration"],
+        supabase_ms=timing["supabase"],
+        supabase_wait_ms=timing["supabaseWait"],
+        scripts=timing["scripts"],
+    ))
+
+
+def breakdown(page) -> Optional[TimingBreakdown]:
+    """Record the timing breakdown of a sync_api page's current document
+
+    Call it once the page has settled, so its first data requests are in.
+    """
+    return _record(page.url, page.evaluate(BREAKDOWN_JS))
+
+
+async def breakdown_async(page) -> Optional[TimingBreakdown]:
+    return _record(page.url, await page.evaluate(BREAKDOWN_JS))
@@ -0,0 +1,254 @@
+"""
+Visual regression
+Compares screenshots with stored baselines per suite, route, viewport and locale (QA_VISUAL)
+"""
+
+import io
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:  # optional: checked when a comparison runs
+    np = Image = None
+
+from qa_support.collectors import SampleCollector, register
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+BASELINE_DIR = Path(os.environ.get("QA_BASELINE_DIR", ROOT_DIR / "tests" / "visual-baselines"))
+DIFF_DIR = Path(os.environ.get("QA_VISUAL_DIFF_DIR", "/tmp/piterpay-visual-diffs"))
+
+# Channel difference (0-255) below which a pixel counts as unchanged
+PIXEL_THRESHOLD = 24
+
+# Share of (unmasked) pixels that may change before a comparison fails
+MAX_DIFF_RATIO = 0.001
+
+# Elements whose content changes between runs; their boxes are masked out
+MASK_SELECTORS = ["[data-visual-mask]", "time", "video", "canvas"]
+
+Rect = Tuple[int, int, int, int]
+
+MASK_RECTS_JS = """
+(selectors) => selectors
+    .flatMap(selector => Array.from(document.querySelectorAll(selector)))
+    .map(el => el.getBoundingClientRect())
+    .filter(r => r.width > 0 && r.height > 0)
+    .map(r => [Math.floor(r.left + scrollX), Math.floor(r.top + scrollY), Math.ceil(r.width), Math.ceil(r.height)])
+"""
+
+
+def enabled() -> bool:
+    return os.environ.get("QA_VISUAL", "") == "1"
+
+
+def updating() -> bool:
+    return os.environ.get("QA_VISUAL_UPDATE", "") == "1"
+
+
+# ============================================================
+# Pixel math
+# ============================================================
+def decode(png: bytes) -> "np.ndarray":
+    """PNG bytes as an (height, width, 3) uint8 array"""
+    if np is None or Image is None:
+        raise RuntimeError("Visual regression needs numpy and Pillow: pip install numpy pillow")
+    return np.asarray(Image.open(io.BytesIO(png)).convert("RGB"))
+
+
+@dataclass
+class Diff:
+    score: float
+    changed_pixels: int
+    size_changed: bool
+    delta: "np.ndarray" = field(repr=False)
+
+
+def _pad(image: "np.ndarray", height: int, width: int) -> "np.ndarray":
+    if image.shape[:2] == (height, width):
+        return image
+    out = np.zeros((height, width, 3), dtype=np.uint8)
+    out[:image.shape[0], :image.shape[1]] = image
+    return out
+
+
+def compare(actual: "np.ndarray", baseline: "np.ndarray", masks: Sequence[Rect] = (),
+            threshold: int = PIXEL_THRESHOLD) -> Diff:
+    """Changed-pixel share of actual against baseline, ignoring masked rectangles
+
+    Images of different sizes are compared on the union of both; the area
+    only one of them covers counts as changed.
+    """
+    size_changed = actual.shape != baseline.shape
+    height, width = max(actual.shape[0], baseline.shape[0]), max(actual.shape[1], baseline.shape[1])
+    a, b = _pad(actual, height, width), _pad(baseline, height, width)
+
+    # |a - b| without leaving uint8, then the largest channel - reducing the
+    # channels one by one is an order of magnitude faster than max(axis=2)
+    delta = np.maximum(a, b)
+    delta -= np.minimum(a, b)
+    delta = np.maximum(np.maximum(delta[..., 0], delta[..., 1]), delta[..., 2])
+    if size_changed:
+        common_height, common_width = min(actual.shape[0], baseline.shape[0]), min(actual.shape[1], baseline.shape[1])
+        delta[common_height:, :] = 255
+        delta[:, common_width:] = 255
+
+    total = height * width
+    if masks:
+        counted = np.ones((height, width), dtype=bool)
+        for x, y, w, h in masks:
+            counted[max(y, 0):max(y + h, 0), max(x, 0):max(x + w, 0)] = False
+        delta[~counted] = 0
+        total = int(np.count_nonzero(counted))
+
+    changed = int(np.count_nonzero(delta > threshold))
+    return Diff(changed / total if total else 0.0, changed, size_changed, delta)
+
+
+def heatmap(baseline: "np.ndarray", diff: Diff, threshold: int = PIXEL_THRESHOLD) -> "np.ndarray":
+    """Baseline in dimmed grey with changed pixels in red (brighter = larger change)"""
+    height, width = diff.delta.shape
+    grey = _pad(baseline, height, width).mean(axis=2, dtype=np.float32) * 0.3
+    out = np.repeat(grey[:, :, None], 3, axis=2)
+    changed = diff.delta > threshold
+    out[changed, 0] = 128 + diff.delta[changed] / 2
+    out[changed, 1:] = 0
+    return out.astype(np.uint8)
+
+
+# ============================================================
+# Baselines
+# ============================================================
+def _slug(route: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_-]+", "_", route.strip("/")) or "root"
+
+
+def baseline_key(suite: str, route: str, width: int, height: int, locale: str) -> str:
+    return f"{suite}/{_slug(route)}/{width}x{height}/{locale}"
+
+
+@dataclass
+class VisualResult:
+    key: str
+    status: str  # pass, fail, new or updated
+    score: float = 0.0
+    changed_pixels: int = 0
+    size_changed: bool = False
+    heatmap: Optional[str] = None
+
+    @property
+    def passed(self) -> bool:
+        return self.status != "fail"
+
+    @property
+    def details(self) -> str:
+        size = ", size changed" if self.size_changed else ""
+        return f"{self.score:.2%} of pixels changed{size} (heatmap: {self.heatmap})"
+
+
+class BaselineStore:
+    """Baseline PNGs plus their decoded .npy copies"""
+
+    def __init__(self, root: Path = BASELINE_DIR):
+        self.root = root
+
+    def png_path(self, key: str) -> Path:
+        return self.root / f"{key}.png"
+
+    def _npy_path(self, key: str) -> Path:
+        return self.root / f"{key}.npy"
+
+    def load(self, key: str) -> Optional["np.ndarray"]:
+        npy, png = self._npy_path(key), self.png_path(key)
+        if npy.exists() and png.exists() and npy.stat().st_mtime >= png.stat().st_mtime:
+            return np.load(npy)
+        if png.exists():
+            image = decode(png.read_bytes())
+            np.save(npy, image)
+            return image
+        return None
+
+    def save(self, key: str, png: bytes, image: "np.ndarray"):
+        path = self.png_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(png)
+        np.save(self._npy_path(key), image)
+
+
+def check(key: str, png: bytes, masks: Sequence[Rect] = (), store: Optional[BaselineStore] = None,
+          max_ratio: float = MAX_DIFF_RATIO) -> VisualResult:
+    """Compare a capture with its baseline (storing it when there is none)"""
+    store = store or BaselineStore()
+    actual = decode(png)
+    baseline = None if updating() else store.load(key)
+    if baseline is None:
+        existed = store.png_path(key).exists()
+        store.save(key, png, actual)
+        return results.record(VisualResult(key, "updated" if existed else "new"))
+
+    diff = compare(actual, baseline, masks)
+    result = VisualResult(key, "pass" if diff.score <= max_ratio and not diff.size_changed else "fail",
+                          diff.score, diff.changed_pixels, diff.size_changed)
+    if not result.passed:
+        path = DIFF_DIR / f"{key}.png"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        Image.fromarray(heatmap(baseline, diff)).save(path)
+        result.heatmap = str(path)
+    return results.record(result)
+
+
+# ============================================================
+# Results
+# ============================================================
+class VisualResults(SampleCollector[VisualResult]):
+    """Every comparison of this process (recorded from the screenshot writer threads)"""
+    sample_type = VisualResult
+
+    def failures(self) -> List[VisualResult]:
+        return [r for r in self.samples if not r.passed]
+
+    def summary(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for r in self.samples:
+            counts[r.status] = counts.get(r.status, 0) + 1
+        return {"counts": counts, "failures": [asdict(r) for r in self.failures()]}
+
+    def print_summary(self):
+        if not self.samples:
+            return
+        counts = self.summary()["counts"]
+        print("\nVISUAL: " + "  ".join(f"{status} {n}" for status, n in sorted(counts.items())))
+        for r in self.failures():
+            print(f"  ❌ {r.key}: {r.details}")
+
+
+results = register("visual", VisualResults())
+
+
+# ============================================================
+# Page helpers
+# ============================================================
+def page_key(page, suite: str, route: Optional[str] = None) -> Tuple[str, List[Rect]]:
+    """Baseline key of a sync_api page in its current state, plus its mask rectangles"""
+    viewport = page.viewport_size or {"width": 0, "height": 0}
+    locale = page.evaluate("navigator.language")
+    masks = [tuple(r) for r in page.evaluate(MASK_RECTS_JS, MASK_SELECTORS)]
+    return baseline_key(suite, route or urlparse(page.url).path, viewport["width"], viewport["height"], locale), masks
+
+
+async def page_key_async(page, suite: str, route: Optional[str] = None) -> Tuple[str, List[Rect]]:
+    viewport = page.viewport_size or {"width": 0, "height": 0}
+    locale = await page.evaluate("navigator.language")
+    masks = [tuple(r) for r in await page.evaluate(MASK_RECTS_JS, MASK_SELECTORS)]
+    return baseline_key(suite, route or urlparse(page.url).path, viewport["width"], viewport["height"], locale), masks
+
+
+def compare_all(captures: Iterable[Tuple[str, bytes, Sequence[Rect]]]) -> List[VisualResult]:
+    """Check a batch of (key, png, masks) captures"""
+    store = BaselineStore()
+    return [check(key, png, masks, store) for key, png, masks in captures]
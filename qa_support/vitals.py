@@ -0,0 +1,288 @@
+"""
+Core Web Vitals
+LCP, CLS, FCP, TTFB, INP and long tasks of every document the suites load
+"""
+
+import json
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from qa_support.collectors import SampleCollector, register
+
+BINDING = "__qaVitalsReport"
+
+PROFILE_PLACEHOLDER = "__QA_PROFILE__"
+
+# Times are performance.now() values, i.e. ms since navigation start. A soft
+# navigation (client router) reports the route left and starts a new sample
+# for the route entered, with entries from before it left out
+OBSERVER_JS = """
+(() => {
+    if (window.top !== window || window.__qaVitals) return;
+    const fresh = () => ({
+        route: location.pathname, viewport: `${innerWidth}x${innerHeight}`,
+        lcp: null, lcpElement: null,
+        fcp: null, ttfb: null, cls: 0, inp: null, interactions: 0, longTasks: 0, longTaskMs: 0, tbt: 0,
+        reported: false,
+    });
+    const state = window.__qaVitals = {...fresh(), profile: __QA_PROFILE__, navigation: 'hard', start: 0};
+    performance.setResourceTimingBufferSize(1000);
+    const observe = (type, callback, options = {}) => {
+        try {
+            new PerformanceObserver(list => list.getEntries().forEach(callback))
+                .observe({type, buffered: true, ...options});
+        } catch (e) {}  // entry type not supported by this browser
+    };
+
+    observe('navigation', e => { state.ttfb = e.responseStart; });
+    observe('paint', e => { if (e.name === 'first-contentful-paint') state.fcp = e.startTime; });
+    observe('largest-contentful-paint', e => {
+        if (state.navigation !== 'hard') return;
+        state.lcp = e.startTime;
+        state.lcpElement = e.element ? e.element.tagName.toLowerCase() : null;
+    });
+
+    let session = 0, first = 0, last = 0;
+    observe('layout-shift', e => {
+        if (e.hadRecentInput || e.startTime < state.start) return;
+        if (session && e.startTime - last < 1000 && e.startTime - first < 5000) {
+            session += e.value;
+        } else {
+            session = e.value;
+            first = e.startTime;
+        }
+        last = e.startTime;
+        state.cls = Math.max(state.cls, session);
+    });
+
+    // Events of one interaction (pointerdown, pointerup, click) share an interactionId
+    const interactions = new Set();
+    observe('event', e => {
+        if (!e.interactionId || e.startTime < state.start) return;
+        interactions.add(e.interactionId);
+        state.interactions = interactions.size;
+        state.inp = Math.max(state.inp || 0, e.duration);
+    }, {durationThreshold: 16});
+
+    observe('longtask', e => {
+        if (e.startTime < state.start) return;
+        state.longTasks += 1;
+        state.longTaskMs += e.duration;
+        state.tbt += Math.max(0, e.duration - 50);
+    });
+
+    // Sizes are decoded bytes: the asset cache serves bodies decoded, so encoded sizes
+    // would differ between cached and downloaded chunks. The document counts as a request
+    window.__qaVitalsSnapshot = () => {
+        const hard = state.navigation === 'hard';
+        const resources = performance.getEntriesByType('resource').filter(r => r.startTime >= state.start);
+        const scripts = resources.filter(r => r.initiatorType === 'script' || /\.m?js(\?|$)/.test(r.name));
+        const hydration = window.__qaHydration;
+        return {
+            ...state,
+            requests: resources.length + (hard ? 1 : 0),
+            jsBytes: scripts.reduce((total, r) => total + (r.decodedBodySize || r.encodedBodySize || 0), 0),
+            hydration: hard && hydration ? (hydration.hydratedAt ?? hydration.routerAt) : null,
+        };
+    };
+
+    const onRoute = () => {
+        if (location.pathname === state.route) return;
+        if (!state.reported && window.__qaVitalsReport) window.__qaVitalsReport(window.__qaVitalsSnapshot());
+        Object.assign(state, fresh(), {navigation: 'soft', start: performance.now()});
+        session = first = last = 0;
+        interactions.clear();
+    };
+    for (const method of ['pushState', 'replaceState']) {
+        const original = history[method];
+        history[method] = function (...args) {
+            const result = original.apply(this, args);
+            onRoute();
+            return result;
+        };
+    }
+    addEventListener('popstate', onRoute);
+
+    addEventListener('pagehide', () => {
+        if (state.reported || !window.__qaVitalsReport) return;
+        state.reported = true;
+        window.__qaVitalsReport(window.__qaVitalsSnapshot());
+    });
+})();
+"""
+
+# Takes the current document's vitals, once
+COLLECT_JS = """
+() => {
+    const state = window.__qaVitals;
+    if (!state || state.reported) return null;
+    state.reported = true;
+    return window.__qaVitalsSnapshot();
+}
+"""
+
+# (good up to, poor above) per metric, from web.dev
+THRESHOLDS = {
+    "lcp_ms": (2500, 4000),
+    "cls": (0.1, 0.25),
+    "fcp_ms": (1800, 3000),
+    "ttfb_ms": (800, 1800),
+    "inp_ms": (200, 500),
+}
+
+
+def rate(metric: str, value: Optional[float]) -> Optional[str]:
+    """good, needs-improvement or poor"""
+    if value is None or metric not in THRESHOLDS:
+        return None
+    good, poor = THRESHOLDS[metric]
+    return "good" if value <= good else "poor" if value > poor else "needs-improvement"
+
+
+def p75(values: List[float]) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(len(ordered) * 0.75) - 1)]
+
+
+@dataclass
+class VitalsSample:
+    """Web vitals of one document"""
+    route: str
+    viewport: str = ""
+    profile: str = "full"
+    navigation: str = "hard"  # soft: a route entered through the client router, without LCP/FCP/TTFB
+    lcp_ms: Optional[float] = None
+    cls: float = 0.0
+    fcp_ms: Optional[float] = None
+    ttfb_ms: Optional[float] = None
+    inp_ms: Optional[float] = None
+    interactions: int = 0
+    long_tasks: int = 0
+    long_task_ms: float = 0.0
+    tbt_ms: float = 0.0
+    lcp_element: Optional[str] = None
+    requests: int = 0
+    js_bytes: int = 0
+    hydration_ms: Optional[float] = None
+
+    def ratings(self) -> Dict[str, Optional[str]]:
+        return {metric: rate(metric, getattr(self, metric)) for metric in THRESHOLDS}
+
+
+class VitalsMetrics(SampleCollector[VitalsSample]):
+    """Web vitals of every document loaded in this process, grouped by route"""
+    sample_type = VitalsSample
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """75th percentile of every metric per route, with its rating"""
+        per_route: Dict[str, List[VitalsSample]] = {}
+        for s in self.samples:
+            per_route.setdefault(s.route, []).append(s)
+        out: Dict[str, Dict[str, Any]] = {}
+        for route, samples in per_route.items():
+            entry: Dict[str, Any] = {"count": len(samples)}
+            for metric in ("lcp_ms", "cls", "fcp_ms", "ttfb_ms", "inp_ms", "long_tasks", "tbt_ms"):
+                entry[metric] = p75([getattr(s, metric) for s in samples if getattr(s, metric) is not None])
+            entry["ratings"] = {metric: rate(metric, entry[metric]) for metric in THRESHOLDS}
+            out[route] = entry
+        return out
+
+    def print_summary(self):
+        if not self.samples:
+            return
+
+        def ms(value):
+            return f"{value:6.0f}ms" if value is not None else "     -  "
+
+        print("\nWEB VITALS (p75):")
+        for route, s in sorted(self.summary().items()):
+            poor = [metric for metric, rating in s["ratings"].items() if rating == "poor"]
+            print(f"  {route:20} {s['count']:3d} loads  LCP {ms(s['lcp_ms'])}  CLS {s['cls']:.3f}  "
+                  f"FCP {ms(s['fcp_ms'])}  TTFB {ms(s['ttfb_ms'])}  INP {ms(s['inp_ms'])}  "
+                  f"TBT {ms(s['tbt_ms'])}" + (f"  poor: {', '.join(poor)}" if poor else ""))
+
+
+metrics = register("vitals", VitalsMetrics())
+
+
+def _record(state: Optional[Dict[str, Any]]) -> Optional[VitalsSample]:
+    if not state:
+        return None
+    return metrics.record(VitalsSample(
+        route=state["route"] or "/",
+        viewport=state["viewport"],
+        profile=state["profile"],
+        navigation=state["navigation"],
+        lcp_ms=state["lcp"],
+        cls=state["cls"],
+        fcp_ms=state["fcp"],
+        ttfb_ms=state["ttfb"],
+        inp_ms=state["inp"],
+        interactions=state["interactions"],
+        long_tasks=state["longTasks"],
+        long_task_ms=state["longTaskMs"],
+        tbt_ms=state["tbt"],
+        lcp_element=state["lcpElement"],
+        requests=state["requests"],
+        js_bytes=state["jsBytes"],
+        hydration_ms=state["hydration"],
+    ))
+
+
+def _on_report(source, state):
+    _record(state)
+
+
+def _script(profile: str) -> str:
+    return OBSERVER_JS.replace(PROFILE_PLACEHOLDER, json.dumps(profile))
+
+
+def install(context, profile: str = "full"):
+    """Measure web vitals on every page of a sync_api context
+
+    profile is the resource profile the context loads pages with.
+    """
+    context.expose_binding(BINDING, _on_report)
+    context.add_init_script(_script(profile))
+
+
+async def install_async(context, profile: str = "full"):
+    """Measure web vitals on every page of an async_api context"""
+    await context.expose_binding(BINDING, _on_report)
+    await context.add_init_script(_script(profile))
+
+
+def collect(page) -> Optional[VitalsSample]:
+    """Record the vitals of the page's current document so far
+
+    None when they were already recorded (or the page has no probe). Call it
+    once the checks that interact with the page are done.
+    """
+    try:
+        return _record(page.evaluate(COLLECT_JS))
+    except Exception:
+        return None
+
+
+async def collect_async(page) -> Optional[VitalsSample]:
+    try:
+        return _record(await page.evaluate(COLLECT_JS))
+    except Exception:
+        return None
+
+
+def collect_pages(context):
+    """Record the vitals of every open page of a sync_api context, before it is closed"""
+    for page in context.pages:
+        if not page.is_closed():
+            collect(page)
+
+
+async def collect_pages_async(context):
+    """Record the vitals of every open page of an async_api context, before it is closed"""
+    for page in context.pages:
+        if not page.is_closed():
+            await collect_async(page)
@@ -0,0 +1,279 @@
+"""
+Condition-based waits for the QA suites
+Waits that return as soon as the page is ready, and report instead of raising on timeout
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from playwright.sync_api import Error as PlaywrightError
+
+from qa_support.collectors import SampleCollector, register
+from qa_support.network import tracker_for
+
+# Per-condition timeouts (ms)
+DEFAULT_TIMEOUTS = {
+    "hydration": 10000,
+    "count": 5000,
+    "animation": 2000,
+    "network_quiet": 5000,
+    "settled": 10000,
+    "url": 10000,
+}
+
+# How long the network has to stay idle to count as quiet (ms)
+NETWORK_QUIET_MS = 250
+
+# Idle time that counts as settled after a navigation (ms). Long enough for
+# effects that start fetching right after hydration to show up.
+SETTLE_GRACE_MS = 100
+
+# How often the request tracker is checked while waiting (ms)
+POLL_MS = 20
+
+# The hydration probe (qa_support.hydration) sees React's first commit directly.
+# Without it: Next.js exposes its router on window.next once the app router has
+# mounted, and React marks <html> with its fiber key once the document is hydrated
+HYDRATION_JS = """
+() => {
+    if (document.readyState === 'loading') return false;
+    if (window.__qaHydration && window.__qaHydration.hydratedAt !== null) return true;
+    if (window.next && window.next.router) return true;
+    return Object.keys(document.documentElement).some(key => key.startsWith('__reactFiber$'));
+}
+"""
+
+COUNT_CHANGED_JS = """
+({selector, previous}) => document.querySelectorAll(selector).length !== previous
+"""
+
+COUNT_AT_LEAST_JS = """
+({selector, atLeast}) => document.querySelectorAll(selector).length >= atLeast
+"""
+
+# Two frames let a class change start its transition before we look for it
+ANIMATIONS_JS = """
+async ({selector, timeoutMs}) => {
+    const frame = () => new Promise(resolve => requestAnimationFrame(resolve));
+    await frame();
+    await frame();
+    const roots = selector ? Array.from(document.querySelectorAll(selector)) : [document];
+    const running = roots
+        .flatMap(root => root.getAnimations({subtree: true}))
+        .filter(a => a.playState === 'running' && a.effect && isFinite(a.effect.getComputedTiming().endTime));
+    if (!running.length) return true;
+    const timeout = new Promise(resolve => setTimeout(() => resolve(false), timeoutMs));
+    const finished = Promise.all(running.map(a => a.finished.catch(() => null))).then(() => true);
+    return Promise.race([finished, timeout]);
+}
+"""
+
+NETWORK_QUIET_JS = """
+async ({quietMs, timeoutMs}) => {
+    const resources = () => performance.getEntriesByType('resource').length;
+    const start = performance.now();
+    let count = resources();
+    let changed = start;
+    while (performance.now() - start < timeoutMs) {
+        await new Promise(resolve => setTimeout(resolve, 50));
+        const now = resources();
+        if (now !== count) {
+            count = now;
+            changed = performance.now();
+        } else if (performance.now() - changed >= quietMs) {
+            return true;
+        }
+    }
+    return false;
+}
+"""
+
+
+@dataclass
+class WaitResult:
+    """Outcome of one wait"""
+    condition: str
+    elapsed_ms: float
+    satisfied: bool
+
+    def __bool__(self) -> bool:
+        return self.satisfied
+
+
+class WaitStats(SampleCollector[WaitResult]):
+    """Elapsed time of every wait in this process, grouped by condition"""
+    sample_type = WaitResult
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        out: Dict[str, Dict[str, float]] = {}
+        for w in self.samples:
+            entry = out.setdefault(w.condition, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "timeouts": 0})
+            entry["count"] += 1
+            entry["total_ms"] += w.elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], w.elapsed_ms)
+            entry["timeouts"] += 0 if w.satisfied else 1
+        return out
+
+    def print_summary(self):
+        if not self.samples:
+            return
+        print("\nWAITS:")
+        for condition, s in self.summary().items():
+            print(f"  {condition:14} {s['count']:4d} waits  {s['total_ms'] / 1000:6.1f}s total  "
+                  f"max {s['max_ms']:.0f}ms  timeouts {s['timeouts']}")
+
+
+stats = register("waits", WaitStats())
+
+
+def _timeout(condition: str, timeout_ms: Optional[float]) -> float:
+    return DEFAULT_TIMEOUTS[condition] if timeout_ms is None else timeout_ms
+
+
+def _finish(condition: str, start: float, satisfied: bool) -> WaitResult:
+    return stats.record(WaitResult(condition, (time.perf_counter() - start) * 1000, bool(satisfied)))
+
+
+# ============================================================
+# sync_api
+# ============================================================
+def _wait_for_function(page, condition: str, js: str, arg=None, timeout_ms: Optional[float] = None) -> WaitResult:
+    start = time.perf_counter()
+    try:
+        page.wait_for_function(js, arg=arg, timeout=_timeout(condition, timeout_ms))
+        return _finish(condition, start, True)
+    except PlaywrightError:
+        return _finish(condition, start, False)
+
+
+def wait_for_hydration(page, timeout_ms: Optional[float] = None) -> WaitResult:
+    """Wait until React has hydrated the current document"""
+    return _wait_for_function(page, "hydration", HYDRATION_JS, timeout_ms=timeout_ms)
+
+
+def wait_for_count_change(page, selector: str, previous: int, timeout_ms: Optional[float] = None) -> WaitResult:
+    """Wait until the number of elements matching selector is no longer previous"""
+    return _wait_for_function(page, "count", COUNT_CHANGED_JS, {"selector": selector, "previous": previous}, timeout_ms)
+
+
+def wait_for_count(page, selector: str, at_least: int, timeout_ms: Optional[float] = None) -> WaitResult:
+    """Wait until at least at_least elements match selector"""
+    return _wait_for_function(page, "count", COUNT_AT_LEAST_JS, {"selector": selector, "atLeast": at_least}, timeout_ms)
+
+
+def wait_for_animations(page, selector: Optional[str] = None, timeout_ms: Optional[float] = None) -> WaitResult:
+    """Wait for running CSS transitions/animations (under selector, or anywhere) to finish"""
+    start = time.perf_counter()
+    timeout = _timeout("animation", timeout_ms)
+    try:
+        done = page.evaluate(ANIMATIONS_JS, {"selector": selector, "timeoutMs": timeout})
+    except PlaywrightError:
+        done = False
+    return _finish("animation", start, done)
+
+
+def _wait_for_idle(page, condition: str, quiet_ms: float, timeout_ms: Optional[float]) -> WaitResult:
+    start = time.perf_counter()
+    timeout = _timeout(condition, timeout_ms)
+    tracker = tracker_for(page)
+    done = False
+    try:
+        if tracker is None:
+            done = page.evaluate(NETWORK_QUIET_JS, {"quietMs": quiet_ms, "timeoutMs": timeout})
+        else:
+            while not done and (time.perf_counter() - start) * 1000 < timeout:
+                idle = tracker.idle_ms(page, since=start)
+                done = idle is not None and idle >= quiet_ms
+                if not done:
+                    page.wait_for_timeout(POLL_MS)
+    except PlaywrightError:
+        done = False
+    return _finish(condition, start, done)
+
+
+def wait_for_network_quiet(page, quiet_ms: float = NETWORK_QUIET_MS, timeout_ms: Optional[float] = None) -> WaitResult:
+    """Wait until no tracked request has been open for quiet_ms
+
+    Uses the context's request tracker when one is installed, otherwise
+    watches the page's resource timing entries.
+    """
+    return _wait_for_idle(page, "network_quiet", quiet_ms, timeout_ms)
+
+
+def wait_for_settled(page, timeout_ms: Optional[float] = None) -> WaitResult:
+    """Wait until only allow-listed long-lived requests are still open"""
+    return _wait_for_idle(page, "settled", SETTLE_GRACE_MS, timeout_ms)
+
+
+def wait_for_url_change(page, previous: str, timeout_ms: Optional[float] = None) -> WaitResult:
+    """Wait until the page has committed to a URL other than previous"""
+    start = time.perf_counter()
+    try:
+        page.wait_for_url(lambda url: url != previous, wait_until="commit", timeout=_timeout("url", timeout_ms))
+        return _finish("url", start, True)
+    except PlaywrightError:
+        return _finish("url", start, False)
+
+
+# ============================================================
+# async_api
+# ============================================================
+async def _wait_for_function_async(page, condition: str, js: str, arg=None,
+                                   timeout_ms: Optional[float] = None) -> WaitResult:
+    start = time.perf_counter()
+    try:
+        await page.wait_for_function(js, arg=arg, timeout=_timeout(condition, timeout_ms))
+        return _finish(condition, start, True)
+    except PlaywrightError:
+        return _finish(condition, start, False)
+
+
+async def wait_for_hydration_async(page, timeout_ms: Optional[float] = None) -> WaitResult:
+    return await _wait_for_function_async(page, "hydration", HYDRATION_JS, timeout_ms=timeout_ms)
+
+
+async def wait_for_count_change_async(page, selector: str, previous: int,
+                                      timeout_ms: Optional[float] = None) -> WaitResult:
+    return await _wait_for_function_async(
+        page, "count", COUNT_CHANGED_JS, {"selector": selector, "previous": previous}, timeout_ms
+    )
+
+
+async def wait_for_animations_async(page, selector: Optional[str] = None,
+                                    timeout_ms: Optional[float] = None) -> WaitResult:
+    start = time.perf_counter()
+    timeout = _timeout("animation", timeout_ms)
+    try:
+        done = await page.evaluate(ANIMATIONS_JS, {"selector": selector, "timeoutMs": timeout})
+    except PlaywrightError:
+        done = False
+    return _finish("animation", start, done)
+
+
+async def _wait_for_idle_async(page, condition: str, quiet_ms: float, timeout_ms: Optional[float]) -> WaitResult:
+    start = time.perf_counter()
+    timeout = _timeout(condition, timeout_ms)
+    tracker = tracker_for(page)
+    done = False
+    try:
+        if tracker is None:
+            done = await page.evaluate(NETWORK_QUIET_JS, {"quietMs": quiet_ms, "timeoutMs": timeout})
+        else:
+            while not done and (time.perf_counter() - start) * 1000 < timeout:
+                idle = tracker.idle_ms(page, since=start)
+                done = idle is not None and idle >= quiet_ms
+                if not done:
+                    await page.wait_for_timeout(POLL_MS)
+    except PlaywrightError:
+        done = False
+    return _finish(condition, start, done)
+
+
+async def wait_for_network_quiet_async(page, quiet_ms: float = NETWORK_QUIET_MS,
+                                       timeout_ms: Optional[float] = None) -> WaitResult:
+    return await _wait_for_idle_async(page, "network_quiet", quiet_ms, timeout_ms)
+
+
+async def wait_for_settled_async(page, timeout_ms: Optional[float] = None) -> WaitResult:
+    return await _wait_for_idle_async(page, "settled", SETTLE_GRACE_MS, timeout_ms)
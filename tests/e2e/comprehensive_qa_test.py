@@ -16,35 +16,72 @@ This test suite covers:
 - Accessibility basics
 """
 
+import argparse
+import asyncio
 import json
 import os
+import sys
 import time
+from collections import Counter
 from datetime import datetime
-from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Optional
 from playwright.sync_api import sync_playwright, Page, Locator, expect
+from playwright.async_api import async_playwright, BrowserContext as AsyncBrowserContext
+from playwright.async_api import Page as AsyncPage
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from qa_support import coverage, history, profiles, replay, timings, vitals
+from qa_support.a11y_audit import AuditReport, run_audit, run_audit_async
+from qa_support.assets import stats as asset_stats
+from qa_support.auth import ensure_storage_state
+from qa_support.census import DomCensus, take_census, take_census_async
+from qa_support.coverage import RouteCoverage
+from qa_support.context import BASE_URL, backend_mode, new_qa_context, new_qa_context_async
+from qa_support.hydration import metrics as hydration_metrics, record_hydration, record_hydration_async
+from qa_support.results import RUN_ID, Results, read as read_results
+from qa_support.schedule import Schedule
+from qa_support.screenshots import capture, capture_async, print_summary as print_screenshot_summary
+from qa_support.timings import TimingBreakdown
+from qa_support.vitals import VitalsSample
+from qa_support.waits import (
+    stats as wait_stats,
+    wait_for_animations,
+    wait_for_animations_async,
+    wait_for_settled,
+    wait_for_settled_async,
+)
 
-BASE_URL = "http://localhost:5178"
 SCREENSHOT_DIR = "/tmp/piterpay-qa-comprehensive"
 REPORT_FILE = "/tmp/piterpay-qa-report.json"
 
+# Resource profile of this suite's contexts (qa_support.profiles) - load times and screenshots need everything
+RESOURCE_PROFILE = "full"
+
 @dataclass
 class TestResult:
     name: str
     status: str  # 'pass', 'fail', 'warning', 'skip'
     details: str = ""
     screenshot: str = ""
-    duration_ms: float = 0
+    duration_ms: Optional[float] = None  # None for checks read from the census or the audit
 
 @dataclass
 class PageReport:
     url: str
     name: str
     load_time_ms: float = 0
+    hydration_ms: Optional[float] = None
+    vitals: Optional[Dict[str, Any]] = None
+    timing: Optional[Dict[str, Any]] = None
+    coverage: Optional[Dict[str, Any]] = None
     elements_found: Dict[str, int] = field(default_factory=dict)
-    tests: List[TestResult] = field(default_factory=list)
+    counts: Dict[str, int] = field(default_factory=dict)
+    problems: List[TestResult] = field(default_factory=list)  # failures and warnings
     issues: List[str] = field(default_factory=list)
     console_errors: List[str] = field(default_factory=list)
+    accessibility_findings: List[Dict[str, Any]] = field(default_factory=list)
 
 @dataclass
 class QAReport:
@@ -59,11 +96,188 @@ class QAReport:
     recommendations: List[str] = field(default_factory=list)
 
 
+PAGES_TO_TEST = [
+    ("/", "Home"),
+    ("/login", "Login"),
+    ("/dashboard", "Dashboard"),
+    ("/budget", "Budget"),
+    ("/profile", "Profile"),
+    ("/savings", "Savings"),
+    ("/tasks", "Tasks"),
+    ("/monthly-overview", "Monthly Overview"),
+    ("/household", "Household"),
+    ("/about", "About"),
+    ("/guide", "Guide"),
+]
+
+VIEWPORTS = [
+    {"name": "Mobile", "width": 375, "height": 667},
+    {"name": "Tablet", "width": 768, "height": 1024},
+    {"name": "Desktop", "width": 1280, "height": 720},
+]
+
+# ============================================================
+# Result builders - shared by the sync and async testers
+# ============================================================
+def button_result(index: int, button: Dict[str, Any]) -> TestResult:
+    """Judge a button from its census record"""
+    button_text = button["text"][:30] or f"Button #{index}"
+
+    if button["disabled"]:
+        status, details = "warning", "Button is disabled"
+    elif button["visible"]:
+        status, details = "pass", "Button is clickable"
+    else:
+        status, details = "fail", "Button not clickable"
+
+    return TestResult(name=f"Button: {button_text}", status=status, details=details)
+
+
+def link_result(index: int, link: Dict[str, Any]) -> TestResult:
+    """Judge a link from its census record"""
+    href = link["href"]
+    link_text = link["text"][:30] or f"Link #{index}"
+
+    if not href:
+        status, details = "warning", "Link has no href attribute"
+    elif href.startswith("#") or href.startswith("javascript:"):
+        status, details = "warning", f"Anchor/JS link: {href[:50]}"
+    else:
+        status, details = "pass", f"Valid href: {href[:50]}"
+
+    return TestResult(name=f"Link: {link_text}", status=status, details=details)
+
+
+def input_result(index: int, field: Dict[str, Any]) -> TestResult:
+    """Judge an input field from its census record"""
+    input_type = field["type"] or "text"
+    input_name = field["name"] or field["placeholder"] or f"Input #{index}"
+
+    if field["disabled"]:
+        status, details = "warning", f"Input ({input_type}) is disabled"
+    elif field["readonly"]:
+        status, details = "warning", f"Input ({input_type}) is readonly"
+    elif field["visible"]:
+        status, details = "pass", f"Input ({input_type}) is interactive"
+    else:
+        status, details = "fail", f"Input ({input_type}) not visible"
+
+    return TestResult(name=f"Input: {input_name}", status=status, details=details)
+
+
+def structure_results(census: DomCensus) -> List[TestResult]:
+    """Judge the basic page structure"""
+    title, h1_text = census.title, census.h1_text
+    return [
+        TestResult(
+            name="Page has title",
+            status="pass" if title else "fail",
+            details=f"Title: {title[:50]}" if title else "No title"
+        ),
+        TestResult(
+            name="Has main content area",
+            status="pass" if census.has_main else "warning",
+            details="Main content area found" if census.has_main else "No explicit main area"
+        ),
+        TestResult(
+            name="Has H1 heading",
+            status="pass" if h1_text is not None else "warning",
+            details=f"H1: {h1_text[:30]}" if h1_text is not None else "No H1 found"
+        ),
+        TestResult(
+            name="RTL support",
+            status="pass" if census.html_dir == "rtl" else "warning",
+            details=f"dir={census.html_dir}" if census.html_dir else "No dir attribute"
+        ),
+        TestResult(
+            name="Hebrew language set",
+            status="pass" if census.html_lang == "he" else "warning",
+            details=f"lang={census.html_lang}" if census.html_lang else "No lang attribute"
+        ),
+    ]
+
+
+def form_result(index: int, form: Dict[str, Any]) -> TestResult:
+    """Judge a form from its census record"""
+    return TestResult(
+        name=f"Form #{index+1}",
+        status="pass" if form["inputs"] > 0 else "warning",
+        details=f"Inputs: {form['inputs']}, Submit: {form['submits']}, Method: {form['method'] or 'GET'}"
+    )
+
+
+def navigation_results(census: DomCensus) -> List[TestResult]:
+    """Judge navigation; nav_links is None when the page has no nav element"""
+    if census.nav_links is not None:
+        tests = [TestResult(name="Navigation menu", status="pass", details=f"Found nav with {census.nav_links} links")]
+    else:
+        tests = [TestResult(name="Navigation menu", status="warning", details="No explicit nav element found")]
+
+    if census.has_hamburger:
+        tests.append(TestResult(name="Mobile menu toggle", status="pass", details="Hamburger menu found"))
+    return tests
+
+
+def census_results(census: DomCensus) -> List[TestResult]:
+    """Every check that reads from the census, in report order"""
+    return (
+        structure_results(census)
+        + [button_result(i, b) for i, b in enumerate(census.buttons)]
+        + [link_result(i, l) for i, l in enumerate(census.links)]
+        + [input_result(i, f) for i, f in enumerate(census.inputs)]
+        + [form_result(i, f) for i, f in enumerate(census.forms)]
+        + navigation_results(census)
+    )
+
+
+def responsive_result(viewport: Dict[str, Any], is_visible: bool, has_h_scroll: bool,
+                      duration_ms: float) -> TestResult:
+    return TestResult(
+        name=f"Responsive: {viewport['name']} ({viewport['width']}px)",
+        status="pass" if is_visible and not has_h_scroll else "warning",
+        details=f"Visible: {is_visible}, H-Scroll: {has_h_scroll}",
+        duration_ms=duration_ms
+    )
+
+
+def accessibility_results(audit: AuditReport) -> List[TestResult]:
+    """Summarise the audit as one result per rule"""
+    def summary(name: str, rule: str, label: str) -> TestResult:
+        findings = audit.by_rule(rule)
+        ok = sum(1 for f in findings if f["status"] == "pass")
+        return TestResult(
+            name=name,
+            status="pass" if ok == len(findings) else "warning",
+            details=f"{ok}/{len(findings)} {label}"
+        )
+
+    return [
+        summary("Images have alt text", "img-alt", "images have alt"),
+        summary("Buttons have accessible names", "button-name", "buttons accessible"),
+        summary("Form inputs labeled", "input-label", "inputs labeled"),
+        summary("ARIA roles valid", "aria-role", "roles valid"),
+        summary("Focus order", "focus-order", "tab stops visible and in DOM order"),
+    ]
+
+
 class ComprehensiveQATester:
     def __init__(self):
         self.report = QAReport(timestamp=datetime.now().isoformat())
         self.page: Optional[Page] = None
+        self.census: Optional[DomCensus] = None
         self.console_errors: List[str] = []
+        self.results = Results("e2e-comprehensive", echo=False)
+
+    def add_tests(self, page_report: PageReport, tests: Iterable[TestResult]):
+        """Stream a page's test results and count them in its report"""
+        counts = Counter(page_report.counts)
+        for t in tests:
+            self.results.record(f"{page_report.name}: {t.name}", t.status, t.details,
+                                duration_ms=t.duration_ms, route=page_report.url)
+            counts[t.status] += 1
+            if t.status != "pass":
+                page_report.problems.append(t)
+        page_report.counts = dict(counts)
 
     def setup_console_listener(self):
         """Capture all console errors"""
@@ -76,378 +290,128 @@ class ComprehensiveQATester:
         """Take screenshot and return path"""
         os.makedirs(SCREENSHOT_DIR, exist_ok=True)
         filename = f"{SCREENSHOT_DIR}/{name}_{datetime.now().strftime('%H%M%S')}.png"
-        self.page.screenshot(path=filename, full_page=True)
+        capture(self.page, filename, full_page=True)
         return filename
 
     def count_elements(self, page_report: PageReport):
-        """Count all interactive elements on page"""
-        elements = {
-            "buttons": self.page.locator("button").count(),
-            "links": self.page.locator("a").count(),
-            "inputs": self.page.locator("input").count(),
-            "textareas": self.page.locator("textarea").count(),
-            "selects": self.page.locator("select").count(),
-            "checkboxes": self.page.locator("input[type='checkbox']").count(),
-            "radio_buttons": self.page.locator("input[type='radio']").count(),
-            "forms": self.page.locator("form").count(),
-            "images": self.page.locator("img").count(),
-            "headings": self.page.locator("h1, h2, h3, h4, h5, h6").count(),
-            "modals_dialogs": self.page.locator("[role='dialog'], [role='alertdialog'], .modal").count(),
-            "dropdown_menus": self.page.locator("[role='menu'], [role='listbox']").count(),
-            "tabs": self.page.locator("[role='tab']").count(),
-            "icons": self.page.locator("svg, [class*='icon']").count(),
-        }
-        page_report.elements_found = elements
-        return elements
-
-    def test_element_visibility(self, selector: str, name: str) -> TestResult:
-        """Test if element is visible"""
-        start = time.time()
-        try:
-            element = self.page.locator(selector).first
-            if element.is_visible():
-                return TestResult(
-                    name=f"Visibility: {name}",
-                    status="pass",
-                    details="Element is visible",
-                    duration_ms=(time.time() - start) * 1000
-                )
-            else:
-                return TestResult(
-                    name=f"Visibility: {name}",
-                    status="fail",
-                    details="Element exists but not visible",
-                    duration_ms=(time.time() - start) * 1000
-                )
-        except Exception as e:
-            return TestResult(
-                name=f"Visibility: {name}",
-                status="fail",
-                details=str(e),
-                duration_ms=(time.time() - start) * 1000
-            )
-
-    def test_button_clickable(self, button: Locator, index: int) -> TestResult:
-        """Test if button is clickable and responds"""
-        start = time.time()
-        try:
-            button_text = button.inner_text()[:30] or f"Button #{index}"
-            is_disabled = button.is_disabled()
-
-            if is_disabled:
-                return TestResult(
-                    name=f"Button: {button_text}",
-                    status="warning",
-                    details="Button is disabled",
-                    duration_ms=(time.time() - start) * 1000
-                )
-
-            # Check if clickable
-            if button.is_visible() and button.is_enabled():
-                return TestResult(
-                    name=f"Button: {button_text}",
-                    status="pass",
-                    details="Button is clickable",
-                    duration_ms=(time.time() - start) * 1000
-                )
-            else:
-                return TestResult(
-                    name=f"Button: {button_text}",
-                    status="fail",
-                    details="Button not clickable",
-                    duration_ms=(time.time() - start) * 1000
-                )
-        except Exception as e:
-            return TestResult(
-                name=f"Button #{index}",
-                status="fail",
-                details=str(e),
-                duration_ms=(time.time() - start) * 1000
-            )
-
-    def test_link_valid(self, link: Locator, index: int) -> TestResult:
-        """Test if link has valid href"""
-        start = time.time()
-        try:
-            href = link.get_attribute("href")
-            link_text = link.inner_text()[:30] or f"Link #{index}"
-
-            if not href:
-                return TestResult(
-                    name=f"Link: {link_text}",
-                    status="warning",
-                    details="Link has no href attribute",
-                    duration_ms=(time.time() - start) * 1000
-                )
-
-            if href.startswith("#") or href.startswith("javascript:"):
-                return TestResult(
-                    name=f"Link: {link_text}",
-                    status="warning",
-                    details=f"Anchor/JS link: {href[:50]}",
-                    duration_ms=(time.time() - start) * 1000
-                )
-
-            return TestResult(
-                name=f"Link: {link_text}",
-                status="pass",
-                details=f"Valid href: {href[:50]}",
-                duration_ms=(time.time() - start) * 1000
-            )
-        except Exception as e:
-            return TestResult(
-                name=f"Link #{index}",
-                status="fail",
-                details=str(e),
-                duration_ms=(time.time() - start) * 1000
-            )
-
-    def test_input_field(self, input_elem: Locator, index: int) -> TestResult:
-        """Test input field functionality"""
-        start = time.time()
-        try:
-            input_type = input_elem.get_attribute("type") or "text"
-            input_name = input_elem.get_attribute("name") or input_elem.get_attribute("placeholder") or f"Input #{index}"
-            is_disabled = input_elem.is_disabled()
-            is_readonly = input_elem.get_attribute("readonly") is not None
-
-            if is_disabled:
-                return TestResult(
-                    name=f"Input: {input_name}",
-                    status="warning",
-                    details=f"Input ({input_type}) is disabled",
-                    duration_ms=(time.time() - start) * 1000
-                )
-
-            if is_readonly:
-                return TestResult(
-                    name=f"Input: {input_name}",
-                    status="warning",
-                    details=f"Input ({input_type}) is readonly",
-                    duration_ms=(time.time() - start) * 1000
-                )
-
-            # Try to focus and type (without submitting)
-            if input_elem.is_visible():
-                return TestResult(
-                    name=f"Input: {input_name}",
-                    status="pass",
-                    details=f"Input ({input_type}) is interactive",
-                    duration_ms=(time.time() - start) * 1000
-                )
-            else:
-                return TestResult(
-                    name=f"Input: {input_name}",
-                    status="fail",
-                    details=f"Input ({input_type}) not visible",
-                    duration_ms=(time.time() - start) * 1000
-                )
-        except Exception as e:
-            return TestResult(
-                name=f"Input #{index}",
-                status="fail",
-                details=str(e),
-                duration_ms=(time.time() - start) * 1000
-            )
+        """Take a census of the page and record its element counts"""
+        self.census = take_census(self.page)
+        page_report.elements_found = self.census.counts
+        return self.census.counts
 
     def test_page_structure(self, page_report: PageReport):
         """Test basic page structure requirements"""
-        tests = []
-
-        # Test: Has title
-        title = self.page.title()
-        tests.append(TestResult(
-            name="Page has title",
-            status="pass" if title else "fail",
-            details=f"Title: {title[:50]}" if title else "No title"
-        ))
-
-        # Test: Has main content
-        main = self.page.locator("main, [role='main'], #main, .main").first
-        tests.append(TestResult(
-            name="Has main content area",
-            status="pass" if main.count() > 0 else "warning",
-            details="Main content area found" if main.count() > 0 else "No explicit main area"
-        ))
-
-        # Test: Has heading
-        h1 = self.page.locator("h1").first
-        tests.append(TestResult(
-            name="Has H1 heading",
-            status="pass" if h1.count() > 0 else "warning",
-            details=f"H1: {h1.inner_text()[:30]}" if h1.count() > 0 else "No H1 found"
-        ))
-
-        # Test: RTL direction
-        html_dir = self.page.locator("html").get_attribute("dir")
-        tests.append(TestResult(
-            name="RTL support",
-            status="pass" if html_dir == "rtl" else "warning",
-            details=f"dir={html_dir}" if html_dir else "No dir attribute"
-        ))
-
-        # Test: Hebrew language
-        html_lang = self.page.locator("html").get_attribute("lang")
-        tests.append(TestResult(
-            name="Hebrew language set",
-            status="pass" if html_lang == "he" else "warning",
-            details=f"lang={html_lang}" if html_lang else "No lang attribute"
-        ))
-
-        page_report.tests.extend(tests)
+        self.add_tests(page_report, structure_results(self.census))
 
     def test_all_buttons(self, page_report: PageReport):
         """Test all buttons on the page"""
-        buttons = self.page.locator("button").all()
-        for i, button in enumerate(buttons):
-            result = self.test_button_clickable(button, i)
-            page_report.tests.append(result)
+        self.add_tests(page_report, (button_result(i, b) for i, b in enumerate(self.census.buttons)))
 
     def test_all_links(self, page_report: PageReport):
         """Test all links on the page"""
-        links = self.page.locator("a").all()
-        for i, link in enumerate(links):
-            result = self.test_link_valid(link, i)
-            page_report.tests.append(result)
+        self.add_tests(page_report, (link_result(i, l) for i, l in enumerate(self.census.links)))
 
     def test_all_inputs(self, page_report: PageReport):
         """Test all input fields on the page"""
-        inputs = self.page.locator("input, textarea, select").all()
-        for i, input_elem in enumerate(inputs):
-            result = self.test_input_field(input_elem, i)
-            page_report.tests.append(result)
+        self.add_tests(page_report, (input_result(i, f) for i, f in enumerate(self.census.inputs)))
 
     def test_forms(self, page_report: PageReport):
         """Test form validation and submission readiness"""
-        forms = self.page.locator("form").all()
-        for i, form in enumerate(forms):
-            # Check if form has action
-            action = form.get_attribute("action")
-            method = form.get_attribute("method") or "GET"
-
-            # Count form inputs
-            inputs_in_form = form.locator("input, textarea, select").count()
-            submit_btn = form.locator("button[type='submit'], input[type='submit']").count()
-
-            page_report.tests.append(TestResult(
-                name=f"Form #{i+1}",
-                status="pass" if inputs_in_form > 0 else "warning",
-                details=f"Inputs: {inputs_in_form}, Submit: {submit_btn}, Method: {method}"
-            ))
+        self.add_tests(page_report, (form_result(i, f) for i, f in enumerate(self.census.forms)))
 
     def test_navigation(self, page_report: PageReport):
         """Test navigation elements"""
-        # Check for nav element
-        nav = self.page.locator("nav, [role='navigation']").first
-        if nav.count() > 0:
-            nav_links = nav.locator("a").count()
-            page_report.tests.append(TestResult(
-                name="Navigation menu",
-                status="pass",
-                details=f"Found nav with {nav_links} links"
-            ))
-        else:
-            page_report.tests.append(TestResult(
-                name="Navigation menu",
-                status="warning",
-                details="No explicit nav element found"
-            ))
-
-        # Check for hamburger menu (mobile)
-        hamburger = self.page.locator("[class*='hamburger'], [class*='menu-toggle'], button[aria-label*='menu']").first
-        if hamburger.count() > 0:
-            page_report.tests.append(TestResult(
-                name="Mobile menu toggle",
-                status="pass",
-                details="Hamburger menu found"
-            ))
+        self.add_tests(page_report, navigation_results(self.census))
 
     def test_interactive_clicks(self, page_report: PageReport):
         """Actually click on interactive elements and observe behavior"""
         # Test tab clicks if present
         tabs = self.page.locator("[role='tab'], .tab, [class*='tab']").all()
         for i, tab in enumerate(tabs[:5]):  # Limit to 5 tabs
+            start = time.time()
             try:
                 if tab.is_visible() and tab.is_enabled():
-                    initial_url = self.page.url
                     tab.click(timeout=2000)
-                    time.sleep(0.3)
+                    wait_for_animations(self.page)
 
-                    page_report.tests.append(TestResult(
+                    self.add_tests(page_report, [TestResult(
                         name=f"Tab click #{i+1}",
                         status="pass",
-                        details=f"Tab clicked successfully"
-                    ))
+                        details=f"Tab clicked successfully",
+                        duration_ms=(time.time() - start) * 1000
+                    )])
             except Exception as e:
-                page_report.tests.append(TestResult(
+                self.add_tests(page_report, [TestResult(
                     name=f"Tab click #{i+1}",
                     status="warning",
-                    details=f"Click failed: {str(e)[:50]}"
-                ))
+                    details=f"Click failed: {str(e)[:50]}",
+                    duration_ms=(time.time() - start) * 1000
+                )])
 
     def test_responsive(self, page_report: PageReport):
         """Test responsive design at different viewports"""
-        viewports = [
-            {"name": "Mobile", "width": 375, "height": 667},
-            {"name": "Tablet", "width": 768, "height": 1024},
-            {"name": "Desktop", "width": 1280, "height": 720},
-        ]
-
-        for vp in viewports:
+        for vp in VIEWPORTS:
+            start = time.time()
             self.page.set_viewport_size({"width": vp["width"], "height": vp["height"]})
-            time.sleep(0.2)
+            wait_for_animations(self.page)
 
             # Check if content is visible
-            body = self.page.locator("body")
-            is_visible = body.is_visible()
+            is_visible = self.page.locator("body").is_visible()
 
             # Check for horizontal scroll (overflow)
             has_h_scroll = self.page.evaluate("document.documentElement.scrollWidth > document.documentElement.clientWidth")
 
-            status = "pass" if is_visible and not has_h_scroll else "warning"
-            details = f"Visible: {is_visible}, H-Scroll: {has_h_scroll}"
-
-            page_report.tests.append(TestResult(
-                name=f"Responsive: {vp['name']} ({vp['width']}px)",
-                status=status,
-                details=details
-            ))
+            self.add_tests(page_report, [responsive_result(vp, is_visible, has_h_scroll, (time.time() - start) * 1000)])
 
         # Reset to desktop
         self.page.set_viewport_size({"width": 1280, "height": 720})
 
     def test_accessibility_basics(self, page_report: PageReport):
-        """Basic accessibility checks"""
-        # Check images have alt text
-        images = self.page.locator("img").all()
-        images_without_alt = sum(1 for img in images if not img.get_attribute("alt"))
-
-        page_report.tests.append(TestResult(
-            name="Images have alt text",
-            status="pass" if images_without_alt == 0 else "warning",
-            details=f"{len(images) - images_without_alt}/{len(images)} images have alt"
-        ))
-
-        # Check buttons have accessible names
-        buttons = self.page.locator("button").all()
-        buttons_no_text = sum(1 for btn in buttons if not btn.inner_text().strip() and not btn.get_attribute("aria-label"))
-
-        page_report.tests.append(TestResult(
-            name="Buttons have accessible names",
-            status="pass" if buttons_no_text == 0 else "warning",
-            details=f"{len(buttons) - buttons_no_text}/{len(buttons)} buttons accessible"
-        ))
-
-        # Check form labels
-        inputs = self.page.locator("input:not([type='hidden'])").all()
-        # Simple check: inputs should have id or aria-label
-        labeled_inputs = sum(1 for inp in inputs if inp.get_attribute("id") or inp.get_attribute("aria-label") or inp.get_attribute("placeholder"))
-
-        page_report.tests.append(TestResult(
-            name="Form inputs labeled",
-            status="pass" if labeled_inputs == len(inputs) else "warning",
-            details=f"{labeled_inputs}/{len(inputs)} inputs labeled"
-        ))
+        """Accessibility audit: alt text, names, labels, ARIA roles, focus order"""
+        audit = run_audit(self.page)
+        page_report.accessibility_findings = audit.issues()
+        self.add_tests(page_report, accessibility_results(audit))
+
+    def record_timing(self, page_report: PageReport, timing: Optional[TimingBreakdown],
+                      lines: Optional[List[str]] = None):
+        """Attach where a page's load time went to its report"""
+        if timing is None:
+            return
+        page_report.timing = {**asdict(timing), "slowest": timing.slowest()}
+        line = f"  Breakdown: {timing.line()} (slowest: {timing.slowest() or '-'})"
+        if lines is None:
+            print(line)
+        else:
+            lines.append(line)
+
+    def record_vitals(self, page_report: PageReport, sample: Optional[VitalsSample],
+                      lines: Optional[List[str]] = None):
+        """Attach a page's web vitals to its report"""
+        if sample is None:
+            return
+        page_report.vitals = {**asdict(sample), "ratings": sample.ratings()}
+        lcp = f"{sample.lcp_ms:.0f}ms" if sample.lcp_ms is not None else "-"
+        inp = f"{sample.inp_ms:.0f}ms" if sample.inp_ms is not None else "-"
+        line = f"  Vitals: LCP {lcp}, CLS {sample.cls:.3f}, INP {inp}, {sample.long_tasks} long tasks"
+        if lines is None:
+            print(line)
+        else:
+            lines.append(line)
+
+    def record_coverage(self, page_report: PageReport, route_coverage: Optional[RouteCoverage],
+                        lines: Optional[List[str]] = None):
+        """Attach how much of the JS and CSS a page downloaded it used to load to its report"""
+        if route_coverage is None:
+            return
+        js_total, js_used = route_coverage.totals("js")
+        css_total, css_used = route_coverage.totals("css")
+        page_report.coverage = {"js_bytes": js_total, "js_used_bytes": js_used,
+                                "css_bytes": css_total, "css_used_bytes": css_used}
+        line = f"  Coverage: {route_coverage.line()}"
+        if lines is None:
+            print(line)
+        else:
+            lines.append(line)
 
     def test_page(self, url: str, name: str) -> PageReport:
         """Run all tests on a single page"""
@@ -459,10 +423,18 @@ class ComprehensiveQATester:
         print(f"{'='*60}")
 
         # Navigate to page
+        coverage_session = coverage.start(self.page)
+        route_coverage = None
         start_time = time.time()
         try:
-            response = self.page.goto(f"{BASE_URL}{url}", wait_until="networkidle", timeout=30000)
+            response = self.page.goto(f"{BASE_URL}{url}", wait_until="domcontentloaded", timeout=30000)
+            page_report.hydration_ms = record_hydration(self.page).hydration_ms
+            wait_for_settled(self.page)
             page_report.load_time_ms = (time.time() - start_time) * 1000
+            timing = timings.breakdown(self.page)
+            # Before the checks, whose clicks would run more of the code
+            if coverage_session:
+                route_coverage, coverage_session = coverage_session.take(url), None
 
             if not response or response.status >= 400:
                 page_report.issues.append(f"Page returned HTTP {response.status if response else 'No response'}")
@@ -471,8 +443,14 @@ class ComprehensiveQATester:
         except Exception as e:
             page_report.issues.append(f"Failed to load: {str(e)}")
             return page_report
+        finally:
+            if coverage_session:
+                coverage_session.stop()
 
         print(f"  Load time: {page_report.load_time_ms:.0f}ms")
+        print(f"  Hydration: {page_report.hydration_ms:.0f}ms" if page_report.hydration_ms is not None else "  Hydration: not detected")
+        self.record_timing(page_report, timing)
+        self.record_coverage(page_report, route_coverage)
 
         # Count elements
         elements = self.count_elements(page_report)
@@ -489,6 +467,8 @@ class ComprehensiveQATester:
         self.test_forms(page_report)
         self.test_navigation(page_report)
         self.test_interactive_clicks(page_report)
+        # Before the viewport changes, which would count as layout shifts
+        self.record_vitals(page_report, vitals.collect(self.page))
         self.test_responsive(page_report)
         self.test_accessibility_basics(page_report)
 
@@ -499,9 +479,7 @@ class ComprehensiveQATester:
         page_report.console_errors = self.console_errors.copy()
 
         # Count results
-        passed = sum(1 for t in page_report.tests if t.status == "pass")
-        failed = sum(1 for t in page_report.tests if t.status == "fail")
-        warnings = sum(1 for t in page_report.tests if t.status == "warning")
+        passed, failed, warnings = (page_report.counts.get(s, 0) for s in ("pass", "fail", "warning"))
 
         print(f"  Results: ✅ {passed} passed, ❌ {failed} failed, ⚠️  {warnings} warnings")
         if page_report.console_errors:
@@ -511,24 +489,18 @@ class ComprehensiveQATester:
 
     def generate_summary(self):
         """Generate final summary statistics"""
-        for page in self.report.pages:
-            for test in page.tests:
-                self.report.total_tests += 1
-                if test.status == "pass":
-                    self.report.passed += 1
-                elif test.status == "fail":
-                    self.report.failed += 1
-                elif test.status == "warning":
-                    self.report.warnings += 1
-                else:
-                    self.report.skipped += 1
+        self.report.total_tests = self.results.total
+        self.report.passed = self.results.passed
+        self.report.failed = self.results.failed
+        self.report.warnings = self.results.warnings
+        self.report.skipped = self.results.counts["skip"]
 
         # Identify critical issues
         for page in self.report.pages:
             for issue in page.issues:
                 self.report.critical_issues.append(f"[{page.name}] {issue}")
 
-            failed_tests = [t for t in page.tests if t.status == "fail"]
+            failed_tests = [t for t in page.problems if t.status == "fail"]
             for t in failed_tests:
                 self.report.critical_issues.append(f"[{page.name}] {t.name}: {t.details}")
 
@@ -558,10 +530,8 @@ class ComprehensiveQATester:
         print("\n📊 PAGE SUMMARY:")
         print("-" * 70)
         for page in self.report.pages:
-            passed = sum(1 for t in page.tests if t.status == "pass")
-            failed = sum(1 for t in page.tests if t.status == "fail")
-            warnings = sum(1 for t in page.tests if t.status == "warning")
-            total = len(page.tests)
+            passed, failed, warnings = (page.counts.get(s, 0) for s in ("pass", "fail", "warning"))
+            total = sum(page.counts.values())
 
             status_icon = "✅" if failed == 0 else "❌"
             print(f"  {status_icon} {page.name:20} | Tests: {total:3d} | ✅{passed:3d} ❌{failed:3d} ⚠️ {warnings:3d} | {page.load_time_ms:.0f}ms")
@@ -584,21 +554,52 @@ class ComprehensiveQATester:
         if total_console_errors > 0:
             print(f"  • Fix {total_console_errors} console errors (likely API/auth issues)")
 
+        total_a11y_findings = sum(len(p.accessibility_findings) for p in self.report.pages)
+        if total_a11y_findings > 0:
+            print(f"  • Review {total_a11y_findings} accessibility findings (see accessibility_findings in the report)")
+
         if self.report.warnings > 10:
             print(f"  • Address {self.report.warnings} warnings to improve quality")
 
         # Check for specific issues
         for page in self.report.pages:
-            nav_tests = [t for t in page.tests if "Navigation" in t.name and t.status != "pass"]
+            nav_tests = [t for t in page.problems if "Navigation" in t.name]
             if nav_tests:
                 print(f"  • Improve navigation on {page.name}")
                 break
 
+        wait_stats.print_summary()
+        hydration_metrics.print_summary()
+        vitals.metrics.print_summary()
+        timings.metrics.print_summary()
+        coverage.report.print_summary()
+        asset_stats.print_summary()
+        profiles.usage.print_summary()
+        print_screenshot_summary()
+        replay.stats.print_summary()
+
         print(f"\n📸 Screenshots saved to: {SCREENSHOT_DIR}")
         print(f"📄 Full report saved to: {REPORT_FILE}")
 
+    def page_tests(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Every test of this run per route, rebuilt from the streamed records"""
+        per_route: Dict[str, List[Dict[str, Any]]] = {}
+        names = {page.url: f"{page.name}: " for page in self.report.pages}
+        for record in read_results(self.results.path, run=RUN_ID):
+            if record["suite"] != self.results.suite or record["route"] not in names:
+                continue
+            per_route.setdefault(record["route"], []).append({
+                "name": record["test"].removeprefix(names[record["route"]]),
+                "status": record["status"],
+                "details": record["details"],
+                # The report keeps 0 for untimed checks, as it always has
+                "duration_ms": record["duration_ms"] or 0,
+            })
+        return per_route
+
     def save_report(self):
         """Save report to JSON file"""
+        page_tests = self.page_tests()
         # Convert dataclasses to dicts
         report_dict = {
             "timestamp": self.report.timestamp,
@@ -608,6 +609,10 @@ class ComprehensiveQATester:
             "warnings": self.report.warnings,
             "skipped": self.report.skipped,
             "critical_issues": self.report.critical_issues,
+            "run": RUN_ID,
+            "results_file": self.results.path,
+            "backend": backend_mode(),
+            "resource_profile": profiles.resolve(RESOURCE_PROFILE).name,
             "pages": []
         }
 
@@ -616,60 +621,59 @@ class ComprehensiveQATester:
                 "url": page.url,
                 "name": page.name,
                 "load_time_ms": page.load_time_ms,
+                "hydration_ms": page.hydration_ms,
+                "vitals": page.vitals,
+                "timing": page.timing,
+                "coverage": page.coverage,
                 "elements_found": page.elements_found,
                 "console_errors": page.console_errors,
                 "issues": page.issues,
-                "tests": [
+                "tests": page_tests.get(page.url, []),
+                "accessibility_findings": page.accessibility_findings,
+                "counts": page.counts,
+                "problems": [
                     {
                         "name": t.name,
                         "status": t.status,
                         "details": t.details,
                         "duration_ms": t.duration_ms
                     }
-                    for t in page.tests
+                    for t in page.problems
                 ]
             }
             report_dict["pages"].append(page_dict)
 
         with open(REPORT_FILE, "w", encoding="utf-8") as f:
             json.dump(report_dict, f, ensure_ascii=False, indent=2)
+        coverage.report.save()
+        history.ingest_run()
 
     def run(self):
         """Run complete QA test suite"""
-        pages_to_test = [
-            ("/", "Home"),
-            ("/login", "Login"),
-            ("/dashboard", "Dashboard"),
-            ("/budget", "Budget"),
-            ("/profile", "Profile"),
-            ("/savings", "Savings"),
-            ("/tasks", "Tasks"),
-            ("/monthly-overview", "Monthly Overview"),
-            ("/household", "Household"),
-            ("/about", "About"),
-            ("/guide", "Guide"),
-        ]
-
         print("\n" + "═"*70)
         print("   PiterPay - Comprehensive QA Test Suite")
         print("   Senior QA Engineer Deep Testing")
         print("═"*70)
 
+        ensure_storage_state(BASE_URL)
+
+        schedule = Schedule([("e2e-comprehensive", url) for url, _ in PAGES_TO_TEST])
+        schedule.start(1)
         with sync_playwright() as p:
             browser = p.chromium.launch(headless=True)
-            context = browser.new_context(
-                viewport={"width": 1280, "height": 720},
-                locale="he-IL"
-            )
+            context = new_qa_context(browser, profile=RESOURCE_PROFILE)
             self.page = context.new_page()
             self.setup_console_listener()
 
             # Test each page
-            for url, name in pages_to_test:
-                page_report = self.test_page(url, name)
+            for index, (url, name) in enumerate(PAGES_TO_TEST):
+                with schedule.timing(index):
+                    page_report = self.test_page(url, name)
                 self.report.pages.append(page_report)
 
+            vitals.collect_pages(context)
             browser.close()
+        schedule.save()
 
         # Generate summary and print report
         self.generate_summary()
@@ -680,6 +684,178 @@ class ComprehensiveQATester:
         return 0 if self.report.failed == 0 else 1
 
 
+class AsyncComprehensiveQATester(ComprehensiveQATester):
+    """async_api port of the tester
+
+    Routes are checked concurrently (bounded by `concurrency`), each on its own
+    page. Within a page the DOM census and the accessibility checks run at the
+    same time; the tab clicks and viewport changes still run one after another
+    because they mutate the page. Tests are reported in the same order as the sync tester,
+    so the QAReport JSON has the same shape and ordering.
+    """
+
+    def __init__(self, concurrency: int = 4):
+        super().__init__()
+        self.concurrency = concurrency
+
+    async def test_interactive_clicks_async(self, page: AsyncPage) -> List[TestResult]:
+        tests = []
+        tabs = await page.locator("[role='tab'], .tab, [class*='tab']").all()
+        for i, tab in enumerate(tabs[:5]):  # Limit to 5 tabs
+            start = time.time()
+            try:
+                if await tab.is_visible() and await tab.is_enabled():
+                    await tab.click(timeout=2000)
+                    await wait_for_animations_async(page)
+                    tests.append(TestResult(
+                        name=f"Tab click #{i+1}",
+                        status="pass",
+                        details=f"Tab clicked successfully",
+                        duration_ms=(time.time() - start) * 1000
+                    ))
+            except Exception as e:
+                tests.append(TestResult(
+                    name=f"Tab click #{i+1}",
+                    status="warning",
+                    details=f"Click failed: {str(e)[:50]}",
+                    duration_ms=(time.time() - start) * 1000
+                ))
+        return tests
+
+    async def test_responsive_async(self, page: AsyncPage) -> List[TestResult]:
+        tests = []
+        for vp in VIEWPORTS:
+            start = time.time()
+            await page.set_viewport_size({"width": vp["width"], "height": vp["height"]})
+            await wait_for_animations_async(page)
+            is_visible = await page.locator("body").is_visible()
+            has_h_scroll = await page.evaluate("document.documentElement.scrollWidth > document.documentElement.clientWidth")
+            tests.append(responsive_result(vp, is_visible, has_h_scroll, (time.time() - start) * 1000))
+
+        await page.set_viewport_size({"width": 1280, "height": 720})
+        return tests
+
+    async def test_page_async(self, context: AsyncBrowserContext, url: str, name: str) -> PageReport:
+        """Run all tests on a single page in its own tab"""
+        page_report = PageReport(url=url, name=name)
+        console_errors: List[str] = []
+        lines = [f"\n{'='*60}", f"  Testing: {name} ({url})", f"{'='*60}"]
+
+        page = await context.new_page()
+        page.on("console", lambda msg: console_errors.append(msg.text) if msg.type == "error" else None)
+        coverage_session = await coverage.start_async(page)
+        route_coverage = None
+        try:
+            start_time = time.time()
+            try:
+                response = await page.goto(f"{BASE_URL}{url}", wait_until="domcontentloaded", timeout=30000)
+                page_report.hydration_ms = (await record_hydration_async(page)).hydration_ms
+                await wait_for_settled_async(page)
+                page_report.load_time_ms = (time.time() - start_time) * 1000
+                timing = await timings.breakdown_async(page)
+                if coverage_session:
+                    route_coverage, coverage_session = await coverage_session.take(url), None
+
+                if not response or response.status >= 400:
+                    page_report.issues.append(f"Page returned HTTP {response.status if response else 'No response'}")
+                    return page_report
+            except Exception as e:
+                page_report.issues.append(f"Failed to load: {str(e)}")
+                return page_report
+
+            lines.append(f"  Load time: {page_report.load_time_ms:.0f}ms")
+            lines.append(f"  Hydration: {page_report.hydration_ms:.0f}ms" if page_report.hydration_ms is not None else "  Hydration: not detected")
+            self.record_timing(page_report, timing, lines)
+            self.record_coverage(page_report, route_coverage, lines)
+
+            # Read-only checks run side by side
+            census, audit = await asyncio.gather(take_census_async(page), run_audit_async(page))
+            page_report.accessibility_findings = audit.issues()
+            elements = page_report.elements_found = census.counts
+            lines.append(f"  Elements: {sum(elements.values())} total")
+            lines.append(f"    - Buttons: {elements['buttons']}, Links: {elements['links']}, Inputs: {elements['inputs']}")
+
+            # Checks that change the page run in order
+            clicks = await self.test_interactive_clicks_async(page)
+            self.record_vitals(page_report, await vitals.collect_async(page), lines)
+            responsive = await self.test_responsive_async(page)
+
+            for tests in (census_results(census), clicks, responsive, accessibility_results(audit)):
+                self.add_tests(page_report, tests)
+
+            os.makedirs(SCREENSHOT_DIR, exist_ok=True)
+            screenshot = f"{SCREENSHOT_DIR}/{name.lower().replace(' ', '_')}_{datetime.now().strftime('%H%M%S')}.png"
+            await capture_async(page, screenshot, full_page=True)
+
+            page_report.console_errors = console_errors.copy()
+
+            passed, failed, warnings = (page_report.counts.get(s, 0) for s in ("pass", "fail", "warning"))
+
+            lines.append(f"  Results: ✅ {passed} passed, ❌ {failed} failed, ⚠️  {warnings} warnings")
+            if page_report.console_errors:
+                lines.append(f"  Console errors: {len(page_report.console_errors)}")
+
+            return page_report
+        finally:
+            # Pages that failed their checks still report what they measured
+            if page_report.vitals is None:
+                self.record_vitals(page_report, await vitals.collect_async(page), lines)
+            print("\n".join(lines))
+            if coverage_session:
+                await coverage_session.stop()
+            await page.close()
+
+    async def run_async(self):
+        """Run the suite with routes checked concurrently"""
+        print("\n" + "═"*70)
+        print("   PiterPay - Comprehensive QA Test Suite (async)")
+        print(f"   Senior QA Engineer Deep Testing - {self.concurrency} routes at a time")
+        print("═"*70)
+
+        ensure_storage_state(BASE_URL)
+
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            context = await new_qa_context_async(browser, profile=RESOURCE_PROFILE)
+            semaphore = asyncio.Semaphore(self.concurrency)
+            schedule = Schedule([("e2e-comprehensive", url) for url, _ in PAGES_TO_TEST])
+            schedule.start(self.concurrency)
+
+            async def bounded(index: int) -> PageReport:
+                url, name = PAGES_TO_TEST[index]
+                async with semaphore:
+                    start = time.time()
+                    try:
+                        return await self.test_page_async(context, url, name)
+                    finally:
+                        schedule.record(index, os.getpid(), start, time.time())
+
+            # The semaphore admits routes in the order they were started: longest first
+            started = {index: asyncio.ensure_future(bounded(index)) for index in schedule.order}
+            self.report.pages = list(await asyncio.gather(*(started[i] for i in range(len(PAGES_TO_TEST)))))
+            schedule.save()
+
+            await vitals.collect_pages_async(context)
+            await browser.close()
+
+        self.generate_summary()
+        self.print_final_report()
+        schedule.print_summary()
+        self.save_report()
+
+        return 0 if self.report.failed == 0 else 1
+
+    def run(self):
+        return asyncio.run(self.run_async())
+
+
 if __name__ == "__main__":
-    tester = ComprehensiveQATester()
+    parser = argparse.ArgumentParser(description="PiterPay comprehensive QA suite")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="use the async_api tester and check routes concurrently")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="routes checked at the same time in --async mode")
+    args = parser.parse_args()
+
+    tester = AsyncComprehensiveQATester(args.concurrency) if args.use_async else ComprehensiveQATester()
     exit(tester.run())
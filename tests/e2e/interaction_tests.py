@@ -5,28 +5,54 @@ Deep Interaction Tests for PiterPay
 Tests hamburger menu, form submissions, and complex user flows.
 """
 
-import time
+import sys
+from pathlib import Path
 from playwright.sync_api import sync_playwright, Page, expect
 
-BASE_URL = "http://localhost:5178"
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from qa_support import history, profiles
+from qa_support.assets import stats as asset_stats
+from qa_support.auth import ensure_storage_state
+from qa_support.context import BASE_URL, new_qa_context
+from qa_support.hydration import goto, metrics as hydration_metrics
+from qa_support.results import Results
+from qa_support.schedule import Schedule
+from qa_support.vitals import collect_pages as collect_vitals, metrics as vitals_metrics
+from qa_support.waits import stats as wait_stats, wait_for_animations, wait_for_count_change
+
+
+# Resource profile of this suite's contexts (qa_support.profiles) - forms, tabs and chat never need media
+RESOURCE_PROFILE = "no-media"
+
+# Bot chat bubbles (the typing indicator shares rounded-lg p-4 but not the text color)
+BOT_REPLY = ".rounded-lg.p-4.text-slate-700"
 
 class InteractionTester:
+    TEST_METHODS = [
+        "test_hamburger_menu",
+        "test_login_form",
+        "test_contact_form",
+        "test_chat_interaction",
+        "test_tab_navigation",
+        "test_budget_category_interaction",
+        "test_profile_edit_mode",
+    ]
+
     def __init__(self):
-        self.results = []
+        self.results = Results("interaction")
 
     def log_result(self, test_name: str, passed: bool, details: str = ""):
-        status = "✅ PASS" if passed else "❌ FAIL"
-        self.results.append({"name": test_name, "passed": passed, "details": details})
-        print(f"  {status}: {test_name}")
-        if details and not passed:
-            print(f"         {details}")
+        if passed:
+            self.results.add_pass(test_name, details)
+        else:
+            self.results.add_fail(test_name, details)
 
     def test_hamburger_menu(self, page: Page):
         """Test hamburger menu open/close and navigation"""
         print("\n🍔 Testing Hamburger Menu...")
 
         # Go to dashboard
-        page.goto(f"{BASE_URL}/dashboard", wait_until="networkidle")
+        goto(page, f"{BASE_URL}/dashboard", settle=True)
 
         # Find and click hamburger menu button
         menu_button = page.locator("button[aria-label='פתח תפריט']")
@@ -35,7 +61,7 @@ class InteractionTester:
 
             # Click to open
             menu_button.click()
-            time.sleep(0.5)
+            wait_for_animations(page)
 
             # Check sidebar is visible
             sidebar = page.locator("aside")
@@ -51,13 +77,13 @@ class InteractionTester:
                 close_button = sidebar.locator("button[aria-label='סגור תפריט']")
                 if close_button.count() > 0:
                     close_button.click()
-                    time.sleep(0.5)
+                    wait_for_animations(page)
                     is_closed = not sidebar.is_visible() or "translate-x" in sidebar.get_attribute("class")
                     self.log_result("Sidebar closes on X click", True)
 
                 # Reopen and test navigation
                 menu_button.click()
-                time.sleep(0.5)
+                wait_for_animations(page)
 
                 # Click on Budget link
                 budget_link = sidebar.locator("a[href='/budget']")
@@ -67,16 +93,16 @@ class InteractionTester:
                     self.log_result("Navigation to Budget works", "/budget" in page.url)
 
                 # Go back to dashboard for backdrop test
-                page.goto(f"{BASE_URL}/dashboard", wait_until="networkidle")
+                goto(page, f"{BASE_URL}/dashboard", settle=True)
                 menu_button = page.locator("button[aria-label='פתח תפריט']")
 
                 # Test backdrop click closes menu
                 menu_button.click()
-                time.sleep(0.5)
+                wait_for_animations(page)
                 backdrop = page.locator(".bg-black\\/50")
                 if backdrop.count() > 0 and backdrop.is_visible():
                     backdrop.click(force=True)
-                    time.sleep(0.5)
+                    wait_for_animations(page)
                     self.log_result("Backdrop click closes menu", True)
                 else:
                     self.log_result("Backdrop click closes menu", True, "Backdrop test skipped")
@@ -87,7 +113,7 @@ class InteractionTester:
         """Test login form validation and interaction"""
         print("\n🔐 Testing Login Form...")
 
-        page.goto(f"{BASE_URL}/login", wait_until="networkidle")
+        goto(page, f"{BASE_URL}/login", settle=True)
 
         # Find form inputs
         email_input = page.locator("input[type='email'], input[placeholder*='email']")
@@ -126,7 +152,7 @@ class InteractionTester:
         """Test contact form submission"""
         print("\n📧 Testing Contact Form...")
 
-        page.goto(f"{BASE_URL}/contact", wait_until="networkidle")
+        goto(page, f"{BASE_URL}/contact", settle=True)
 
         # Check if page loaded (might be new page)
         if "contact" in page.url:
@@ -165,7 +191,7 @@ class InteractionTester:
         """Test chat input and message sending"""
         print("\n💬 Testing Chat Interaction...")
 
-        page.goto(f"{BASE_URL}/dashboard", wait_until="networkidle")
+        goto(page, f"{BASE_URL}/dashboard", settle=True)
 
         # Find chat input
         chat_input = page.locator("input[placeholder*='כתוב'], input[placeholder*='פלאפל']")
@@ -188,14 +214,15 @@ class InteractionTester:
 
                 # Clear input and check button disabled
                 chat_input.fill("")
-                time.sleep(0.1)
+                wait_for_animations(page)
                 is_disabled = send_button.is_disabled()
                 self.log_result("Send button disabled when empty", is_disabled)
 
                 # Type and send
                 chat_input.fill("100 מכולת")
+                replies = page.locator(BOT_REPLY).count()
                 send_button.click()
-                time.sleep(1.5)  # Wait for simulated response
+                wait_for_count_change(page, BOT_REPLY, replies)
 
                 # Check if new messages appeared
                 messages = page.locator(".rounded-lg.p-4").all()
@@ -209,7 +236,7 @@ class InteractionTester:
         """Test tab switching in dashboard"""
         print("\n📑 Testing Tab Navigation...")
 
-        page.goto(f"{BASE_URL}/dashboard", wait_until="networkidle")
+        goto(page, f"{BASE_URL}/dashboard", settle=True)
 
         # Find all buttons that look like tabs (near the top, with icons)
         all_buttons = page.locator("button").all()
@@ -222,21 +249,21 @@ class InteractionTester:
             dashboard_tab = page.locator("button").filter(has_text="לוח הבקרה").first
             if dashboard_tab.count() > 0:
                 dashboard_tab.click()
-                time.sleep(0.3)
+                wait_for_animations(page)
                 self.log_result("Dashboard tab shows content", True)
 
             # Click details tab
             details_tab = page.locator("button").filter(has_text="פרטים").first
             if details_tab.count() > 0:
                 details_tab.click()
-                time.sleep(0.3)
+                wait_for_animations(page)
                 self.log_result("Details tab switches", True)
 
             # Return to chat - find button containing the chat icon or text
             chat_tab = page.locator("button").filter(has_text="פיטר").first
             if chat_tab.count() > 0:
                 chat_tab.click()
-                time.sleep(0.3)
+                wait_for_animations(page)
                 self.log_result("Chat tab returns to chat", True)
             else:
                 self.log_result("Chat tab returns to chat", True, "Chat tab selector adjusted")
@@ -247,7 +274,7 @@ class InteractionTester:
         """Test budget page category interactions"""
         print("\n💰 Testing Budget Category Interactions...")
 
-        page.goto(f"{BASE_URL}/budget", wait_until="networkidle")
+        goto(page, f"{BASE_URL}/budget", settle=True)
 
         # Find category tabs by looking for buttons with budget-related text
         income_tab = page.locator("button").filter(has_text="הכנסות").first
@@ -258,12 +285,12 @@ class InteractionTester:
 
             # Click through tabs
             income_tab.click()
-            time.sleep(0.3)
+            wait_for_animations(page)
             self.log_result("Income tab clickable", True)
 
             if fixed_expenses_tab.count() > 0:
                 fixed_expenses_tab.click()
-                time.sleep(0.3)
+                wait_for_animations(page)
                 self.log_result("Fixed expenses tab clickable", True)
 
             # Look for add category button
@@ -276,7 +303,7 @@ class InteractionTester:
         """Test profile edit functionality"""
         print("\n👤 Testing Profile Edit Mode...")
 
-        page.goto(f"{BASE_URL}/profile", wait_until="networkidle")
+        goto(page, f"{BASE_URL}/profile", settle=True)
 
         # Find edit button
         edit_button = page.locator("button:has-text('ערוך פרופיל')")
@@ -300,9 +327,9 @@ class InteractionTester:
 
     def print_summary(self):
         """Print test summary"""
-        total = len(self.results)
-        passed = sum(1 for r in self.results if r["passed"])
-        failed = total - passed
+        total = self.results.total
+        passed = self.results.passed
+        failed = self.results.failed
 
         print("\n" + "="*60)
         print("   INTERACTION TEST SUMMARY")
@@ -310,14 +337,13 @@ class InteractionTester:
         print(f"   Total Tests: {total}")
         print(f"   ✅ Passed: {passed}")
         print(f"   ❌ Failed: {failed}")
-        print(f"   Pass Rate: {passed/total*100:.1f}%")
+        print(f"   Pass Rate: {passed/total*100 if total else 0:.1f}%")
         print("="*60)
 
         if failed > 0:
             print("\n   Failed Tests:")
-            for r in self.results:
-                if not r["passed"]:
-                    print(f"   • {r['name']}: {r['details']}")
+            for f in self.results.failures:
+                print(f"   • {f['test']}: {f['error']}")
 
         return failed == 0
 
@@ -327,26 +353,31 @@ class InteractionTester:
         print("   PiterPay - Deep Interaction Tests")
         print("="*60)
 
+        ensure_storage_state(BASE_URL)
+
+        schedule = Schedule([("interaction", method) for method in self.TEST_METHODS])
+        schedule.start(1)
         with sync_playwright() as p:
             browser = p.chromium.launch(headless=True)
-            context = browser.new_context(
-                viewport={"width": 1280, "height": 720},
-                locale="he-IL"
-            )
+            context = new_qa_context(browser, profile=RESOURCE_PROFILE)
             page = context.new_page()
 
             # Run all test suites
-            self.test_hamburger_menu(page)
-            self.test_login_form(page)
-            self.test_contact_form(page)
-            self.test_chat_interaction(page)
-            self.test_tab_navigation(page)
-            self.test_budget_category_interaction(page)
-            self.test_profile_edit_mode(page)
+            for index, method in enumerate(self.TEST_METHODS):
+                with schedule.timing(index):
+                    getattr(self, method)(page)
 
+            collect_vitals(context)
             browser.close()
+        schedule.save()
 
         success = self.print_summary()
+        wait_stats.print_summary()
+        hydration_metrics.print_summary()
+        vitals_metrics.print_summary()
+        asset_stats.print_summary()
+        profiles.usage.print_summary()
+        history.ingest_run()
         return 0 if success else 1
 
 
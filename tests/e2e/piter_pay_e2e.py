@@ -5,13 +5,28 @@ Tests all pages, navigation, UI components, PWA, and console errors.
 """
 
 import json
-import os
+import sys
 from datetime import datetime
+from pathlib import Path
 from playwright.sync_api import sync_playwright, Page, ConsoleMessage
 
-BASE_URL = "http://localhost:5178"
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from qa_support import artifacts, history, profiles, replay, timings
+from qa_support.assets import stats as asset_stats
+from qa_support.auth import ensure_storage_state
+from qa_support.context import BASE_URL, new_qa_context
+from qa_support.hydration import goto, metrics as hydration_metrics
+from qa_support.results import Results
+from qa_support.schedule import Schedule
+from qa_support.screenshots import print_summary as print_screenshot_summary
+from qa_support.vitals import collect_pages as collect_vitals, metrics as vitals_metrics
+from qa_support.waits import wait_for_settled, wait_for_url_change
+
 SCREENSHOT_DIR = "/tmp/piterpay-e2e-screenshots"
 
+# Resource profile of this suite's contexts (qa_support.profiles) - it takes screenshots
+RESOURCE_PROFILE = "full"
+
 # All routes to test
 ROUTES = [
     {"path": "/", "name": "Home"},
@@ -27,85 +42,48 @@ ROUTES = [
     {"path": "/guide", "name": "Guide"},
 ]
 
-class TestResults:
-    def __init__(self):
-        self.passed = 0
-        self.failed = 0
-        self.errors = []
-        self.console_errors = []
-        self.warnings = []
-
-    def record_pass(self, test_name: str):
-        self.passed += 1
-        print(f"  ✅ {test_name}")
-
-    def record_fail(self, test_name: str, error: str):
-        self.failed += 1
-        self.errors.append({"test": test_name, "error": error})
-        print(f"  ❌ {test_name}: {error}")
-
-    def record_console_error(self, page: str, message: str):
-        self.console_errors.append({"page": page, "message": message})
-
-    def record_warning(self, message: str):
-        self.warnings.append(message)
-        print(f"  ⚠️  {message}")
-
-    def summary(self) -> str:
-        total = self.passed + self.failed
-        return f"""
-╔══════════════════════════════════════════════════════════════╗
-║                    E2E TEST RESULTS                          ║
-╠══════════════════════════════════════════════════════════════╣
-║  Total Tests:     {total:4d}                                      ║
-║  Passed:          {self.passed:4d}  ✅                                  ║
-║  Failed:          {self.failed:4d}  {'❌' if self.failed > 0 else '✅'}                                  ║
-║  Console Errors:  {len(self.console_errors):4d}  {'⚠️ ' if self.console_errors else '✅'}                                  ║
-╠══════════════════════════════════════════════════════════════╣
-║  Status: {'PASSED ✅' if self.failed == 0 else 'FAILED ❌'}                                          ║
-╚══════════════════════════════════════════════════════════════╝
-"""
-
 
-def setup_console_listener(page: Page, results: TestResults, page_name: str):
-    """Set up console message listener to capture errors."""
+def setup_console_listener(page: Page, results: Results, page_name: str):
+    """Set up console message listener to capture errors; returns it for page.remove_listener."""
     def handle_console(msg: ConsoleMessage):
         if msg.type == "error":
-            results.record_console_error(page_name, msg.text)
+            results.add_warning(f"Console error on {page_name}", msg.text)
     page.on("console", handle_console)
+    return handle_console
 
 
-def test_page_loads(page: Page, route: dict, results: TestResults) -> bool:
+def test_page_loads(page: Page, route: dict, results: Results) -> bool:
     """Test that a page loads successfully."""
     test_name = f"Page loads: {route['name']} ({route['path']})"
     try:
-        response = page.goto(f"{BASE_URL}{route['path']}", wait_until="networkidle", timeout=30000)
+        response = goto(page, f"{BASE_URL}{route['path']}", settle=True, timeout=30000)
         if response and response.status < 400:
-            results.record_pass(test_name)
+            timing = timings.breakdown(page)
+            results.add_pass(test_name, timing.line() if timing else "")
             return True
         else:
-            results.record_fail(test_name, f"HTTP {response.status if response else 'No response'}")
+            results.add_fail(test_name, f"HTTP {response.status if response else 'No response'}")
             return False
     except Exception as e:
-        results.record_fail(test_name, str(e))
+        results.add_fail(test_name, str(e))
         return False
 
 
-def test_page_has_content(page: Page, route: dict, results: TestResults):
+def test_page_has_content(page: Page, route: dict, results: Results):
     """Test that page has meaningful content (not blank)."""
     test_name = f"Page has content: {route['name']}"
     try:
         body = page.locator("body")
         text_content = body.inner_text()
         if len(text_content.strip()) > 10:
-            results.record_pass(test_name)
+            results.add_pass(test_name)
         else:
-            results.record_fail(test_name, "Page appears empty")
+            results.add_fail(test_name, "Page appears empty")
     except Exception as e:
-        results.record_fail(test_name, str(e))
+        results.add_fail(test_name, str(e))
 
 
-def test_no_react_errors(page: Page, route: dict, results: TestResults):
+def test_no_react_errors(page: Page, route: dict, results: Results):
     """Check for React error boundaries or error messages."""
     test_name = f"No React errors: {route['name']}"
     try:
@@ -123,80 +101,82 @@ def test_no_react_errors(page: Page, route: dict, results: TestResults):
                 break
 
         if not has_error:
-            results.record_pass(test_name)
+            results.add_pass(test_name)
         else:
-            results.record_fail(test_name, "React error detected on page")
+            results.add_fail(test_name, "React error detected on page")
     except Exception as e:
-        results.record_fail(test_name, str(e))
+        results.add_fail(test_name, str(e))
 
 
-def test_pwa_manifest(page: Page, results: TestResults):
+def test_pwa_manifest(page: Page, results: Results):
     """Test PWA manifest is accessible and valid."""
     test_name = "PWA manifest loads"
     try:
-        response = page.goto(f"{BASE_URL}/manifest.json", wait_until="networkidle")
+        response = page.goto(f"{BASE_URL}/manifest.json", wait_until="load")
         if response and response.status == 200:
             manifest = response.json()
             if manifest.get("name") and manifest.get("icons"):
-                results.record_pass(test_name)
+                results.add_pass(test_name)
 
                 # Check manifest fields
                 if manifest.get("name") == "PiterPay - היועץ התקציבי החכם":
-                    results.record_pass("PWA manifest: correct name")
+                    results.add_pass("PWA manifest: correct name")
                 else:
-                    results.record_warning(f"PWA manifest name mismatch: {manifest.get('name')}")
+                    results.add_warning(f"PWA manifest name mismatch: {manifest.get('name')}")
 
                 if manifest.get("display") == "standalone":
-                    results.record_pass("PWA manifest: standalone display")
+                    results.add_pass("PWA manifest: standalone display")
                 else:
-                    results.record_warning("PWA manifest: not standalone display")
+                    results.add_warning("PWA manifest: not standalone display")
 
                 if len(manifest.get("icons", [])) >= 2:
-                    results.record_pass("PWA manifest: has icons")
+                    results.add_pass("PWA manifest: has icons")
                 else:
-                    results.record_fail("PWA manifest: missing icons", "Less than 2 icons defined")
+                    results.add_fail("PWA manifest: missing icons", "Less than 2 icons defined")
             else:
-                results.record_fail(test_name, "Manifest missing required fields")
+                results.add_fail(test_name, "Manifest missing required fields")
         else:
-            results.record_fail(test_name, f"HTTP {response.status if response else 'No response'}")
+            results.add_fail(test_name, f"HTTP {response.status if response else 'No response'}")
     except Exception as e:
-        results.record_fail(test_name, str(e))
+        results.add_fail(test_name, str(e))
 
 
-def test_navigation(page: Page, results: TestResults):
+def test_navigation(page: Page, results: Results):
     """Test navigation between pages works."""
     test_name = "Navigation works"
     try:
         # Start from home page
-        page.goto(f"{BASE_URL}/", wait_until="networkidle")
+        goto(page, f"{BASE_URL}/", settle=True)
 
         # Try to find and click navigation links
         nav_links = page.locator("nav a, [role='navigation'] a, header a").all()
 
         if len(nav_links) > 0:
-            results.record_pass(f"Navigation: found {len(nav_links)} nav links")
+            results.add_pass(f"Navigation: found {len(nav_links)} nav links")
         else:
-            results.record_warning("No navigation links found in nav/header")
+            results.add_warning("No navigation links found in nav/header")
 
         # Test clicking a link if dashboard exists
         dashboard_link = page.locator("a[href='/dashboard'], a[href*='dashboard']").first
         if dashboard_link.count() > 0:
+            previous_url = page.url
             dashboard_link.click()
-            page.wait_for_load_state("networkidle")
+            wait_for_url_change(page, previous_url)
+            wait_for_settled(page)
             if "/dashboard" in page.url:
-                results.record_pass("Navigation: click to dashboard works")
+                results.add_pass("Navigation: click to dashboard works")
             else:
-                results.record_fail("Navigation: click to dashboard", f"Ended up at {page.url}")
+                results.add_fail("Navigation: click to dashboard", f"Ended up at {page.url}")
 
     except Exception as e:
-        results.record_fail(test_name, str(e))
+        results.add_fail(test_name, str(e))
 
 
-def test_rtl_support(page: Page, results: TestResults):
+def test_rtl_support(page: Page, results: Results):
     """Test RTL (Right-to-Left) support for Hebrew."""
     test_name = "RTL support"
     try:
-        page.goto(f"{BASE_URL}/", wait_until="networkidle")
+        goto(page, f"{BASE_URL}/", settle=True)
 
         # Check if HTML has dir="rtl" or lang="he"
         html = page.locator("html")
@@ -204,19 +184,19 @@ def test_rtl_support(page: Page, results: TestResults):
         lang = html.get_attribute("lang")
 
         if direction == "rtl" or lang == "he":
-            results.record_pass(test_name)
+            results.add_pass(test_name)
         else:
-            results.record_warning(f"RTL may not be configured (dir={direction}, lang={lang})")
+            results.add_warning(f"RTL may not be configured (dir={direction}, lang={lang})")
 
     except Exception as e:
-        results.record_fail(test_name, str(e))
+        results.add_fail(test_name, str(e))
 
 
-def test_ui_components(page: Page, results: TestResults):
+def test_ui_components(page: Page, results: Results):
     """Test that key UI components render."""
     test_name = "UI components render"
     try:
-        page.goto(f"{BASE_URL}/dashboard", wait_until="networkidle")
+        goto(page, f"{BASE_URL}/dashboard", settle=True)
 
         # Check for common UI elements
         checks = [
@@ -228,58 +208,77 @@ def test_ui_components(page: Page, results: TestResults):
         for check_name, selector in checks:
             count = page.locator(selector).count()
             if count > 0:
-                results.record_pass(f"UI: {check_name} ({count} found)")
+                results.add_pass(f"UI: {check_name} ({count} found)")
             else:
-                results.record_warning(f"UI: {check_name} - none found")
+                results.add_warning(f"UI: {check_name} - none found")
 
     except Exception as e:
-        results.record_fail(test_name, str(e))
+        results.add_fail(test_name, str(e))
 
 
-def test_responsive_viewport(page: Page, results: TestResults):
+def test_responsive_viewport(page: Page, results: Results):
     """Test page renders in mobile viewport."""
     test_name = "Mobile viewport renders"
     try:
         # Set mobile viewport
         page.set_viewport_size({"width": 375, "height": 667})
-        page.goto(f"{BASE_URL}/dashboard", wait_until="networkidle")
+        goto(page, f"{BASE_URL}/dashboard", settle=True)
 
         # Check page isn't broken
         body = page.locator("body")
         if body.is_visible():
-            results.record_pass(test_name)
+            results.add_pass(test_name)
         else:
-            results.record_fail(test_name, "Body not visible in mobile viewport")
+            results.add_fail(test_name, "Body not visible in mobile viewport")
 
         # Reset to desktop
         page.set_viewport_size({"width": 1280, "height": 720})
 
     except Exception as e:
-        results.record_fail(test_name, str(e))
+        results.add_fail(test_name, str(e))
 
 
 def take_screenshot(page: Page, name: str):
-    """Take a screenshot for visual verification."""
-    os.makedirs(SCREENSHOT_DIR, exist_ok=True)
+    """Take a screenshot for visual verification (kept per the artifact policy, see qa_support.artifacts)."""
     filename = f"{SCREENSHOT_DIR}/{name}_{datetime.now().strftime('%H%M%S')}.png"
-    page.screenshot(path=filename, full_page=True)
-    return filename
+    return artifacts.screenshot(page, filename, full_page=True)
+
+
+def test_route(page: Page, route: dict, results: Results):
+    """Load a route and check it, recording artifacts in case it fails."""
+    name = route['name']
+    results.start(route['path'])
+    with artifacts.recording(page, f"e2e {name}", lambda: results.failed):
+        handle_console = setup_console_listener(page, results, name)
+        try:
+            if test_page_loads(page, route, results):
+                test_page_has_content(page, route, results)
+                test_no_react_errors(page, route, results)
+                # Take screenshot of each page
+                take_screenshot(page, name.replace(' ', '_').lower())
+        finally:
+            # Later routes' errors must not be reported against this one
+            page.remove_listener("console", handle_console)
 
 
 def run_tests():
     """Run all E2E tests."""
-    results = TestResults()
+    results = Results("e2e")
 
     print("\n" + "="*60)
     print("   PiterPay E2E Tests")
     print("="*60 + "\n")
 
+    ensure_storage_state(BASE_URL)
+
+    # Same units as the e2e tasks of qa_support.suites
+    schedule = Schedule([("e2e", unit) for unit in ["pwa_manifest"] + [r["path"] for r in ROUTES]
+                         + ["navigation", "rtl_support", "ui_components", "responsive_viewport"]])
+    timed = lambda unit: schedule.timing(schedule.keys.index(("e2e", unit)))
+    schedule.start(1)
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
-        context = browser.new_context(
-            viewport={"width": 1280, "height": 720},
-            locale="he-IL"
-        )
+        context = new_qa_context(browser, profile=RESOURCE_PROFILE)
         page = context.new_page()
 
         # Set up global console listener
@@ -291,56 +290,68 @@ def run_tests():
 
         # Test 1: PWA Manifest
         print("📋 Testing PWA Manifest...")
-        test_pwa_manifest(page, results)
+        with timed("pwa_manifest"):
+            test_pwa_manifest(page, results)
         print()
 
         # Test 2: All pages load
         print("📄 Testing Page Loading...")
         for route in ROUTES:
-            setup_console_listener(page, results, route['name'])
-            if test_page_loads(page, route, results):
-                test_page_has_content(page, route, results)
-                test_no_react_errors(page, route, results)
-                # Take screenshot of each page
-                take_screenshot(page, route['name'].replace(' ', '_').lower())
+            with timed(route["path"]):
+                test_route(page, route, results)
         print()
 
         # Test 3: Navigation
         print("🧭 Testing Navigation...")
-        test_navigation(page, results)
+        with timed("navigation"):
+            test_navigation(page, results)
         print()
 
         # Test 4: RTL Support
         print("🔄 Testing RTL Support...")
-        test_rtl_support(page, results)
+        with timed("rtl_support"):
+            test_rtl_support(page, results)
         print()
 
         # Test 5: UI Components
         print("🎨 Testing UI Components...")
-        test_ui_components(page, results)
+        with timed("ui_components"):
+            test_ui_components(page, results)
         print()
 
         # Test 6: Mobile Responsive
         print("📱 Testing Mobile Viewport...")
-        test_responsive_viewport(page, results)
+        with timed("responsive_viewport"):
+            test_responsive_viewport(page, results)
         print()
 
         # Record console errors
         for error in all_console_errors:
-            results.record_console_error("global", error)
+            results.add_warning("Console error on global", error)
 
+        collect_vitals(context)
         browser.close()
+    schedule.save()
 
     # Print summary
-    print(results.summary())
+    results.summary()
+    hydration_metrics.print_summary()
+    vitals_metrics.print_summary()
+    timings.metrics.print_summary()
+    asset_stats.print_summary()
+    profiles.usage.print_summary()
+    print_screenshot_summary()
+    replay.stats.print_summary()
 
     # Print console errors if any
-    if results.console_errors:
+    console_errors = [w for w in results.warning_records if w["test"].startswith("Console error on ")]
+    if console_errors:
         print("\n⚠️  Console Errors Detected:")
-        for err in results.console_errors[:10]:  # Limit to first 10
-            print(f"  [{err['page']}] {err['message'][:100]}")
+        for err in console_errors[:10]:  # Limit to first 10
+            print(f"  [{err['test'][len('Console error on '):]}] {err['details'][:100]}")
 
-    print(f"\n📸 Screenshots saved to: {SCREENSHOT_DIR}")
+    print(f"\n📸 Failure artifacts saved to: {artifacts.ARTIFACTS_DIR}")
+    history.ingest_run()
 
     # Return exit code
     return 0 if results.failed == 0 else 1
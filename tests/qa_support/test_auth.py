@@ -0,0 +1,48 @@
+"""
+Unit tests for the QA login (qa_support.auth)
+"""
+
+import json
+
+import pytest
+
+from qa_support import auth, backend
+
+BASE_URL = "http://localhost:3000"
+
+
+@pytest.fixture
+def stand_in(monkeypatch):
+    monkeypatch.setenv("QA_BACKEND", "stand-in")
+    monkeypatch.setattr(auth, "SUPABASE_URL", "")
+    monkeypatch.setattr(auth, "SUPABASE_ANON_KEY", "")
+    monkeypatch.setattr(auth, "_login_failed", False)
+    monkeypatch.setattr(backend, "_stand_in", None)
+
+
+def test_stand_in_login_needs_no_supabase_project(stand_in):
+    state = auth.session_state(BASE_URL)
+    item = state["origins"][0]["localStorage"][0]
+    assert state["origins"][0]["origin"] == BASE_URL
+    assert item["name"] == "sb-127-auth-token"
+    assert json.loads(item["value"])["access_token"]
+
+
+def test_storage_key_follows_the_served_stand_in(stand_in):
+    with backend.stand_in():
+        assert auth.supabase_url() == backend.stand_in().url
+    assert auth.supabase_url() == "http://127.0.0.1:54321"
+
+
+def test_storage_key_follows_the_app_supabase_url(stand_in, monkeypatch):
+    monkeypatch.setattr(auth, "SUPABASE_URL", "https://abcd.supabase.co")
+    assert auth.storage_key() == "sb-abcd-auth-token"
+
+
+def test_hosted_login_needs_the_supabase_project(monkeypatch):
+    monkeypatch.delenv("QA_BACKEND", raising=False)
+    monkeypatch.setenv("QA_AUTH_EMAIL", "qa@example.com")
+    monkeypatch.setenv("QA_AUTH_PASSWORD", "secret")
+    monkeypatch.setattr(auth, "SUPABASE_URL", "")
+    monkeypatch.setattr(auth, "_login_failed", False)
+    assert auth.session_state(BASE_URL) is None
@@ -0,0 +1,140 @@
+"""
+Unit tests for the local Supabase stand-in (qa_support.backend)
+"""
+
+import json
+
+import pytest
+
+from qa_support.backend import QA_EMAIL, QA_PASSWORD, QA_USER_ID, SupabaseStandIn
+
+REST = "http://stand-in.test/rest/v1"
+AUTH = "http://stand-in.test/auth/v1"
+
+ACCOUNT = "acc-1"
+OTHER_USER = "user-other"
+
+
+@pytest.fixture
+def stand_in():
+    owned = {"user_id": QA_USER_ID}
+    return SupabaseStandIn({
+        "piterpay_users": [{"id": QA_USER_ID, "auth_user_id": "auth-qa", "email": QA_EMAIL}],
+        "piterpay_accounts": [{"id": ACCOUNT, "name": "Checking", **owned}],
+        "piterpay_transactions": [
+            {"id": "t1", "account_id": ACCOUNT, "amount": 500, "type": "income", "category": "Salary",
+             "description": "March salary", "date": "2026-03-01", **owned},
+            {"id": "t2", "account_id": ACCOUNT, "amount": 120, "type": "expense", "category": "Food",
+             "description": "Groceries", "date": "2026-03-05", **owned},
+            {"id": "t3", "account_id": ACCOUNT, "amount": 80, "type": "expense", "category": None,
+             "description": "Fuel", "date": "2026-03-03", **owned},
+            {"id": "t4", "amount": 999, "type": "expense", "category": "Food", "description": "Other user",
+             "date": "2026-03-04", "user_id": OTHER_USER},
+        ],
+    }, users=[{"id": "auth-qa", "email": QA_EMAIL, "password": QA_PASSWORD}])
+
+
+def _headers(stand_in, **extra):
+    session = stand_in.sign_in(QA_EMAIL, QA_PASSWORD)
+    return {"Authorization": f"Bearer {session['access_token']}", **extra}
+
+
+def _get(stand_in, query, **headers):
+    status, response_headers, body = stand_in.dispatch("GET", f"{REST}/piterpay_transactions?{query}",
+                                                       _headers(stand_in, **headers), None)
+    return status, response_headers, json.loads(body)
+
+
+def test_filters_combine(stand_in):
+    status, _, rows = _get(stand_in, "select=id&type=eq.expense&amount=gte.100")
+    assert status == 200
+    assert rows == [{"id": "t2"}]
+
+
+def test_in_is_and_not_filters(stand_in):
+    assert [r["id"] for r in _get(stand_in, "select=id&id=in.(t1,t3)")[2]] == ["t1", "t3"]
+    assert [r["id"] for r in _get(stand_in, "select=id&category=is.null")[2]] == ["t3"]
+    assert [r["id"] for r in _get(stand_in, "select=id&type=not.eq.expense")[2]] == ["t1"]
+
+
+def test_ilike_filter(stand_in):
+    assert [r["id"] for r in _get(stand_in, "select=id&description=ilike.*SALARY*")[2]] == ["t1"]
+
+
+def test_order_limit_offset(stand_in):
+    _, headers, rows = _get(stand_in, "select=id&order=date.desc&limit=2&offset=1")
+    assert [r["id"] for r in rows] == ["t3", "t1"]
+    assert headers["Content-Range"] == "1-2/*"
+
+
+def test_order_puts_nulls_last(stand_in):
+    rows = _get(stand_in, "select=id,category&order=category.asc")[2]
+    assert [r["id"] for r in rows] == ["t2", "t1", "t3"]
+
+
+def test_exact_count(stand_in):
+    _, headers, _ = _get(stand_in, "select=id&limit=1", Prefer="count=exact")
+    assert headers["Content-Range"] == "0-0/3"
+
+
+def test_select_aliases_and_embeds(stand_in):
+    rows = _get(stand_in, "select=id,total:amount,account:piterpay_accounts(name)&id=eq.t1")[2]
+    assert rows == [{"id": "t1", "total": 500, "account": {"name": "Checking"}}]
+
+
+def test_rows_of_other_users_are_hidden(stand_in):
+    assert "t4" not in [r["id"] for r in _get(stand_in, "select=id")[2]]
+    status, _, body = stand_in.dispatch("GET", f"{REST}/piterpay_transactions?select=id", {}, None)
+    assert "t4" in [r["id"] for r in json.loads(body)]
+
+
+def test_single_object_needs_exactly_one_row(stand_in):
+    accept = {"Accept": "application/vnd.pgrst.object+json"}
+    status, _, row = _get(stand_in, "select=id&id=eq.t2", **accept)
+    assert (status, row) == (200, {"id": "t2"})
+    status, _, error = _get(stand_in, "select=id&type=eq.expense", **accept)
+    assert (status, error["code"]) == (406, "PGRST116")
+
+
+def test_unsupported_filters_are_rejected(stand_in):
+    status, _, error = _get(stand_in, "select=id&or=(amount.gt.100,amount.lt.50)")
+    assert (status, error["code"]) == (400, "PGRST100")
+    status, _, error = _get(stand_in, "select=id&amount=between.1")
+    assert (status, error["code"]) == (400, "PGRST100")
+
+
+def test_upsert_merges_duplicates(stand_in):
+    headers = _headers(stand_in, Prefer="resolution=merge-duplicates,return=representation")
+    body = json.dumps([{"id": "t2", "amount": 150}, {"id": "t5", "amount": 10, "type": "expense"}]).encode()
+    status, _, out = stand_in.dispatch("POST", f"{REST}/piterpay_transactions?select=id,amount", headers, body)
+    assert status == 201
+    assert json.loads(out) == [{"id": "t2", "amount": 150}, {"id": "t5", "amount": 10}]
+    assert len(stand_in.rows("piterpay_transactions")) == 5
+
+
+def test_update_and_delete_follow_filters(stand_in):
+    status, _, _ = stand_in.dispatch("PATCH", f"{REST}/piterpay_transactions?id=eq.t3", _headers(stand_in),
+                                     json.dumps({"category": "Transport"}).encode())
+    assert status == 204
+    status, _, _ = stand_in.dispatch("DELETE", f"{REST}/piterpay_transactions?type=eq.income",
+                                     _headers(stand_in), None)
+    assert status == 204
+    rows = {r["id"]: r for r in stand_in.rows("piterpay_transactions")}
+    assert rows["t3"]["category"] == "Transport"
+    assert "t1" not in rows
+
+
+def test_password_and_refresh_grants(stand_in):
+    url = f"{AUTH}/token?grant_type=password"
+    status, _, body = stand_in.dispatch("POST", url, {}, json.dumps({"email": QA_EMAIL, "password": "wrong"}).encode())
+    assert status == 400
+    status, _, body = stand_in.dispatch("POST", url, {}, json.dumps({"email": QA_EMAIL, "password": QA_PASSWORD}).encode())
+    refresh_token = json.loads(body)["refresh_token"]
+    assert status == 200
+
+    url = f"{AUTH}/token?grant_type=refresh_token"
+    status, _, _ = stand_in.dispatch("POST", url, {}, json.dumps({"refresh_token": refresh_token}).encode())
+    assert status == 200
+    # Refresh tokens rotate: a second use is rejected
+    status, _, _ = stand_in.dispatch("POST", url, {}, json.dumps({"refresh_token": refresh_token}).encode())
+    assert status == 400
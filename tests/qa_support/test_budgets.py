@@ -0,0 +1,67 @@
+"""
+Unit tests for performance budgets (qa_support.budgets)
+"""
+
+from qa_support.budgets import budget_for, evaluate, measure
+from qa_support.vitals import VitalsSample
+
+BUDGETS = {
+    "*": {"*": {"lcp_ms": 2500, "requests": 60}, "390x844": {"lcp_ms": 4000}},
+    "/dashboard": {"*": {"js_kb": 1800}, "1280x720": {"lcp_ms": 2000}},
+}
+
+
+def _sample(route="/dashboard", viewport="1280x720", profile="full", **metrics):
+    return VitalsSample(route, viewport, profile, **metrics)
+
+
+def test_budget_for_layers_the_most_specific_entry_last():
+    assert budget_for(BUDGETS, "/dashboard", "1280x720") == {"lcp_ms": 2000, "requests": 60, "js_kb": 1800}
+    # The route's "*" entry wins over the any-route viewport entry
+    assert budget_for(BUDGETS, "/dashboard", "390x844") == {"lcp_ms": 4000, "requests": 60, "js_kb": 1800}
+    assert budget_for(BUDGETS, "/login", "390x844") == {"lcp_ms": 4000, "requests": 60}
+    assert budget_for(BUDGETS, "/login", "1280x720") == {"lcp_ms": 2500, "requests": 60}
+
+
+def test_measure_takes_the_75th_percentile():
+    samples = [_sample(lcp_ms=v, js_bytes=1024 * 100, requests=10) for v in (1000, 1500, 3000, 2000)]
+    assert measure(samples)[("/dashboard", "1280x720")] == {"lcp_ms": 2000, "js_kb": 100, "requests": 10}
+
+
+def test_measure_skips_missing_values():
+    measured = measure([_sample(requests=5)])
+    assert measured[("/dashboard", "1280x720")] == {"js_kb": 0, "requests": 5}
+
+
+def test_only_full_profile_loads_are_measured():
+    samples = [_sample(lcp_ms=1000), _sample(profile="no-media", lcp_ms=9000), _sample("/budget", profile="dom-only")]
+    measured = measure(samples)
+    assert list(measured) == [("/dashboard", "1280x720")]
+    assert measured[("/dashboard", "1280x720")]["lcp_ms"] == 1000
+
+
+def test_evaluate_checks_every_applicable_budget():
+    samples = [_sample(lcp_ms=2400, js_bytes=1024 * 1000, requests=70)]
+    checks = {c.metric: c for c in evaluate(samples, BUDGETS, baseline={})}
+    assert sorted(checks) == ["js_kb", "lcp_ms", "requests"]
+    assert not checks["lcp_ms"].passed
+    assert checks["js_kb"].passed
+    assert not checks["requests"].passed
+    assert checks["requests"].details == "70 over the 60 budget by 10 (+17%)"
+
+
+def test_evaluate_skips_budgets_without_a_measurement():
+    checks = evaluate([_sample("/login", requests=10)], BUDGETS, baseline={})
+    assert [c.metric for c in checks] == ["requests"]
+
+
+def test_evaluate_attaches_the_baseline():
+    baseline = {("/dashboard", "1280x720", "lcp_ms"): 1600.0}
+    check = next(c for c in evaluate([_sample(lcp_ms=1800)], BUDGETS, baseline) if c.metric == "lcp_ms")
+    assert check.baseline == 1600.0
+    assert check.details == "1800ms within the 2000ms budget; baseline 1600ms (+12%)"
+
+
+def test_soft_navigations_are_not_measured():
+    soft = VitalsSample("/budget", "1280x720", "full", navigation="soft", requests=3)
+    assert measure([soft, _sample(requests=40)]) == {("/dashboard", "1280x720"): {"js_kb": 0, "requests": 40}}
@@ -0,0 +1,55 @@
+"""
+Unit tests for the results history queries (qa_support.history)
+"""
+
+import pytest
+
+from qa_support import history
+
+RUN = "run-1"
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = history.connect(str(tmp_path / "history.sqlite3"))
+    db.execute("INSERT INTO runs (run, started) VALUES (?, ?)", (RUN, "2026-10-01T10:00:00"))
+    db.executemany("INSERT INTO results (run, ts, suite, test, route, status, duration_ms) VALUES (?, ?, ?, ?, ?, ?, ?)", [
+        (RUN, "2026-10-01T10:00:01", "deep", "Dashboard: Cards", "/dashboard", "pass", None),
+        (RUN, "2026-10-01T10:00:02", "e2e-comprehensive", "Dashboard: Tab: Month", "/dashboard", "pass", 300.0),
+    ])
+    history.store_tasks(db, [
+        {"suite": "deep", "unit": "test_dashboard_page", "worker": 1, "duration_ms": 4000.0, "estimated_ms": 6000},
+        {"suite": "journey", "unit": "test_mobile_journey", "worker": 1, "duration_ms": 9000.0, "estimated_ms": 10000},
+    ], run=RUN)
+    yield db
+    db.close()
+
+
+def test_slowest_tests_include_every_test_task(db):
+    slowest = [(t["suite"], t["test"]) for t in history.slowest_tests(db)]
+    assert slowest == [("journey", "test_mobile_journey"), ("deep", "test_dashboard_page"),
+                       ("e2e-comprehensive", "Dashboard: Tab: Month")]
+
+
+def test_slowest_tests_of_one_suite(db):
+    assert [t["test"] for t in history.slowest_tests(db, suite="deep")] == ["test_dashboard_page"]
+
+
+def test_untimed_results_are_left_out(db):
+    assert "Dashboard: Cards" not in [t["test"] for t in history.slowest_tests(db)]
+
+
+def test_duration_trend_of_a_test_matches_its_task(db):
+    trend = history.duration_trend(db, test="test_dashboard_page")
+    assert [(t["run"], t["count"], t["p50_ms"]) for t in trend] == [(RUN, 1, 4000.0)]
+
+
+def test_duration_trend_of_a_route_uses_timed_results(db):
+    trend = history.duration_trend(db, route="/dashboard")
+    assert [(t["count"], t["p95_ms"]) for t in trend] == [(1, 300.0)]
+
+
+def test_percentile_is_nearest_rank():
+    assert history.percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.0
+    assert history.percentile([1.0, 2.0, 3.0, 4.0], 95) == 4.0
+    assert history.percentile([], 50) == 0.0
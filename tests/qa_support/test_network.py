@@ -0,0 +1,71 @@
+"""
+Unit tests for the in-flight request tracker (qa_support.network)
+"""
+
+import time
+from types import SimpleNamespace
+
+from qa_support.network import RequestTracker
+
+
+class FakeEmitter:
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers.setdefault(event, []).append(handler)
+
+    def emit(self, event, *args):
+        for handler in self.handlers.get(event, []):
+            handler(*args)
+
+
+def _setup():
+    context, page = FakeEmitter(), FakeEmitter()
+    tracker = RequestTracker()
+    tracker.attach(context)
+    context.emit("page", page)
+    return context, page, tracker
+
+
+class FakeRequest:
+    def __init__(self, page, url, resource_type):
+        self.url = url
+        self.resource_type = resource_type
+        self.frame = SimpleNamespace(page=page)
+
+
+def _request(page, url="https://x.supabase.co/rest/v1/piterpay_budgets", resource_type="fetch"):
+    return FakeRequest(page, url, resource_type)
+
+
+def test_open_requests_keep_the_page_busy():
+    context, page, tracker = _setup()
+    request = _request(page)
+    context.emit("request", request)
+    assert tracker.idle_ms(page) is None
+    assert tracker.outstanding(page) == [request.url]
+    context.emit("requestfinished", request)
+    assert tracker.idle_ms(page) < 1000
+
+
+def test_allow_listed_requests_are_not_tracked():
+    context, page, tracker = _setup()
+    context.emit("request", _request(page, "wss://x.supabase.co/realtime/v1/websocket"))
+    assert tracker.idle_ms(page) is not None
+
+
+def test_quiet_time_starts_at_the_last_navigation():
+    context, page, tracker = _setup()
+    page.emit("framenavigated", SimpleNamespace(parent_frame=None))
+    assert tracker.idle_ms(page) < 1000
+    # Subframe navigations do not count
+    tracker.last_activity[page] -= 5
+    page.emit("framenavigated", SimpleNamespace(parent_frame=object()))
+    assert tracker.idle_ms(page) >= 5000
+
+
+def test_quiet_time_is_not_counted_before_the_wait_started():
+    _, page, tracker = _setup()
+    assert tracker.idle_ms(page) == float("inf")
+    assert tracker.idle_ms(page, since=time.perf_counter()) < 1000
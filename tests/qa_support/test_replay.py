@@ -0,0 +1,25 @@
+"""
+Unit tests for the replay counters handed back from workers (qa_support.replay)
+"""
+
+from qa_support import collectors
+from qa_support.replay import ReplayStats
+
+
+def test_stats_are_a_registered_collector():
+    assert "replay" in collectors.snapshot()
+
+
+def test_since_returns_the_counts_after_a_snapshot():
+    stats = ReplayStats(recorded=1, hits=5, misses=2)
+    snapshot = stats.snapshot()
+    stats.hits += 3
+    stats.misses += 1
+    assert stats.since(snapshot) == {"recorded": 0, "hits": 3, "misses": 1}
+
+
+def test_extend_adds_worker_counts():
+    stats = ReplayStats(hits=1)
+    stats.extend({"recorded": 0, "hits": 3, "misses": 1})
+    stats.extend(ReplayStats(recorded=2).since(None))
+    assert stats == ReplayStats(recorded=2, hits=4, misses=1)
@@ -0,0 +1,60 @@
+"""
+Unit tests for longest-first scheduling (qa_support.schedule)
+"""
+
+from qa_support.schedule import DEFAULT_ESTIMATE_MS, SUITE_ESTIMATES_MS, Schedule, estimate
+
+
+def test_known_durations_win():
+    estimates = estimate([("deep", "test_dashboard")], known={("deep", "test_dashboard"): 1234.0})
+    assert estimates == {("deep", "test_dashboard"): (1234.0, True)}
+
+
+def test_unknown_tasks_use_the_suite_default_weighted_by_name():
+    estimates = estimate([("deep", "test_login"), ("deep", "test_responsive_all_pages"), ("other", "test_x")], known={})
+    assert estimates[("deep", "test_login")] == (SUITE_ESTIMATES_MS["deep"], False)
+    # "all_pages" is listed before "responsive": the first matching fragment wins
+    assert estimates[("deep", "test_responsive_all_pages")] == (SUITE_ESTIMATES_MS["deep"] * 9.0, False)
+    assert estimates[("other", "test_x")] == (DEFAULT_ESTIMATE_MS, False)
+
+
+def test_unknown_tasks_use_the_median_of_their_suite():
+    known = {("journey", "a"): 1000.0, ("journey", "b"): 3000.0, ("journey", "c"): 8000.0}
+    assert estimate([("journey", "test_mobile")], known)[("journey", "test_mobile")] == (6000.0, False)
+
+
+def test_order_is_longest_first():
+    keys = [("deep", "short"), ("deep", "long"), ("deep", "unknown"), ("deep", "medium")]
+    known = {("deep", "short"): 100.0, ("deep", "long"): 9000.0, ("deep", "medium"): 2000.0}
+    # unknown is estimated at the suite median of the known tasks (2000), tied with medium
+    assert [keys[i][1] for i in Schedule(keys, known).order] == ["long", "unknown", "medium", "short"]
+
+
+def test_order_keeps_task_order_between_equal_estimates():
+    keys = [("e2e", "a"), ("e2e", "b"), ("e2e", "c")]
+    assert Schedule(keys, known={}).order == [0, 1, 2]
+
+
+def test_summary_compares_the_makespan_with_the_ideal():
+    schedule = Schedule([("deep", "a"), ("deep", "b"), ("deep", "c")], known={})
+    schedule.start(2)
+    schedule.started = 100.0
+    schedule.record(0, 1, 100.0, 104.0)
+    schedule.record(1, 2, 100.0, 101.0)
+    schedule.record(2, 2, 101.0, 102.0)
+    summary = schedule.summary()
+    assert summary["work_ms"] == 6000
+    assert summary["makespan_ms"] == 4000
+    # The longest task (4s) bounds the run, not the even split (3s)
+    assert summary["ideal_ms"] == 4000
+    assert summary["efficiency"] == 1.0
+    assert summary["idle_ms"] == 2000
+
+
+def test_timing_records_tasks_run_one_by_one():
+    schedule = Schedule([("deep", "a"), ("deep", "b")], known={})
+    schedule.start(1)
+    with schedule.timing(1):
+        pass
+    assert [(t.suite, t.unit) for t in schedule.timings] == [("deep", "b")]
+    assert schedule.timings[0].duration_ms >= 0